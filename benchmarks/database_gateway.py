@@ -0,0 +1,68 @@
+# database_gateway.py
+"""Benchmark for the event loop lag caused by slow database statements.
+
+Runs the same slow statement directly on the event loop (the old behaviour of the database functions) and through the
+database gateway while a task measures how late the event loop wakes it up. The statement doesn't read any tables, so
+the bot database isn't changed.
+
+Run from the bot directory: python -m benchmarks.database_gateway [rows]
+"""
+
+import asyncio
+import sqlite3
+import sys
+import time
+
+from database import gateway
+from resources import settings
+
+
+SLOW_STATEMENT = (
+    'WITH RECURSIVE numbers(number) AS (SELECT 1 UNION ALL SELECT number + 1 FROM numbers WHERE number < ?) '
+    'SELECT SUM(number) FROM numbers'
+)
+TICK_SECONDS = 0.001
+
+
+async def _measure_lag(stop: asyncio.Event) -> float:
+    """Returns the maximum time in ms the event loop woke up this task too late until stop is set"""
+    loop = asyncio.get_running_loop()
+    max_lag = 0
+    while not stop.is_set():
+        start_time = loop.time()
+        await asyncio.sleep(TICK_SECONDS)
+        max_lag = max(max_lag, loop.time() - start_time - TICK_SECONDS)
+    return max_lag * 1_000
+
+
+async def _run_direct(connection: sqlite3.Connection, row_count: int) -> None:
+    connection.execute(SLOW_STATEMENT, (row_count,)).fetchall()
+
+
+async def _run_gateway(connection: sqlite3.Connection, row_count: int) -> None:
+    await gateway.execute(SLOW_STATEMENT, (row_count,))
+
+
+async def _measure(function, connection: sqlite3.Connection, row_count: int) -> tuple:
+    """Returns the duration of the statement in ms and the maximum event loop lag in ms"""
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_lag(stop))
+    await asyncio.sleep(TICK_SECONDS * 5)
+    start_time = time.perf_counter()
+    await function(connection, row_count)
+    duration = (time.perf_counter() - start_time) * 1_000
+    stop.set()
+    return duration, await lag_task
+
+
+async def main(row_count: int) -> None:
+    connection = sqlite3.connect(settings.DB_FILE, isolation_level=None)
+    await gateway.execute('SELECT 1') # Starts the worker thread
+    for name, function in (('On the event loop', _run_direct), ('Database gateway', _run_gateway)):
+        duration, max_lag = await _measure(function, connection, row_count)
+        print(f'{name:<18} statement {duration:,.1f} ms, max event loop lag {max_lag:,.1f} ms')
+    connection.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 3_000_000))
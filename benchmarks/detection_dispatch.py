@@ -0,0 +1,137 @@
+# detection_dispatch.py
+"""Benchmark for the per-message cost of routing Tree messages to the processing functions.
+
+Compares calling every processing function (the old behaviour of DetectionCog.on_message) with the trigger dispatcher.
+Only messages no processing function acts on are used for the comparison, so no database access happens. This is by
+far the most common case.
+
+Also compares the trigger matching itself: checking every trigger with "in" against scanning each slot once with the
+Aho-Corasick automaton, with the registered triggers and with a larger synthetic trigger set.
+
+Run from the bot directory: python -m benchmarks.detection_dispatch [iterations]
+"""
+
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+from cogs import detection # Imports all processing modules, so all processing functions are registered
+from processing import dispatcher, parsing
+
+
+# Typical Tree messages that no processing function acts on
+SAMPLE_MESSAGES = (
+    {'content': 'Miriel, you have to wait a bit before using this again.'},
+    {'title': 'Leaderboard', 'description': '**1.** Someone - 1,234,567 trophies\n**2.** Someone else - 1,234,566 trophies'},
+    {'title': 'Help', 'description': 'Use `/help <command>` to get more information about a command.',
+     'fields': [('Economy', '`prune` `clean` `daily`'), ('Raids', '`raid` `hive`')]},
+    {'author_name': 'Miriel\'s bunny', 'description': 'Your bunny is very happy!',
+     'fields': [('Stats', ':fertility: 5\n:epicness: 3')], 'footer': 'Bunnies like carrots'},
+    {'content': 'Hello there! Use /start to start playing.'},
+)
+
+
+def _create_message(data: dict) -> SimpleNamespace:
+    """Creates a minimal message object that has everything the processing functions look at"""
+    embeds = []
+    if any(key in data for key in ('title', 'description', 'author_name', 'fields', 'footer')):
+        embeds.append(SimpleNamespace(
+            author = SimpleNamespace(name=data.get('author_name', ''), icon_url=''),
+            description = data.get('description', ''),
+            fields = [SimpleNamespace(name=name, value=value) for name, value in data.get('fields', [])],
+            footer = SimpleNamespace(text=data.get('footer', ''), icon_url=''),
+            title = data.get('title', ''),
+        ))
+    return SimpleNamespace(content=data.get('content', ''), embeds=embeds, components=[], edited_at=None, mentions=[])
+
+
+async def _run_all_handlers(message, embed_data: parsing.EmbedData, text_displays: list) -> None:
+    for handler in dispatcher.get_all_handlers():
+        await handler.run(message, embed_data, text_displays, None, None)
+
+
+async def _run_dispatcher(message, embed_data: parsing.EmbedData, text_displays: list) -> None:
+    handlers = dispatcher.get_handlers(message, embed_data, text_displays)
+    for module_handlers in handlers.values():
+        for handler in module_handlers:
+            await handler.run(message, embed_data, text_displays, None, None)
+
+
+def _match_substrings(trigger_index: dict, slot_texts: dict) -> set:
+    """Trigger matching as the dispatcher did it before the automaton: every trigger against every slot text"""
+    found = set()
+    for slot, texts in slot_texts.items():
+        for trigger in trigger_index[slot]:
+            if any(trigger in text for text in texts): found.add(trigger)
+    return found
+
+
+def _match_automaton(automatons: dict, slot_texts: dict) -> set:
+    found = set()
+    for slot, texts in slot_texts.items():
+        for text in texts:
+            if text: found.update(automatons[slot].search(text))
+    return found
+
+
+def _measure_matching(function, matcher: dict, samples: list, iterations: int) -> float:
+    """Returns the average time per message in microseconds"""
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        for slot_texts in samples:
+            function(matcher, slot_texts)
+    return (time.perf_counter() - start_time) / (iterations * len(samples)) * 1_000_000
+
+
+def _compare_matching(trigger_index: dict, samples: list, iterations: int) -> None:
+    automatons = {slot: dispatcher.TriggerAutomaton(triggers) for slot, triggers in trigger_index.items()}
+    for slot_texts in samples:
+        if _match_substrings(trigger_index, slot_texts) != _match_automaton(automatons, slot_texts):
+            raise ValueError('Automaton and substring matching found different triggers.')
+    time_substrings = _measure_matching(_match_substrings, trigger_index, samples, iterations)
+    time_automaton = _measure_matching(_match_automaton, automatons, samples, iterations)
+    trigger_count = sum(len(triggers) for triggers in trigger_index.values())
+    print(f'{trigger_count:>5,} triggers: substrings {time_substrings:,.2f} µs, automaton {time_automaton:,.2f} µs')
+
+
+async def _measure(function, samples: list, iterations: int) -> float:
+    """Returns the average time per message in microseconds"""
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        for message, embed_data, text_displays in samples:
+            await function(message, embed_data, text_displays)
+    return (time.perf_counter() - start_time) / (iterations * len(samples)) * 1_000_000
+
+
+async def main(iterations: int) -> None:
+    samples = []
+    for data in SAMPLE_MESSAGES:
+        message = _create_message(data)
+        embed_data = await detection.parse_embed(message)
+        if dispatcher.get_handlers(message, embed_data, []):
+            raise ValueError(f'Sample message matches a trigger and would access the database: {data}')
+        samples.append((message, embed_data, []))
+    time_all_handlers = await _measure(_run_all_handlers, samples, iterations)
+    time_dispatcher = await _measure(_run_dispatcher, samples, iterations)
+    print(f'Registered handlers: {len(dispatcher.get_all_handlers())}')
+    print(f'All processing functions: {time_all_handlers:,.2f} µs per message')
+    print(f'Trigger dispatcher:       {time_dispatcher:,.2f} µs per message')
+    print(f'Speedup:                  {time_all_handlers / time_dispatcher:,.1f}x')
+
+    print('\nTrigger matching per message:')
+    trigger_index = {slot: set() for slot in dispatcher.SLOTS}
+    for handler in dispatcher.get_all_handlers():
+        for slot, slot_triggers in handler.triggers.items():
+            trigger_index[slot].update(slot_triggers)
+    slot_samples = [dispatcher.get_slot_texts(*sample) for sample in samples]
+    _compare_matching(trigger_index, slot_samples, iterations)
+    for factor in (4, 16):
+        scaled_index = {slot: {f'{trigger} {index}' if index else trigger for trigger in triggers
+                               for index in range(factor)}
+                        for slot, triggers in trigger_index.items()}
+        _compare_matching(scaled_index, slot_samples, iterations)
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000))
@@ -0,0 +1,157 @@
+# query_plans.py
+"""Checks that the hot database queries don't read whole tables.
+
+Creates a temporary database from the default database, applies all migrations and runs the database functions that
+are called all the time (e.g. on every message or every stats command) with a few rows of test data. All statements
+they send to the database are recorded and checked with EXPLAIN QUERY PLAN. If any of them scans a whole table
+instead of using an index, the plans are printed and the script exits with exit code 1.
+The bot database isn't touched.
+
+Run from the bot directory: python -m benchmarks.query_plans
+"""
+
+import asyncio
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from datetime import timedelta
+from typing import List, Tuple
+
+from discord import utils
+
+from resources import settings
+
+
+USER_ID = 1
+GUILD_ID = 1
+
+_STATEMENTS: List[Tuple[str, str, object]] = [] # (function, sql, parameters)
+_current_function = ''
+
+
+def _record(function):
+    """Returns a wrapper of a gateway function that records all statements before running them"""
+    async def record(sql, parameters=()):
+        _STATEMENTS.append((_current_function, sql, parameters[0] if function.__name__ == 'execute_many' else parameters))
+        return await function(sql, parameters)
+    return record
+
+
+def _record_transaction(function):
+    async def record_transaction(statements):
+        for sql, parameters in statements:
+            _STATEMENTS.append((_current_function, sql, parameters))
+        return await function(statements)
+    return record_transaction
+
+
+def _get_hot_functions() -> tuple:
+    """Returns the hot database functions as tuples (name, function that returns the coroutine)"""
+    from database import bunnies, guilds, reminders, tracking, users
+    current_time = utils.utcnow().replace(microsecond=0)
+
+    async def update_reminder() -> None:
+        reminder = await reminders.get_reminder(USER_ID, 'daily')
+        await reminder.update(end_time=current_time + timedelta(hours=2))
+
+    async def delete_reminder() -> None:
+        reminder = await reminders.get_reminder(USER_ID, 'daily')
+        await reminder.delete()
+
+    async def update_bunny() -> None:
+        bunny = await bunnies.get_bunny(USER_ID, 'Bunny')
+        await bunny.update(fertility=2)
+
+    async def update_user() -> None:
+        user = await users.get_user(USER_ID)
+        await user.update(xp=1)
+
+    return (
+        ('users.insert_user', lambda: users.insert_user(USER_ID)),
+        ('users.get_user', lambda: users.get_user(USER_ID)),
+        ('User.update', update_user),
+        ('guilds.get_guild', lambda: guilds.get_guild(GUILD_ID)),
+        ('reminders.insert_reminder',
+         lambda: reminders.insert_reminder(USER_ID, 'daily', timedelta(hours=1), 1, 'Daily!')),
+        ('reminders.get_reminder', lambda: reminders.get_reminder(USER_ID, 'daily')),
+        ('reminders.get_active_reminders (all)', lambda: reminders.get_active_reminders()),
+        ('reminders.get_active_reminders (user)', lambda: reminders.get_active_reminders(USER_ID)),
+        ('reminders.get_active_reminders (user, activity)', lambda: reminders.get_active_reminders(USER_ID, 'custom')),
+        ('reminders.get_active_reminders (activity)', lambda: reminders.get_active_reminders(None, 'daily')),
+        ('reminders.get_due_reminders (all)', lambda: reminders.get_due_reminders()),
+        ('reminders.get_due_reminders (user)', lambda: reminders.get_due_reminders(USER_ID)),
+        ('reminders.get_old_reminders (all)', lambda: reminders.get_old_reminders()),
+        ('reminders.delete_old_reminders', lambda: reminders.delete_old_reminders()),
+        ('reminders.load_reminder_schedule', lambda: reminders.load_reminder_schedule()),
+        ('reminders.claim_due_reminders', lambda: reminders.claim_due_reminders()),
+        ('Reminder.update', update_reminder),
+        ('Reminder.delete', delete_reminder),
+        ('bunnies.insert_bunny', lambda: bunnies.insert_bunny(USER_ID, 'Bunny', 1, 1)),
+        ('bunnies.get_bunny', lambda: bunnies.get_bunny(USER_ID, 'Bunny')),
+        ('bunnies.get_bunnies_by_user_id', lambda: bunnies.get_bunnies_by_user_id(USER_ID)),
+        ('Bunny.update', update_bunny),
+        ('tracking.insert_log_entry',
+         lambda: tracking.insert_log_entry(USER_ID, GUILD_ID, 'prune', current_time - timedelta(days=40))),
+        ('tracking.flush_log_entries', lambda: tracking.flush_log_entries()),
+        ('tracking.get_log_entries', lambda: tracking.get_log_entries(USER_ID, 'prune', timedelta(days=7))),
+        ('tracking.get_old_log_entries', lambda: tracking.get_old_log_entries(28)),
+        ('tracking.get_log_report_windows',
+         lambda: tracking.get_log_report_windows(USER_ID, (timedelta(hours=1), timedelta(days=7), timedelta(days=365)))),
+        ('tracking.consolidate_log_entries', lambda: tracking.consolidate_log_entries(28)),
+    )
+
+
+def _get_full_scans(plan: List[tuple]) -> List[str]:
+    """Returns all lines of a query plan that scan a whole table (or a whole index). Subqueries are scanned by design,
+    so they are ignored."""
+    subqueries = set()
+    full_scans = []
+    for _, _, _, detail in plan:
+        match = re.match(r'(?:MATERIALIZE|CO-ROUTINE) (\S+)', detail)
+        if match: subqueries.add(match.group(1))
+        match = re.match(r'SCAN (\S+)', detail)
+        if (match and match.group(1) not in subqueries and match.group(1) != 'CONSTANT'
+            and not match.group(1).startswith('(')):
+            full_scans.append(detail)
+    return full_scans
+
+
+async def main() -> None:
+    global _current_function
+    from database import gateway, migrations
+    await migrations.run_migrations()
+    gateway.read = _record(gateway.read)
+    gateway.execute = _record(gateway.execute)
+    gateway.execute_many = _record(gateway.execute_many)
+    gateway.execute_transaction = _record_transaction(gateway.execute_transaction)
+    for name, function in _get_hot_functions():
+        _current_function = name
+        try:
+            await function()
+        except Exception as error:
+            print(f'{name}: {error.__class__.__name__} {error}'.strip())
+    connection = sqlite3.connect(settings.DB_FILE)
+    failed_statements = 0
+    for name, sql, parameters in _STATEMENTS:
+        if sql.startswith('INSERT INTO errors'): continue
+        plan = connection.execute(f'EXPLAIN QUERY PLAN {sql}', parameters).fetchall()
+        full_scans = _get_full_scans(plan)
+        if full_scans:
+            failed_statements += 1
+            print(f'\nFULL SCAN in {name}:\n{sql}\n' + '\n'.join(f'  {detail}' for _, _, _, detail in plan))
+    connection.close()
+    print(f'\nChecked {len(_STATEMENTS):,} statements, {failed_statements:,} with full table scans.')
+    if failed_statements: sys.exit(1)
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        settings.DB_FILE = os.path.join(directory, 'benchmark.db')
+        connection = sqlite3.connect(settings.DB_FILE)
+        default_db = sqlite3.connect(f'{settings.BOT_DIR}/database/default_db.db')
+        default_db.backup(connection)
+        default_db.close()
+        connection.close()
+        asyncio.run(main())
@@ -0,0 +1,88 @@
+# reminder_delivery.py
+"""Benchmark for sending a burst of reminders through the delivery queue.
+
+Sends the given amount of reminders to fake channels at the same time, like the calendar reminders after midnight.
+The channels don't talk to Discord, they only record when they got which message after a short fake latency. Then
+checks that every reminder arrived exactly once, no message is longer than the limit, and neither the channel nor the
+global rate limit of the queue was exceeded. Prints the amount of messages, the delivery lag and the time it took.
+
+Run from the bot directory: python -m benchmarks.reminder_delivery [reminders] [channels]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from typing import List, Tuple
+
+from resources import delivery
+
+
+LATENCY = 0.05 # Seconds
+
+
+class FakeUser():
+    def __init__(self, user_id: int) -> None:
+        self.id = user_id
+
+
+class FakeChannel():
+    def __init__(self, channel_id: int) -> None:
+        self.id = channel_id
+        self.messages: List[Tuple[float, str]] = [] # (time sent (monotonic), content)
+
+    async def send(self, content: str, allowed_mentions=None) -> None:
+        sent_time = time.monotonic()
+        await asyncio.sleep(LATENCY)
+        self.messages.append((sent_time, content))
+
+
+def _get_max_sent(times: List[float], timeframe: float) -> int:
+    """Returns the most messages that were sent within any timeframe of the given seconds"""
+    times = sorted(times)
+    max_sent = start = 0
+    for end, sent_time in enumerate(times):
+        while sent_time - times[start] >= timeframe: start += 1
+        max_sent = max(max_sent, end - start + 1)
+    return max_sent
+
+
+def _check_rate(times: List[float], rate: float, burst: int, name: str) -> None:
+    for timeframe in (1, 5, 10):
+        max_sent = _get_max_sent(times, timeframe)
+        if max_sent > burst + rate * timeframe:
+            raise ValueError(f'{name}: {max_sent} messages within {timeframe} s.')
+
+
+async def main(reminder_count: int, channel_count: int) -> None:
+    channels = [FakeChannel(channel_id) for channel_id in range(channel_count)]
+    reminders = [
+        (random.choice(channels), f'<@{user_id}> Hey! Your calendar is ready! Use `/calendar` to claim it. ({user_id})')
+        for user_id in range(reminder_count)
+    ]
+    start_time = time.perf_counter()
+    await asyncio.gather(*(delivery.send(channel, content, (FakeUser(0),)) for channel, content in reminders))
+    time_passed = time.perf_counter() - start_time
+    all_times = []
+    for channel in channels:
+        received = [line for _, content in channel.messages for line in content.split('\n')]
+        expected = [content for reminder_channel, content in reminders if reminder_channel is channel]
+        if sorted(received) != sorted(expected):
+            raise ValueError(f'Channel {channel.id} got the wrong reminders.')
+        if any(len(content) > delivery.MESSAGE_MAX_LENGTH for _, content in channel.messages):
+            raise ValueError(f'Channel {channel.id} got a message that is too long.')
+        times = [sent_time for sent_time, _ in channel.messages]
+        _check_rate(times, delivery.DELIVERY_CHANNEL_RATE, delivery.DELIVERY_CHANNEL_BURST, f'Channel {channel.id}')
+        all_times.extend(times)
+    _check_rate(all_times, delivery.DELIVERY_GLOBAL_RATE, delivery.DELIVERY_GLOBAL_BURST, 'All channels')
+    stats = delivery.get_stats()
+    print(f'Reminders: {reminder_count:,} in {channel_count:,} channels')
+    print(f'Messages sent: {stats.messages:,}')
+    print(f'Delivery lag: {stats.lag_average:,.0f} ms average, {stats.lag_max:,.0f} ms max')
+    print(f'Time: {time_passed:,.2f} s')
+
+
+if __name__ == '__main__':
+    reminder_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    channel_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    asyncio.run(main(reminder_count, channel_count))
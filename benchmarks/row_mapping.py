@@ -0,0 +1,101 @@
+# row_mapping.py
+"""Benchmark for creating User, Reminder and LogEntry objects from database rows.
+
+Compares the old way of creating the objects (converting every row to a dict and awaiting one coroutine per row that
+looks up every column by name) with the compiled row mappers that create all objects from the row tuples in one go.
+The rows are read from an in-memory database with the schema of the default database and all migrations, so the bot
+database isn't touched.
+
+Run from the bot directory: python -m benchmarks.row_mapping [rows]
+"""
+
+import asyncio
+import sqlite3
+import sys
+import time
+
+from database import mappers, migrations, reminders, tracking, users
+from resources import settings, strings
+
+
+def _create_database(row_count: int) -> sqlite3.Connection:
+    """Creates an in-memory database with the default schema, all migrations and row_count rows in each table"""
+    connection = sqlite3.connect(':memory:')
+    connection.row_factory = sqlite3.Row
+    default_db = sqlite3.connect(f'{settings.BOT_DIR}/database/default_db.db')
+    default_db.backup(connection)
+    default_db.close()
+    for version in range(migrations.BASE_SCHEMA_VERSION + 1, migrations.SCHEMA_VERSION + 1):
+        for sql in migrations.MIGRATIONS[version]:
+            connection.execute(sql)
+    message_columns = [f'{strings.ACTIVITIES_COLUMNS[activity]}_message' for activity in strings.DEFAULT_MESSAGES]
+    connection.executemany(
+        f'INSERT INTO users (user_id, {", ".join(message_columns)}) VALUES ({", ".join("?" * (len(message_columns) + 1))})',
+        ((user_id, *strings.DEFAULT_MESSAGES.values()) for user_id in range(row_count))
+    )
+    start_time = int(time.time())
+    connection.executemany(
+        'INSERT INTO reminders (user_id, activity, channel_id, end_time, message) VALUES (?, ?, ?, ?, ?)',
+        ((user_id, 'daily', 1, start_time + user_id * 60, 'Hey! It\'s time for daily!')
+         for user_id in range(row_count))
+    )
+    connection.executemany(
+        'INSERT INTO tracking_log (user_id, guild_id, command_or_drop, date_time) VALUES (?, ?, ?, ?)',
+        ((index % 100, 1, 'prune', start_time - index) for index in range(row_count))
+    )
+    return connection
+
+
+async def _dict_to_object(mapper: mappers.RowMapper, record: dict):
+    """Creates an object the way the old _dict_to_* functions did it: one coroutine per record and a dict lookup per
+    column"""
+    values = {}
+    for column in mapper.columns:
+        column_values = [record.get(column_name, None) if column.optional else record[column_name]
+                         for column_name in (column.columns if column.columns else (column.attribute,))]
+        values[column.attribute] = column.convert(*column_values) if column.convert else column_values[0]
+    return mapper.record_class(**values)
+
+
+async def _map_row_by_row(mapper: mappers.RowMapper, description: tuple, records: list) -> tuple:
+    objects = []
+    for record in records:
+        objects.append(await _dict_to_object(mapper, dict(record)))
+    return tuple(objects)
+
+
+async def _map_bulk(mapper: mappers.RowMapper, description: tuple, records: list) -> tuple:
+    return mapper.map_rows(description, records)
+
+
+async def _measure(function, mapper: mappers.RowMapper, description: tuple, records: list) -> float:
+    """Returns the average time per row in microseconds"""
+    start_time = time.perf_counter()
+    await function(mapper, description, records)
+    return (time.perf_counter() - start_time) / len(records) * 1_000_000
+
+
+async def main(row_count: int) -> None:
+    connection = _create_database(row_count)
+    tables = (
+        ('users', users._USER_MAPPER),
+        ('reminders', reminders._REMINDER_MAPPER),
+        ('tracking_log', tracking._LOG_ENTRY_MAPPER),
+    )
+    print(f'Rows per table: {row_count:,}')
+    for table, mapper in tables:
+        cur = connection.execute(f'SELECT * FROM {table}')
+        records = cur.fetchall()
+        if await _map_row_by_row(mapper, cur.description, records) != await _map_bulk(mapper, cur.description, records):
+            raise ValueError(f'Row by row and bulk mapping created different objects for table {table}.')
+        time_row_by_row = await _measure(_map_row_by_row, mapper, cur.description, records)
+        time_bulk = await _measure(_map_bulk, mapper, cur.description, records)
+        print(
+            f'{table:<13} dict per row {time_row_by_row:,.2f} µs, compiled mapper {time_bulk:,.2f} µs '
+            f'({time_row_by_row / time_bulk:,.1f}x)'
+        )
+    connection.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
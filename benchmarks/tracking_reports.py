@@ -0,0 +1,136 @@
+# tracking_reports.py
+"""Benchmark for the stats reports of a heavy user.
+
+Creates a temporary database from the default database with all migrations and the log of one user with a year of
+consolidated summaries and the given amount of single log entries in the last 28 days. The log entries are all at
+half past an hour, so they don't move in or out of a timeframe while the benchmark runs. Then builds the seven reports
+of the stats overview by summing up the log entries (the old way), from the rollup tables with one statement per
+report and from the rollup tables with one statement for all reports, and checks all return the same amounts. The
+bot database isn't touched.
+
+Run from the bot directory: python -m benchmarks.tracking_reports [single log entries]
+"""
+
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+from discord import utils
+
+from resources import settings
+
+
+TIMEFRAMES = (
+    timedelta(hours=1), timedelta(hours=12), timedelta(hours=24), timedelta(days=7), timedelta(days=28),
+    timedelta(days=365), timedelta(days=200, hours=5),
+)
+COMMANDS = ('prune', 'clean', 'captcha', 'wooden-nugget', 'copper-nugget', 'silver-nugget', 'bee-bread')
+USER_ID = 1
+RUNS = 20
+
+
+def _create_database(database_file: str) -> None:
+    """Creates a database from the default database"""
+    connection = sqlite3.connect(database_file)
+    default_db = sqlite3.connect(f'{settings.BOT_DIR}/database/default_db.db')
+    default_db.backup(connection)
+    default_db.close()
+    connection.close()
+
+
+def _insert_log(database_file: str, row_count: int) -> None:
+    """Inserts the log of one user. Needs the migrated database, so the rollup tables are filled by the triggers."""
+    from database import mappers
+    connection = sqlite3.connect(database_file, isolation_level=None)
+    current_time = utils.utcnow()
+    summary_time = mappers.to_timestamp(current_time.replace(hour=23, minute=59, second=59))
+    connection.execute('BEGIN')
+    connection.executemany(
+        'INSERT INTO tracking_log (user_id, guild_id, command_or_drop, amount, date_time, type) VALUES (?, ?, ?, ?, ?, ?)',
+        ((USER_ID, 1, command, random.randint(50, 500), summary_time - days * 86_400, 'summary')
+         for days in range(29, 366) for command in COMMANDS)
+    )
+    connection.executemany(
+        'INSERT INTO tracking_log (user_id, guild_id, command_or_drop, amount, date_time) VALUES (?, ?, ?, ?, ?)',
+        ((USER_ID, 1, random.choice(COMMANDS), 1,
+          mappers.to_timestamp((current_time - timedelta(hours=random.randint(1, 28 * 24))).replace(minute=30, second=0)))
+         for _ in range(row_count))
+    )
+    connection.execute('COMMIT')
+    connection.close()
+
+
+async def _get_report_from_log(timeframe: timedelta) -> dict:
+    """Builds a report the way get_log_report did it before the rollup tables"""
+    from database import gateway, mappers
+    cur = await gateway.read(
+        'SELECT command_or_drop, SUM(amount) FROM tracking_log WHERE user_id=? AND date_time>=? '
+        'GROUP BY command_or_drop',
+        (USER_ID, mappers.to_timestamp(utils.utcnow() - timeframe))
+    )
+    return {record[0]: record[1] for record in cur.fetchall()}
+
+
+def _report_to_dict(report) -> dict:
+    return {
+        'prune': report.prune_amount, 'clean': report.clean_amount, 'captcha': report.captcha_amount,
+        'wooden-nugget': report.nugget_wooden_amount, 'copper-nugget': report.nugget_copper_amount,
+        'silver-nugget': report.nugget_silver_amount, 'bee-bread': report.bee_bread_amount,
+    }
+
+
+async def _get_reports_from_log() -> list:
+    return [await _get_report_from_log(timeframe) for timeframe in TIMEFRAMES]
+
+
+async def _get_reports_from_rollups() -> list:
+    from database import tracking
+    return [_report_to_dict(await tracking.get_log_report(USER_ID, timeframe)) for timeframe in TIMEFRAMES]
+
+
+async def _get_reports_from_rollups_windows() -> list:
+    from database import tracking
+    return [_report_to_dict(report) for report in await tracking.get_log_report_windows(USER_ID, TIMEFRAMES)]
+
+
+async def _measure(function) -> float:
+    """Returns the average time in ms for building all reports of the stats overview"""
+    start_time = time.perf_counter()
+    for _ in range(RUNS):
+        await function()
+    return (time.perf_counter() - start_time) / RUNS * 1_000
+
+
+async def main(row_count: int) -> None:
+    from database import migrations
+    await migrations.run_migrations()
+    _insert_log(settings.DB_FILE, row_count)
+    functions = (
+        ('Sum of log entries', _get_reports_from_log),
+        ('Rollup tables, one statement per report', _get_reports_from_rollups),
+        ('Rollup tables, one statement', _get_reports_from_rollups_windows),
+    )
+    all_reports = []
+    for _, function in functions:
+        reports = await function()
+        all_reports.append([{command: amount for command, amount in report.items() if amount} for report in reports])
+    if any(reports != all_reports[0] for reports in all_reports):
+        raise ValueError('Reports are different.')
+    print(f'Single log entries in the last 28 days: {row_count:,}')
+    time_log = await _measure(_get_reports_from_log)
+    for name, function in functions:
+        time_function = await _measure(function)
+        print(f'{name:<41} {time_function:,.2f} ms ({time_log / time_function:,.1f}x)')
+
+
+if __name__ == '__main__':
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as directory:
+        settings.DB_FILE = os.path.join(directory, 'benchmark.db')
+        _create_database(settings.DB_FILE)
+        asyncio.run(main(row_count))
@@ -8,11 +8,13 @@ import discord
 from discord import utils
 from discord.ext import commands
 
-from database import errors, guilds
+from database import cooldowns, errors, guilds, migrations, tracking
 from database import settings as settings_db
 from resources import functions, settings
 
 
+functions.await_coroutine(migrations.run_migrations())
+functions.await_coroutine(cooldowns.load_cooldowns())
 startup_time = datetime.isoformat(utils.utcnow().replace(microsecond=0), sep=' ')
 functions.await_coroutine(settings_db.update_setting('startup_time', startup_time))
 
@@ -99,4 +101,7 @@ if __name__ == '__main__':
         bot.load_extension(extension)
 
 
-bot.run(settings.TOKEN)
\ No newline at end of file
+bot.run(settings.TOKEN)
+
+# Write tracking entries that are still waiting to be inserted
+tracking.flush_log_entries_on_shutdown()
@@ -1,11 +1,26 @@
 # messages.py
-"""Contains the message cache and access to it. Cache is populated by cogs.cache."""
+"""Contains the message cache and access to it. Cache is populated by cogs.cache.
+
+Messages are stored per channel as compact snapshots that only contain what the processing functions read and the
+normalized data find_message needs (encoded author name, author id and the lowercased content without bot mentions).
+Every channel also has an index by author id and author name, so a lookup for a user only looks at the recent
+messages of that user.
+
+The cache is bounded: Every channel keeps its last 50 messages, and if more than MAX_CHANNELS channels are cached,
+the least recently used channel is dropped. Old messages are deleted by time buckets, so only channels that received
+messages in an expired bucket have to be looked at.
+
+If a lookup doesn't find anything, it registers a waiter for its channel that store_message resolves as soon as a
+matching message arrives.
+"""
 
 import asyncio
 from argparse import ArgumentError
-from datetime import timedelta
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
 import re
-from typing import Optional, Union
+import sys
+from typing import Deque, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 
 import discord
 from discord import utils
@@ -13,13 +28,130 @@ from discord import utils
 from resources import functions, logs, settings
 
 
-_MESSAGE_CACHE = {}
+MESSAGES_PER_CHANNEL = 50
+MAX_CHANNELS = 5_000
+EVICTION_BUCKET_SECONDS = 60
+FIND_MESSAGE_TIMEOUT = 1.5 # Seconds find_message waits for a message that isn't cached yet
+
+_BOT_MENTIONS = re.compile(rf'<@!?(?:{settings.TREE_ID}|{settings.TREE_BETA_ID})>')
+
+
+# Containers
+class MessageSnapshot():
+    """Object that represents a cached message. Only contains the message data the processing functions need."""
+    __slots__ = ('id', 'channel_id', 'author', 'author_id', 'author_name', 'content', 'content_normalized',
+                 'mentions', 'created_at', 'size')
+
+    def __init__(self, message: discord.Message) -> None:
+        self.id: int = message.id
+        self.channel_id: int = message.channel.id
+        self.author: Union[discord.User, discord.Member] = message.author
+        self.author_id: int = message.author.id
+        self.author_name: str = functions.encode_text_non_async(message.author.name)
+        self.content: str = message.content
+        self.content_normalized: str = _BOT_MENTIONS.sub('', message.content.lower())
+        self.mentions: Tuple[Union[discord.User, discord.Member]] = tuple(message.mentions)
+        self.created_at: datetime = message.created_at
+        self.size: int = (sys.getsizeof(self) + sys.getsizeof(self.author_name) + sys.getsizeof(self.content)
+                          + sys.getsizeof(self.content_normalized) + sys.getsizeof(self.mentions))
+
+
+class ChannelCache():
+    """Object that contains the cached messages of a channel, newest first, and the indexes by author."""
+    __slots__ = ('entries', 'by_author_id', 'by_author_name')
+
+    def __init__(self) -> None:
+        self.entries: Deque[MessageSnapshot] = deque(maxlen=MESSAGES_PER_CHANNEL)
+        self.by_author_id: Dict[int, Deque[MessageSnapshot]] = {}
+        self.by_author_name: Dict[str, Deque[MessageSnapshot]] = {}
+
+    def add(self, entry: MessageSnapshot) -> Optional[MessageSnapshot]:
+        """Adds an entry as the newest message of the channel.
+        Returns the oldest entry if it had to be removed to stay within MESSAGES_PER_CHANNEL."""
+        removed_entry = self.remove_oldest() if len(self.entries) == self.entries.maxlen else None
+        self.entries.appendleft(entry)
+        self.by_author_id.setdefault(entry.author_id, deque()).appendleft(entry)
+        self.by_author_name.setdefault(entry.author_name, deque()).appendleft(entry)
+        return removed_entry
+
+    def remove_oldest(self) -> MessageSnapshot:
+        """Removes the oldest message of the channel and returns it.
+        As all deques are ordered newest first, the oldest entry is at the end of its author deques as well."""
+        entry = self.entries.pop()
+        for index, key in ((self.by_author_id, entry.author_id), (self.by_author_name, entry.author_name)):
+            author_entries = index[key]
+            author_entries.pop()
+            if not author_entries: del index[key]
+        return entry
+
+    def get_size(self) -> int:
+        """Returns the memory used by the containers of the channel (without the entries)."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.entries)
+        for index in (self.by_author_id, self.by_author_name):
+            size += sys.getsizeof(index) + sum(sys.getsizeof(author_entries) for author_entries in index.values())
+        return size
+
+
+class MessageWaiter(NamedTuple):
+    """Object that represents a find_message call that waits for a matching message to be stored."""
+    future: asyncio.Future
+    regex: Union[str, re.Pattern, None]
+    user_id: Optional[int]
+    user_name_encoded: Optional[str]
+
+
+class MessageCacheStats(NamedTuple):
+    """Object that represents the current state of the message cache."""
+    channels: int
+    messages: int
+    memory_used: int # Bytes
+    channels_evicted: int
+    messages_evicted: int
+    messages_expired: int
+
+
+_MESSAGE_CACHE: 'OrderedDict[int, ChannelCache]' = OrderedDict() # Least recently used channel first
+_EVICTION_BUCKETS: Dict[int, Set[int]] = {} # bucket: IDs of the channels that received messages in that bucket
+_WAITERS: Dict[int, List[MessageWaiter]] = {} # channel id: waiting find_message calls
+_STATS = {'entries_size': 0, 'channels_evicted': 0, 'messages_evicted': 0, 'messages_expired': 0}
+
+
+def _entry_matches(entry: MessageSnapshot, regex: Union[str, re.Pattern, None], user_id: Optional[int],
+                   user_name_encoded: Optional[str]) -> bool:
+    """Checks if a cached message matches the search arguments of find_message."""
+    if user_id is not None and entry.author_id != user_id: return False
+    if user_name_encoded is not None and entry.author_name != user_name_encoded: return False
+    return regex is None or re.search(regex, entry.content_normalized) is not None
+
+
+def _find_entry(channel_id: int, regex: Union[str, re.Pattern, None], user_id: Optional[int],
+                user_name_encoded: Optional[str]) -> Optional[MessageSnapshot]:
+    """Returns the newest cached message that matches the search arguments of find_message or None if not found."""
+    channel_cache = _MESSAGE_CACHE.get(channel_id, None)
+    if channel_cache is None: return None
+    if user_id is not None:
+        entries = channel_cache.by_author_id.get(user_id, ())
+    elif user_name_encoded is not None:
+        entries = channel_cache.by_author_name.get(user_name_encoded, ())
+    else:
+        entries = channel_cache.entries
+    for entry in entries:
+        if _entry_matches(entry, regex, user_id, user_name_encoded): return entry
+    return None
+
+
+def _get_bucket(time: datetime) -> int:
+    """Returns the eviction bucket of a time."""
+    return int(time.timestamp()) // EVICTION_BUCKET_SECONDS
 
 
 async def find_message(channel_id: int, regex: Union[str, re.Pattern] = None,
-                      user: Optional[discord.User] = None, user_name: Optional[str] = None) -> discord.Message:
+                      user: Optional[discord.User] = None, user_name: Optional[str] = None,
+                      timeout: float = FIND_MESSAGE_TIMEOUT) -> MessageSnapshot:
     """Looks through the last 50 messages in the channel history. If a message that matches regex is found, it returns
     the message. If user and/or user_name are defined, only messages from that user are returned.
+    If no message is found, this waits until a matching message is stored or the timeout is reached. This covers
+    Tree answering before the command message arrived.
 
     Arguments
     ---------
@@ -29,67 +161,104 @@ async def find_message(channel_id: int, regex: Union[str, re.Pattern] = None,
     user: User object the message author has to match.
     user_name: User name the message author has to match. If user is also defined, this is ignored.
     If both user and user_name are None, this function returns the first message that matches the regex is not from a bot.
+    timeout: Seconds to wait for a matching message if none is cached yet.
 
     Returns
     -------
-    The found message. Returns None if no matching message was found.
+    The snapshot of the found message. Returns None if no matching message was found.
 
     Raises
     ------
     ArgumentError if regex, user AND user_name are None.
     """
-    attempts = 1
-    while attempts <= 2:
-        if regex is None and user is None and user_name is None:
-            raise ArgumentError('At least one of these arguments has to be defined: regex, user, user_name.')
-        channel_messages = _MESSAGE_CACHE.get(channel_id, None)
-        if channel_messages is None: return None
-        for message in channel_messages:
-            if user is not None and message.author != user: continue
-            if (user_name is not None
-                and await functions.encode_text(user_name) != await functions.encode_text(message.author.name)):
-                continue
-            if regex is None:
-                return message
-            else:
-                message_content = re.sub(rf'<@!?{settings.TREE_ID}>', '', message.content.lower())
-                message_content = re.sub(rf'<@!?{settings.TREE_BETA_ID}>', '', message.content.lower())
-                match = re.search(regex, message_content)
-                if match: return message
-        await asyncio.sleep(0.5)
-        logs.logger.info('Required a second attempt for getting a message from the message cache.')
-        attempts += 1
-    return None
+    if regex is None and user is None and user_name is None:
+        raise ArgumentError('At least one of these arguments has to be defined: regex, user, user_name.')
+    user_id = user.id if user is not None else None
+    user_name_encoded = functions.encode_text_non_async(user_name) if user_name is not None else None
+    entry = _find_entry(channel_id, regex, user_id, user_name_encoded)
+    if entry is not None: return entry
+    if timeout <= 0: return None
+    waiter = MessageWaiter(asyncio.get_running_loop().create_future(), regex, user_id, user_name_encoded)
+    channel_waiters = _WAITERS.setdefault(channel_id, [])
+    channel_waiters.append(waiter)
+    try:
+        entry = await asyncio.wait_for(waiter.future, timeout)
+        logs.logger.info('Had to wait for a message to arrive in the message cache.')
+        return entry
+    except asyncio.TimeoutError:
+        return None
+    finally:
+        channel_waiters.remove(waiter)
+        if not channel_waiters and _WAITERS.get(channel_id) is channel_waiters: del _WAITERS[channel_id]
 
 
-async def store_message(message: discord.Message) -> discord.Message:
-    """Adds a message to the message cache.
-    Also keeps the maximum amount of messages stored per channel at 50."""
-    channel_message_list = _MESSAGE_CACHE.get(message.channel.id, None)
-    if channel_message_list is None:
-        channel_message_list = [message,]
+async def store_message(message: discord.Message) -> None:
+    """Adds a message to the message cache and hands it to all find_message calls that are waiting for it.
+    Also keeps the maximum amount of messages stored per channel at 50 and the amount of channels at MAX_CHANNELS."""
+    entry = MessageSnapshot(message)
+    channel_cache = _MESSAGE_CACHE.get(entry.channel_id, None)
+    if channel_cache is None:
+        channel_cache = _MESSAGE_CACHE[entry.channel_id] = ChannelCache()
+        if len(_MESSAGE_CACHE) > MAX_CHANNELS:
+            _, evicted_channel_cache = _MESSAGE_CACHE.popitem(last=False)
+            _STATS['entries_size'] -= sum(evicted_entry.size for evicted_entry in evicted_channel_cache.entries)
+            _STATS['channels_evicted'] += 1
     else:
-        channel_message_list.insert(0, message)
-    if len(channel_message_list) > 50:
-        channel_message_list = channel_message_list[:50]
-    _MESSAGE_CACHE[message.channel.id] = channel_message_list
+        _MESSAGE_CACHE.move_to_end(entry.channel_id)
+    removed_entry = channel_cache.add(entry)
+    _STATS['entries_size'] += entry.size
+    if removed_entry is not None:
+        _STATS['entries_size'] -= removed_entry.size
+        _STATS['messages_evicted'] += 1
+    _EVICTION_BUCKETS.setdefault(_get_bucket(entry.created_at), set()).add(entry.channel_id)
+    for waiter in _WAITERS.get(entry.channel_id, ()):
+        if not waiter.future.done() and _entry_matches(entry, waiter.regex, waiter.user_id, waiter.user_name_encoded):
+            waiter.future.set_result(entry)
 
 
 async def delete_old_messages(timespan: timedelta) -> int:
     """Deletes messages older than the specified timeframe.
+    Only channels that received messages in an eviction bucket that is older than the timeframe are checked.
 
     Returns
     -------
     Amount of messages deleted: int
     """
-    current_time = utils.utcnow()
+    minimum_time = utils.utcnow() - timespan
+    minimum_bucket = _get_bucket(minimum_time)
     message_count = 0
-    for channel_id, channel_messages in _MESSAGE_CACHE.items():
-        for message in channel_messages:
-            if message.created_at < (current_time - timespan):
-                _MESSAGE_CACHE[channel_id].remove(message)
+    for bucket in sorted(bucket for bucket in _EVICTION_BUCKETS if bucket <= minimum_bucket):
+        channel_ids = _EVICTION_BUCKETS[bucket]
+        if bucket == minimum_bucket:
+            # Partly expired, messages of this bucket that are still in the timeframe are deleted in the next run
+            channel_ids = set(channel_ids)
+        else:
+            del _EVICTION_BUCKETS[bucket]
+        for channel_id in channel_ids:
+            channel_cache = _MESSAGE_CACHE.get(channel_id, None)
+            if channel_cache is None: continue
+            while channel_cache.entries and channel_cache.entries[-1].created_at < minimum_time:
+                _STATS['entries_size'] -= channel_cache.remove_oldest().size
                 message_count += 1
-    if message_count > 0:
-        for key in list(_MESSAGE_CACHE.keys()):
-            if not _MESSAGE_CACHE[key]: del _MESSAGE_CACHE[key]
-    return message_count
\ No newline at end of file
+            if not channel_cache.entries: del _MESSAGE_CACHE[channel_id]
+    _STATS['messages_expired'] += message_count
+    return message_count
+
+
+def get_stats() -> MessageCacheStats:
+    """Returns the size, the memory used and the eviction counters of the message cache.
+    The memory used contains the snapshots and all containers of the cache, but not the user objects of the authors
+    and mentions which are shared with the discord cache."""
+    memory_used = sys.getsizeof(_MESSAGE_CACHE) + _STATS['entries_size']
+    message_count = 0
+    for channel_cache in _MESSAGE_CACHE.values():
+        memory_used += channel_cache.get_size()
+        message_count += len(channel_cache.entries)
+    return MessageCacheStats(
+        channels = len(_MESSAGE_CACHE),
+        messages = message_count,
+        memory_used = memory_used,
+        channels_evicted = _STATS['channels_evicted'],
+        messages_evicted = _STATS['messages_evicted'],
+        messages_expired = _STATS['messages_expired'],
+    )
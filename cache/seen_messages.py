@@ -0,0 +1,82 @@
+# seen_messages.py
+"""Contains the cache of already processed Tree messages that is used to ignore duplicate message events.
+
+Messages are stored with a fixed-size digest of their content. Entries are kept in the order they were last seen,
+so expired entries are always at the front and can be removed without looking at the rest of the cache. If the
+cache is full, the least recently seen entry is evicted.
+"""
+
+from collections import OrderedDict
+import hashlib
+import time
+from typing import NamedTuple
+
+import discord
+
+from processing import parsing
+
+
+SEEN_MESSAGE_TTL = 60 # Seconds a message is remembered after it was last seen
+SEEN_MESSAGE_MAX_ENTRIES = 10_000
+
+_SEEN_MESSAGES: 'OrderedDict[bytes, float]' = OrderedDict() # digest: time last seen (monotonic)
+_STATS = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+
+# Containers
+class SeenMessagesStats(NamedTuple):
+    """Object that represents the current state of the seen messages cache."""
+    entries: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+def _get_digest(message: discord.Message, embed_data: parsing.EmbedData) -> bytes:
+    """Returns a 16 byte digest of the message id, content, embed and components."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(message.id.to_bytes(8, 'big'))
+    for value in (message.content, repr(embed_data), str(message.components)):
+        digest.update(value.encode('utf-8', errors='surrogatepass'))
+        digest.update(b'\x00')
+    return digest.digest()
+
+
+def _delete_expired(current_time: float) -> None:
+    """Deletes all entries that were last seen more than SEEN_MESSAGE_TTL seconds ago."""
+    expiry_time = current_time - SEEN_MESSAGE_TTL
+    while _SEEN_MESSAGES:
+        digest, time_seen = next(iter(_SEEN_MESSAGES.items()))
+        if time_seen > expiry_time: break
+        del _SEEN_MESSAGES[digest]
+        _STATS['expirations'] += 1
+
+
+def check_and_store(message: discord.Message, embed_data: parsing.EmbedData) -> bool:
+    """Checks if the message was already seen in its current state and remembers it.
+
+    Returns
+    -------
+    - True if the message was already seen (duplicate)
+    - False otherwise
+    """
+    current_time = time.monotonic()
+    _delete_expired(current_time)
+    digest = _get_digest(message, embed_data)
+    if digest in _SEEN_MESSAGES:
+        _SEEN_MESSAGES.move_to_end(digest)
+        _SEEN_MESSAGES[digest] = current_time
+        _STATS['hits'] += 1
+        return True
+    _SEEN_MESSAGES[digest] = current_time
+    _STATS['misses'] += 1
+    if len(_SEEN_MESSAGES) > SEEN_MESSAGE_MAX_ENTRIES:
+        _SEEN_MESSAGES.popitem(last=False)
+        _STATS['evictions'] += 1
+    return False
+
+
+def get_stats() -> SeenMessagesStats:
+    """Returns the current size and the hit, miss, eviction and expiration counters of the cache."""
+    return SeenMessagesStats(entries=len(_SEEN_MESSAGES), **_STATS)
@@ -1,25 +1,25 @@
 # detection.py
 """Collects and parses Tree messages"""
 
-from datetime import timedelta
 import re
-from typing import Dict, Union
+from typing import Union
 
 import discord
-from discord import utils
 from discord.ext import commands
 
+from cache import seen_messages
 from database import users
 from processing import bonuses, calendar, easter, chests, clean, cooldowns, daily, fusion, hive, incubator, inventory
-from processing import laboratory, league, patreon, profile, prune, quests, raid, rebirth, shop, tool, tracking, use, vote
+from processing import dispatcher, laboratory, league, patreon, profile, prune, quests, raid, rebirth, shop, tool, tracking
+from processing import parsing, use, vote
 from resources import exceptions, functions, logs, regex, settings
 
-seen_messages = {}  
 
 class DetectionCog(commands.Cog):
     """Cog that contains the detection events"""
     def __init__(self, bot):
         self.bot = bot
+        dispatcher.build_matchers()
 
     @commands.Cog.listener()
     async def on_message_edit(self, message_before: discord.Message, message_after: discord.Message) -> None:
@@ -48,8 +48,8 @@ class DetectionCog(commands.Cog):
         text_displays = await functions.parse_text_displays(message)
         
         # Duplicate message handling
-        if (message.id, message.content, str(embed_data), str(message.components)) in seen_messages:
-            if 'a bunny is approaching!' in embed_data['title'].lower():
+        if seen_messages.check_and_store(message, embed_data):
+            if 'a bunny is approaching!' in embed_data.lower.title:
                 logs.logger.info(
                     f'\nDuplicate message detected and ignored.\n'
                     f'Message ID: {message.id}\n'
@@ -61,37 +61,31 @@ class DetectionCog(commands.Cog):
                     f'Message nonce: {message.nonce}\n'
                 )
             return
-        expired_message_keys = [seen_key for seen_key, seen_time in seen_messages.items() if utils.utcnow() - seen_time > timedelta(minutes=1)]
-        for seen_key in expired_message_keys:
-            del seen_messages[seen_key]
-        if len(seen_messages) > 10_000:
-            seen_messages.clear()
-            logs.logger.info('Cleared message cache to prevent memory issues. This should not happen often.')
-        seen_messages[(message.id, message.content, str(embed_data), str(message.components))] = utils.utcnow()
 
-        embed_data['embed_user'] = None
-        embed_data['embed_user_settings'] = None
+        # Only continue if at least one processing function is interested in this message
+        handlers = dispatcher.get_handlers(message, embed_data, text_displays)
+        if not handlers: return
+
         interaction_user = await functions.get_interaction_user(message)
-        user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data['author']['icon_url'])
+        user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data.author_icon_url)
         if user_id_match:
-            embed_data['embed_user'] = message.guild.get_member(int(user_id_match.group(1)))
+            embed_data.embed_user = message.guild.get_member(int(user_id_match.group(1)))
         if interaction_user is not None:
             try:
                 user_settings: users.User = await users.get_user(interaction_user.id)
             except exceptions.FirstTimeUserError:
-                if not 'fusion results' in embed_data['field0']['name'].lower(): return
+                if not 'fusion results' in embed_data.lower.field(0).name: return
             if user_settings is not None:
                 if not user_settings.bot_enabled: return
-        if embed_data['embed_user'] is not None:
-            if interaction_user is not None and embed_data['embed_user'] == interaction_user:
+        if embed_data.embed_user is not None:
+            if interaction_user is not None and embed_data.embed_user == interaction_user:
                 embed_user_settings = user_settings
             else:
                 try:
-                    embed_user_settings: users.User = await users.get_user(embed_data['embed_user'].id)
+                    embed_user_settings: users.User = await users.get_user(embed_data.embed_user.id)
                 except exceptions.FirstTimeUserError:
                     embed_user_settings = None
-            embed_data['embed_user_settings'] = embed_user_settings
-        return_values = []
+            embed_data.embed_user_settings = embed_user_settings
         helper_bunny_enabled = getattr(user_settings, 'helper_bunny_enabled', True)
         helper_context_enabled = getattr(user_settings, 'helper_context_enabled', True)
         helper_prune_enabled = getattr(user_settings, 'helper_prune_enabled', True)
@@ -108,120 +102,39 @@ class DetectionCog(commands.Cog):
         reminder_vote_enabled = getattr(getattr(user_settings, 'reminder_vote', None), 'enabled', True)
         tracking_enabled = getattr(user_settings, 'tracking_enabled', True)
 
-        # Bonuses
-        if reminder_boosts_enabled:
-            add_reaction = await bonuses.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-
-        # Bunnies
-        if helper_bunny_enabled:
-            add_reaction = await easter.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-
-         # Calendar
-        add_reaction = await calendar.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-        return_values.append(add_reaction)
-            
-
-        # Cooldowns
-        add_reaction = await cooldowns.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-        return_values.append(add_reaction)
-            
-        # Chests
-        if reminder_chests_enabled or helper_context_enabled:
-            add_reaction = await chests.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-            
-        # Clean
-        if reminder_clean_enabled or tracking_enabled:
-            add_reaction = await clean.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-            
-        # Daily
-        if reminder_daily_enabled:
-            add_reaction = await daily.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-
-        # Fusion
-        if reminder_fusion_enabled:
-            add_reaction = await fusion.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-            
-        # Hive
-        if reminder_hive_enabled:
-            add_reaction = await hive.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-            
-        # Incubator
-        if reminder_incubator_enabled:
-            add_reaction = await incubator.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-        
-        # Inventory
-        add_reaction = await inventory.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-        return_values.append(add_reaction)
-            
-        # Prune
-        add_reaction = await prune.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-        return_values.append(add_reaction)
-            
-        # Laboratory
-        if reminder_research_enabled or helper_context_enabled:
-            add_reaction = await laboratory.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-            
-        # League
-        add_reaction = await league.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-        return_values.append(add_reaction)
-            
-        # Patreon
-        add_reaction = await patreon.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-        return_values.append(add_reaction)
-            
-        # Profile & Stats
-        if reminder_research_enabled or reminder_upgrade_enabled or helper_prune_enabled:
-            add_reaction = await profile.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-
-        # Quests
-        if reminder_quests_enabled:
-            add_reaction = await quests.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-            
-        # Raid
-        if helper_context_enabled:
-            add_reaction = await raid.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-            
-        # Rebirth
-        if helper_prune_enabled:
-            add_reaction = await rebirth.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-            
-        # Tool upgrade
-        if reminder_upgrade_enabled or helper_context_enabled:
-            add_reaction = await tool.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-            
-        # Tracking
-        if tracking_enabled:
-            add_reaction = await tracking.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-
-        # Use items
-        if reminder_boosts_enabled or helper_prune_enabled:
-            add_reaction = await use.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-            
-        # Vote
-        if reminder_vote_enabled:
-            add_reaction = await vote.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
-            
-        # Shop
-        if reminder_boosts_enabled:
-            add_reaction = await shop.process_message(message, embed_data, text_displays, interaction_user, user_settings)
-            return_values.append(add_reaction)
+        # Processing modules in processing order and whether they are enabled for this user
+        processors = (
+            (bonuses, reminder_boosts_enabled),
+            (easter, helper_bunny_enabled),
+            (calendar, True),
+            (cooldowns, True),
+            (chests, reminder_chests_enabled or helper_context_enabled),
+            (clean, reminder_clean_enabled or tracking_enabled),
+            (daily, reminder_daily_enabled),
+            (fusion, reminder_fusion_enabled),
+            (hive, reminder_hive_enabled),
+            (incubator, reminder_incubator_enabled),
+            (inventory, True),
+            (prune, True),
+            (laboratory, reminder_research_enabled or helper_context_enabled),
+            (league, True),
+            (patreon, True),
+            (profile, reminder_research_enabled or reminder_upgrade_enabled or helper_prune_enabled),
+            (quests, reminder_quests_enabled),
+            (raid, helper_context_enabled),
+            (rebirth, helper_prune_enabled),
+            (tool, reminder_upgrade_enabled or helper_context_enabled),
+            (tracking, tracking_enabled),
+            (use, reminder_boosts_enabled or helper_prune_enabled),
+            (vote, reminder_vote_enabled),
+            (shop, reminder_boosts_enabled),
+        )
+        return_values = []
+        for module, enabled in processors:
+            if not enabled: continue
+            for handler in handlers.get(module.__name__.split('.')[-1], []):
+                add_reaction = await handler.run(message, embed_data, text_displays, interaction_user, user_settings)
+                return_values.append(add_reaction)
 
         if any(return_values): await functions.add_logo_reaction(message)
 
@@ -231,70 +144,9 @@ def setup(bot):
 
 
 # Functions
-async def parse_embed(message: discord.Message) -> Dict[str, str]:
-    """Parses all data from an embed into a dictionary.
-    All keys are guaranteed to exist and have an empty string as value if not set in the embed.
-    """    
-    embed_data = {
-        'author': {'icon_url': '', 'name': ''},
-        'description': '',
-        'field0': {'name': '', 'value': ''},
-        'field1': {'name': '', 'value': ''},
-        'field2': {'name': '', 'value': ''},
-        'field3': {'name': '', 'value': ''},
-        'field4': {'name': '', 'value': ''},
-        'field5': {'name': '', 'value': ''},
-        'footer': {'icon_url': '', 'text': ''},
-        'title': '',
-    }
-    if message.embeds:
-        embed = message.embeds[0]
-        if embed.author:
-            if embed.author.icon_url is not None:
-                embed_data['author']['icon_url'] = embed.author.icon_url
-            if embed.author.name is not None:
-                embed_data['author']['name'] = embed.author.name
-        if embed.description is not None:
-            embed_data['description'] = embed.description
-        if embed.fields:
-            try:
-                embed_data['field0']['name'] = embed.fields[0].name
-                embed_data['field0']['value'] = embed.fields[0].value
-            except IndexError:
-                pass
-            try:
-                embed_data['field1']['name'] = embed.fields[1].name
-                embed_data['field1']['value'] = embed.fields[1].value
-            except IndexError:
-                pass
-            try:
-                embed_data['field2']['name'] = embed.fields[2].name
-                embed_data['field2']['value'] = embed.fields[2].value
-            except IndexError:
-                pass
-            try:
-                embed_data['field3']['name'] = embed.fields[3].name
-                embed_data['field3']['value'] = embed.fields[3].value
-            except IndexError:
-                pass
-            try:
-                embed_data['field4']['name'] = embed.fields[4].name
-                embed_data['field4']['value'] = embed.fields[4].value
-            except IndexError:
-                pass
-            try:
-                embed_data['field5']['name'] = embed.fields[5].name
-                embed_data['field5']['value'] = embed.fields[5].value
-            except IndexError:
-                pass
-        if embed.footer is not None:
-            if embed.footer.icon_url is not None:
-                embed_data['footer']['icon_url'] = embed.footer.icon_url
-            if embed.footer.text is not None:
-                embed_data['footer']['text'] = embed.footer.text
-        if embed.title is not None:
-            embed_data['title'] = embed.title
-    return embed_data
+async def parse_embed(message: discord.Message) -> parsing.EmbedData:
+    """Parses all data from the first embed of a message. See parsing.EmbedData."""
+    return parsing.EmbedData.from_message(message)
 
 
 async def check_message_for_active_components(message: discord.Message) -> Union[bool, None]:
@@ -316,7 +168,7 @@ async def check_message_for_active_components(message: discord.Message) -> Union
 
 
 async def check_edited_message_always_allowed(message_before: discord.Message,
-                                             message_after: discord.Message, embed_data: Dict) -> Union[bool, None]:
+                                             message_after: discord.Message, embed_data: parsing.EmbedData) -> Union[bool, None]:
     """Check if the edited message should be allowed to process regardless of its components.
     
     Returns
@@ -327,7 +179,7 @@ async def check_edited_message_always_allowed(message_before: discord.Message,
     search_strings = [
         'captcha', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
         captcha_solved = False
         for component in message_after.components[0].children:
             if component.style == discord.ButtonStyle.success:
@@ -337,13 +189,13 @@ async def check_edited_message_always_allowed(message_before: discord.Message,
     search_strings = [
         'fusion results', #English
     ]
-    if any(search_string in embed_data['field0']['name'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.field(0).name for search_string in search_strings):
         return True
     return False
 
 
 async def check_edited_message_never_allowed(message_before: discord.Message,
-                                             message_after: discord.Message, embed_data: Dict) -> Union[bool, None]:
+                                             message_after: discord.Message, embed_data: parsing.EmbedData) -> Union[bool, None]:
     """Check if the edited message should never be allowed to process.
     
     Returns
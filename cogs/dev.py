@@ -10,7 +10,7 @@ from discord.commands import SlashCommandGroup, Option
 from discord.ext import commands
 
 from database import cooldowns
-from resources import emojis, exceptions, functions, logs, settings, strings, views
+from resources import emojis, functions, logs, settings, strings, views
 
 
 EVENT_REDUCTION_TYPES = [
@@ -167,19 +167,73 @@ class DevCog(commands.Cog):
         if ctx.author.id not in settings.DEV_IDS:
             await ctx.respond(MSG_NOT_DEV, ephemeral=True)
             return
-        from cache import messages
-        cache_size = sys.getsizeof(messages._MESSAGE_CACHE)
-        channel_count = len(messages._MESSAGE_CACHE)
-        message_count = 0
-        for channel_messages in messages._MESSAGE_CACHE.values():
-            message_count += len(channel_messages)
-            cache_size += sys.getsizeof(channel_messages)
-            for message in channel_messages:
-                cache_size += sys.getsizeof(message)
+        from cache import messages, seen_messages
+        from database import users
+        message_cache_stats = messages.get_stats()
+        seen_messages_stats = seen_messages.get_stats()
+        user_cache_stats = users.get_user_cache_stats()
         await ctx.respond(
-            f'Cache size: {cache_size / 1024:,.2f} KB\n'
-            f'Channel count: {channel_count:,}\n'
-            f'Message count: {message_count:,}\n'
+            f'Cache size: {message_cache_stats.memory_used / 1024:,.2f} KB\n'
+            f'Channel count: {message_cache_stats.channels:,} (max {messages.MAX_CHANNELS:,})\n'
+            f'Message count: {message_cache_stats.messages:,}\n'
+            f'Channels evicted: {message_cache_stats.channels_evicted:,}\n'
+            f'Messages evicted: {message_cache_stats.messages_evicted:,}\n'
+            f'Messages expired: {message_cache_stats.messages_expired:,}\n'
+            f'\n'
+            f'Seen messages: {seen_messages_stats.entries:,}\n'
+            f'Duplicates ignored (hits): {seen_messages_stats.hits:,}\n'
+            f'New messages (misses): {seen_messages_stats.misses:,}\n'
+            f'Evictions: {seen_messages_stats.evictions:,}\n'
+            f'Expirations: {seen_messages_stats.expirations:,}\n'
+            f'\n'
+            f'Cached users: {user_cache_stats.entries:,} (max {users.USER_CACHE_MAX_ENTRIES:,})\n'
+            f'Hits: {user_cache_stats.hits:,}\n'
+            f'Hits (unknown user): {user_cache_stats.negative_hits:,}\n'
+            f'Misses: {user_cache_stats.misses:,}\n'
+            f'Hit rate: {user_cache_stats.hit_rate:.1%}\n'
+            f'Evictions: {user_cache_stats.evictions:,}\n'
+        )
+
+    @dev.command()
+    async def delivery(self, ctx: discord.ApplicationContext):
+        """Shows the state of the reminder delivery queue"""
+        if ctx.author.id not in settings.DEV_IDS:
+            await ctx.respond(MSG_NOT_DEV, ephemeral=True)
+            return
+        from resources import delivery
+        stats = delivery.get_stats()
+        await ctx.respond(
+            f'Queue depth: {stats.pending:,} messages in {stats.channels:,} channels\n'
+            f'Queued: {stats.queued:,}\n'
+            f'Sent: {stats.sent:,} in {stats.messages:,} messages ({stats.errors:,} errors)\n'
+            f'Delivery lag: {stats.lag_average:,.2f} ms average, {stats.lag_max:,.2f} ms max\n'
+            f'Coalesce window: {delivery.DELIVERY_COALESCE_WINDOW:g} s\n'
+        )
+
+    @dev.command()
+    async def database(self, ctx: discord.ApplicationContext):
+        """Shows database health, pragma settings and statement stats"""
+        if ctx.author.id not in settings.DEV_IDS:
+            await ctx.respond(MSG_NOT_DEV, ephemeral=True)
+            return
+        from database import gateway
+        status = await gateway.get_status()
+        pragmas = '\n'.join(f'{name}: {value}' for name, value in status.pragmas.items())
+        pool_stats = ''
+        for name, stats in (('Reads', status.reads), ('Writes', status.writes)):
+            pool_stats = (
+                f'{pool_stats}\n'
+                f'{name}: {stats.statements:,} ({stats.errors:,} errors, {stats.pending:,} pending)\n'
+                f'{name} time: {stats.time_average:,.2f} ms average, {stats.time_max:,.2f} ms max\n'
+            )
+        await ctx.respond(
+            f'Health: {"OK" if status.healthy else "NOT OK"}\n'
+            f'Journal mode: {status.journal_mode}\n'
+            f'WAL size: {status.wal_size / 1024:,.2f} KB\n'
+            f'Read connections: {status.read_connections}\n'
+            f'\n'
+            f'{pragmas}\n'
+            f'{pool_stats}'
         )
 
     @dev.command(name='server-list')
@@ -212,36 +266,30 @@ class DevCog(commands.Cog):
             return
         await ctx.defer()
         from datetime import datetime
-        import asyncio
         from humanfriendly import format_timespan
-        from database import tracking, users
+        from database import tracking
         start_time = datetime.utcnow().replace(microsecond=0)
-        log_entry_count = 0
-        try:
-            old_log_entries = await tracking.get_old_log_entries(28)
-        except exceptions.NoDataFoundError:
+
+        async def show_progress(progress: tracking.ConsolidationProgress) -> None:
+            await ctx.edit(
+                content=(
+                    f'Consolidating... {progress.users_done:,}/{progress.users_total:,} users, '
+                    f'{progress.log_entries_consolidated:,} log entries consolidated.'
+                )
+            )
+
+        progress = await tracking.consolidate_log_entries(28, show_progress)
+        if progress.users_total == 0:
             await ctx.respond('Nothing to do.')
             return
-        entries = {}
-        for log_entry in old_log_entries:
-            date_time = log_entry.date_time.replace(hour=23, minute=59, second=59, microsecond=999999)
-            key = (log_entry.user_id, log_entry.guild_id, log_entry.command, date_time)
-            amount = entries.get(key, 0)
-            entries[key] = amount + 1
-            log_entry_count += 1
-        for key, amount in entries.items():
-            user_id, guild_id, command, date_time = key
-            summary_log_entry = await tracking.insert_log_summary(user_id, guild_id, command, date_time, amount)
-            date_time_min = date_time.replace(hour=0, minute=0, second=0, microsecond=0)
-            date_time_max = date_time.replace(hour=23, minute=59, second=59, microsecond=999999)
-            await tracking.delete_log_entries(user_id, guild_id, command, date_time_min, date_time_max)
-            await asyncio.sleep(0.01)
-        cur = settings.NAVI_DB.cursor()
-        cur.execute('VACUUM')
         end_time = datetime.utcnow().replace(microsecond=0)
         time_passed = end_time - start_time
-        logs.logger.info(f'Consolidated {log_entry_count:,} log entries in {format_timespan(time_passed)} manually.')
-        await ctx.respond(f'Consolidated {log_entry_count:,} log entries in {format_timespan(time_passed)}.')
+        message = (
+            f'Consolidated {progress.log_entries_consolidated:,} log entries into {progress.summaries_written:,} '
+            f'summaries in {format_timespan(time_passed)}.'
+        )
+        logs.logger.info(f'{message[:-1]} manually.')
+        await ctx.respond(message)
 
 
 def setup(bot):
@@ -5,15 +5,15 @@ import asyncio
 from datetime import timedelta
 from humanfriendly import format_timespan
 import sqlite3
-from typing import List
+from typing import List, Optional, Tuple
 
 import discord
 from discord import utils
 from discord.ext import commands, tasks
 
 from cache import messages
-from database import errors, reminders, tracking, users
-from resources import exceptions, functions, logs, settings, strings
+from database import errors, gateway, mappers, reminders, tracking, users
+from resources import delivery, functions, logs, settings, strings
 
 
 running_tasks = {}
@@ -23,6 +23,7 @@ class TasksCog(commands.Cog):
     """Cog with tasks"""
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.reminder_dispatcher: Optional[asyncio.Task] = None
 
     # Task management
     async def background_task(self, reminders_list: List[reminders.Reminder]) -> None:
@@ -77,13 +78,12 @@ class TasksCog(commands.Cog):
             time_left = get_time_left()
             try:
                 await asyncio.sleep(time_left.total_seconds())
-                allowed_mentions = discord.AllowedMentions(users=[user,])
                 for activity_message in messages.values():
                     activity, message = activity_message
                     if activity == 'sweet-apple':
                         await user_settings.update(xp_gain_average=0)
                     if message:
-                        await channel.send(message.strip(), allowed_mentions=allowed_mentions)
+                        await delivery.send(channel, message.strip(), (user,))
                 if larva_reminders > 0:
                     await user_settings.refresh()
                     await user_settings.update(incubator_slots_ready=user_settings.incubator_slots_ready + larva_reminders)
@@ -113,108 +113,89 @@ class TasksCog(commands.Cog):
             running_tasks.pop(task_name, None)
         return
 
+    async def send_reminders(self, due_reminders: Tuple[reminders.Reminder]) -> None:
+        """Creates tasks that send due reminders. Called by the reminder schedule.
+        Reminders that fire at the same second for the same user in the same channel are combined into one task.
+        The messages of all tasks are sent by the delivery queue, which merges the messages for the same channel.
+        """
+        user_reminders = {}
+        for reminder in due_reminders:
+            reminder_user_channel = f'{reminder.user_id}-{reminder.channel_id}-{reminder.end_time}'
+            if reminder_user_channel in user_reminders:
+                user_reminders[reminder_user_channel].append(reminder)
+            else:
+                user_reminders[reminder_user_channel] = [reminder,]
+        for reminders_list in user_reminders.values():
+            reminders_list.sort(key=lambda reminder: reminder.activity)
+            await self.create_task(reminders_list)
+
     # Events
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         """Fires when bot has finished starting"""
-        reminders.schedule_reminders.start()
+        if self.reminder_dispatcher is None or self.reminder_dispatcher.done():
+            self.reminder_dispatcher = self.bot.loop.create_task(reminders.run_reminder_schedule(self.send_reminders))
         self.delete_old_reminders.start()
-        self.schedule_tasks.start()
         self.consolidate_tracking_log.start()
         self.delete_old_messages_from_cache.start()
         self.season_reset.start()
 
     # Tasks
-    @tasks.loop(seconds=0.5)
-    async def schedule_tasks(self):
-        """Task that creates or deletes tasks from scheduled reminders.
-        Reminders that fire at the same second for the same user in the same channel are combined into one task.
-        """
-        user_reminders = {}
-        for reminder in reminders.scheduled_for_tasks.copy().values():
-            reminders.scheduled_for_tasks.pop(reminder.task_name, None)
-            reminder_user_channel = f'{reminder.user_id}-{reminder.channel_id}-{reminder.end_time}'
-            if reminder_user_channel in user_reminders:
-                user_reminders[reminder_user_channel].append(reminder)
-            else:
-                user_reminders[reminder_user_channel] = [reminder,]
-        for reminder in reminders.scheduled_for_deletion.copy().values():
-            reminders.scheduled_for_deletion.pop(reminder.task_name, None)
-            await self.delete_task(reminder.task_name)
-        if user_reminders:
-            for reminders_list in user_reminders.values():
-                reminders_list.sort(key=lambda reminder: reminder.activity)
-                await self.create_task(reminders_list)
-
     @tasks.loop(minutes=2.0)
     async def delete_old_reminders(self) -> None:
-        """Task that deletes all old reminders"""
+        """Task that deletes all old reminders.
+        Their tasks are not cancelled: a task only exists after its reminder fired, so a task of an old reminder is
+        still waiting in the delivery queue and would lose its message.
+        """
         try:
-            old_reminders = await reminders.get_old_reminders()
-        except:
-            old_reminders = ()
-        for reminder in old_reminders:
-            try:
-                await reminder.delete()
-            except Exception as error:
-                await errors.log_error(
-                    f'Error deleting old reminder.\nFunction: delete_old_reminders\n'
-                    f'Reminder: {reminder}\nError: {error}'
-            )
+            deleted_reminders = await reminders.delete_old_reminders()
+        except sqlite3.Error:
+            return
+        if settings.DEBUG_MODE and deleted_reminders:
+            logs.logger.debug(f'Deleted {deleted_reminders:,} old reminders.')
 
     @tasks.loop(seconds=60)
     async def consolidate_tracking_log(self) -> None:
         """Task that consolidates tracking log entries older than 28 days into summaries"""
         start_time = utils.utcnow().replace(microsecond=0)
         if start_time.hour == 0 and start_time.minute == 0:
-            log_entry_count = 0
-            try:
-                old_log_entries = await tracking.get_old_log_entries(28)
-            except exceptions.NoDataFoundError:
+            async def log_progress(progress: tracking.ConsolidationProgress) -> None:
+                logs.logger.info(
+                    f'Consolidating tracking log: {progress.users_done:,}/{progress.users_total:,} users, '
+                    f'{progress.log_entries_consolidated:,} log entries consolidated.'
+                )
+
+            progress = await tracking.consolidate_log_entries(28, log_progress)
+            if progress.users_total == 0:
                 logs.logger.info('Didn\'t find any log entries to consolidate.')
-                return
-            entries = {}
-            for log_entry in old_log_entries:
-                date_time = log_entry.date_time.replace(hour=23, minute=59, second=59, microsecond=999999)
-                key = (log_entry.user_id, log_entry.guild_id, log_entry.command_or_drop, date_time)
-                amount = entries.get(key, 0)
-                entries[key] = amount + 1
-                log_entry_count += 1
-            for key, amount in entries.items():
-                user_id, guild_id, command, date_time = key
-                summary_log_entry = await tracking.insert_log_summary(user_id, guild_id, command, date_time, amount)
-                date_time_min = date_time.replace(hour=0, minute=0, second=0, microsecond=0)
-                date_time_max = date_time.replace(hour=23, minute=59, second=59, microsecond=999999)
-                await tracking.delete_log_entries(user_id, guild_id, command, date_time_min, date_time_max)
-                await asyncio.sleep(0.01)
-            cur = settings.DATABASE.cursor()
             date_time = utils.utcnow() - timedelta(days=366)
             date_time = date_time.replace(hour=0, minute=0, second=0)
             sql = 'DELETE FROM tracking_log WHERE date_time<?'
             try:
-                cur.execute(sql, (date_time,))
-                cur.execute('VACUUM')
+                await gateway.execute(sql, (mappers.to_timestamp(date_time),))
+                await tracking.delete_old_hourly_rollups()
+                await gateway.execute('PRAGMA wal_checkpoint(TRUNCATE)')
             except sqlite3.Error as error:
                 logs.logger.error(f'Error while consolidating: {error}')
                 raise
             end_time = utils.utcnow().replace(microsecond=0)
             time_passed = end_time - start_time
-            logs.logger.info(f'Consolidated {log_entry_count:,} log entries in {format_timespan(time_passed)}.')
+            logs.logger.info(
+                f'Consolidated {progress.log_entries_consolidated:,} log entries into '
+                f'{progress.summaries_written:,} summaries in {format_timespan(time_passed)}.'
+            )
 
     @tasks.loop(seconds=60)
     async def season_reset(self) -> None:
         """Task that resets trophies and converts diamond trophies to diamond rings"""
         start_time = utils.utcnow().replace(microsecond=0)
         if start_time.day in (14, 28) and start_time.hour == 0 and start_time.minute == 0:
-            all_users = await users.get_all_users()
-            for user_settings in all_users:
-                diamond_rings = user_settings.diamond_rings + user_settings.diamond_trophies
-                if diamond_rings > user_settings.diamond_rings_cap: diamond_rings = user_settings.diamond_rings_cap
-                await user_settings.update(trophies=0, diamond_trophies=0, diamond_rings=diamond_rings, league_beta=False,
-                                           trophies_gain_average=0, trophies_raid_count=0, diamond_trophies_gain_average=0,
-                                           diamond_trophies_raid_count=0)
-            time_passed = utils.utcnow().replace(microsecond=0) - start_time
-            logs.logger.info(f'Reset trophies for all users in {format_timespan(time_passed)}.')
+            season_reset = await users.reset_season(start_time.date().isoformat())
+            if season_reset is None: return
+            logs.logger.info(
+                f'Reset trophies for {season_reset.users_reset:,} users in '
+                f'{format_timespan(season_reset.time_passed)}.'
+            )
 
     @tasks.loop(minutes=10)
     async def delete_old_messages_from_cache(self) -> None:
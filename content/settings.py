@@ -8,7 +8,7 @@ from typing import List, Optional
 import discord
 from discord import utils
 
-from database import guilds, reminders, tracking, users
+from database import gateway, guilds, reminders, tracking, users
 from resources import emojis, exceptions, functions, settings, strings, views
 from resources.enums import ReadyPopupMode
 
@@ -158,18 +158,18 @@ async def command_purge_data(bot: discord.Bot, ctx: discord.ApplicationContext)
                 interaction, content=answer_timeout, view=None
             )
         elif view.value == 'confirm':
-            cur = settings.DATABASE.cursor()
             await functions.edit_interaction(
                 interaction, content='Purging user settings...',
                 view=None
             )
-            cur.execute('DELETE FROM users WHERE user_id=?', (ctx.author.id,))
+            await gateway.execute('DELETE FROM users WHERE user_id=?', (ctx.author.id,))
+            users.invalidate_user_cache(ctx.author.id)
             await asyncio.sleep(1)
             await functions.edit_interaction(
                 interaction, content='Purging reminders...',
                 view=None
             )
-            cur.execute('DELETE FROM reminders WHERE user_id=?', (ctx.author.id,))
+            await gateway.execute('DELETE FROM reminders WHERE user_id=?', (ctx.author.id,))
             await asyncio.sleep(1)
             await functions.edit_interaction(
                 interaction, content='Purging tracking data... (this can take a while)',
@@ -70,13 +70,20 @@ async def embed_stats_overview(ctx: commands.Context, user: discord.User) -> dis
     """Stats overview embed"""
     user_settings: users.User = await users.get_user(user.id)
     current_time = utils.utcnow().replace(microsecond=0)
-    field_last_1h = await design_field(timedelta(hours=1), user)
-    field_last_12h = await design_field(timedelta(hours=12), user)
-    field_last_24h = await design_field(timedelta(hours=24), user)
-    field_last_7d = await design_field(timedelta(days=7), user)
-    field_last_4w = await design_field(timedelta(days=28), user)
-    field_last_1y = await design_field(timedelta(days=365), user)
-    field_last_rebirth = await design_field(current_time-user_settings.last_rebirth, user)
+    reports = await tracking.get_log_report_windows(
+        user.id,
+        (
+            timedelta(hours=1),
+            timedelta(hours=12),
+            timedelta(hours=24),
+            timedelta(days=7),
+            timedelta(days=28),
+            timedelta(days=365),
+            current_time - user_settings.last_rebirth,
+        )
+    )
+    (field_last_1h, field_last_12h, field_last_24h, field_last_7d, field_last_4w, field_last_1y,
+     field_last_rebirth) = [await design_field(report) for report in reports]
     field_last_rebirth = (
         f'{field_last_rebirth.strip()}\n\nYour last rebirth was on {utils.format_dt(user_settings.last_rebirth)}.'
     )
@@ -98,7 +105,7 @@ async def embed_stats_overview(ctx: commands.Context, user: discord.User) -> dis
 async def embed_stats_timeframe(ctx: commands.Context, user: discord.Member, time_left: timedelta) -> discord.Embed:
     """Stats timeframe embed"""
     user_settings: users.User = await users.get_user(user.id)
-    field_content = await design_field(time_left, user)
+    field_content = await design_field(await tracking.get_log_report(user.id, time_left))
     embed = discord.Embed(
         color = settings.EMBED_COLOR,
         title = f'{user.global_name}\'s stats',
@@ -109,10 +116,8 @@ async def embed_stats_timeframe(ctx: commands.Context, user: discord.Member, tim
 
 
 # --- Functions ---
-async def design_field(timeframe: timedelta, user: discord.Member) -> str:
-    """Designs a stats field and returns it"""
-    
-    report: tracking.LogReport = await tracking.get_log_report(user.id, timeframe)
+async def design_field(report: tracking.LogReport) -> str:
+    """Designs a stats field from a log report and returns it"""
     field_content = (
         f'{emojis.BP} `prune`: {report.prune_amount:,}\n'
         f'{emojis.DETAIL2} {emojis.NUGGET_WOODEN} {report.nugget_wooden_amount:,}\n'
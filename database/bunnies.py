@@ -5,7 +5,7 @@ from dataclasses import dataclass
 import sqlite3
 from typing import Tuple
 
-from database import errors
+from database import errors, gateway
 from resources import exceptions, settings, strings
 
 
@@ -50,7 +50,9 @@ class Bunny():
         self.user_id = new_settings.user_id
 
     async def update(self, **kwargs) -> None:
-        """Updates the bunny record in the database. Also calls refresh().
+        """Updates the bunny record in the database.
+        If exactly one record was updated, the changes are applied to this object directly. Otherwise refresh() is
+        called.
 
         Arguments
         ---------
@@ -60,8 +62,13 @@ class Bunny():
             name: str
             user_id: int
         """
-        await _update_bunny(self, **kwargs)
-        await self.refresh()
+        updated_rows = await _update_bunny(self, **kwargs)
+        if updated_rows != 1:
+            await self.refresh()
+            return
+        for column, value in kwargs.items():
+            setattr(self, column, value)
+        if settings.VERIFY_DATABASE_UPDATES: await errors.verify_local_update(self, 'bunnies', 'Bunny.update')
 
 
 # Miscellaneous functions
@@ -122,8 +129,7 @@ async def get_bunny(user_id: int, name: str) -> Bunny:
     function_name = 'get_bunny'
     sql = f'SELECT * FROM {table} WHERE user_id=? AND name=?'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (user_id, name))
+        cur = await gateway.read(sql, (user_id, name))
         record = cur.fetchone()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -161,8 +167,7 @@ async def get_bunnies_by_user_id(user_id: int) -> Tuple[Bunny]:
     function_name = 'get_bunnies_by_user_id'
     sql = f'SELECT * FROM {table} WHERE user_id=? ORDER BY epicness ASC, fertility ASC'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (user_id,))
+        cur = await gateway.read(sql, (user_id,))
         records = cur.fetchall()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -196,8 +201,7 @@ async def _delete_bunny(bunny: Bunny) -> None:
     table = 'bunnies'
     sql = f'DELETE FROM {table} WHERE user_id=? AND name=?'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (bunny.user_id, bunny.name,))
+        await gateway.execute(sql, (bunny.user_id, bunny.name,))
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
@@ -205,7 +209,7 @@ async def _delete_bunny(bunny: Bunny) -> None:
         raise
 
 
-async def _update_bunny(bunny: Bunny, **kwargs) -> None:
+async def _update_bunny(bunny: Bunny, **kwargs) -> int:
     """Updates a bunny record. Use Bunny.update() to trigger this function.
 
     Arguments
@@ -217,6 +221,10 @@ async def _update_bunny(bunny: Bunny, **kwargs) -> None:
         name: str
         user_id: int
 
+    Returns
+    -------
+    Amount of updated records: int
+
     Raises
     ------
     sqlite3.Error if something happened within the database.
@@ -231,7 +239,6 @@ async def _update_bunny(bunny: Bunny, **kwargs) -> None:
         )
         raise exceptions.NoArgumentsError('You need to specify at least one keyword argument.')
     try:
-        cur = settings.DATABASE.cursor()
         sql = f'UPDATE {table} SET'
         for kwarg in kwargs:
             sql = f'{sql} {kwarg} = :{kwarg},'
@@ -239,13 +246,15 @@ async def _update_bunny(bunny: Bunny, **kwargs) -> None:
         kwargs['user_id_old'] = bunny.user_id
         kwargs['name_old'] = bunny.name
         sql = f'{sql} WHERE user_id = :user_id_old AND name = :name_old'
-        cur.execute(sql, kwargs)
+        cur = await gateway.execute(sql, kwargs)
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
 
+    return cur.rowcount
+
 
 async def insert_bunny(user_id: int, name: str, epicness: int, fertility: int) -> Bunny:
     """Inserts a bunny record.
@@ -270,7 +279,6 @@ async def insert_bunny(user_id: int, name: str, epicness: int, fertility: int) -
     """
     function_name = 'insert_bunny'
     table = 'bunnies'    
-    cur = settings.DATABASE.cursor()
     try:
         bunny = await get_bunny(user_id, name)
     except exceptions.NoDataFoundError:
@@ -282,7 +290,7 @@ async def insert_bunny(user_id: int, name: str, epicness: int, fertility: int) -
             f'INSERT INTO {table} (user_id, name, fertility, epicness) VALUES (?, ?, ?, ?)'
         )
         try:
-            cur.execute(sql, (user_id, name, fertility, epicness))
+            await gateway.execute(sql, (user_id, name, fertility, epicness))
         except sqlite3.Error as error:
             await errors.log_error(
                 strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
@@ -1,13 +1,19 @@
 # cooldowns.py
-"""Provides access to the table "cooldowns" in the database"""
+"""Provides access to the table "cooldowns" in the database
 
+The table is small and only changes when the event reductions are changed, so all cooldowns are kept in a snapshot in
+memory. The snapshot is loaded on startup (or on first use) and replaced as a whole after every Cooldown.update(), so
+readers always see either the old or the new cooldowns. Reading cooldowns never accesses the database.
+"""
 
+
+import copy
 from dataclasses import dataclass
 from math import ceil
 import sqlite3
-from typing import Tuple
+from typing import Dict, NamedTuple, Optional, Tuple
 
-from database import errors
+from database import errors, gateway
 from resources import exceptions, settings, strings
 
 
@@ -38,21 +44,54 @@ class Cooldown():
         self.event_reduction_slash = new_settings.event_reduction_slash
 
     async def update(self, **kwargs) -> None:
-        """Updates the cooldown record in the database. Also calls refresh().
+        """Updates the cooldown record in the database.
+        If exactly one record was updated, the changes are applied to this object directly. Otherwise refresh() is
+        called.
 
         Arguments
         ---------
         kwargs (column=value):
-            base_cooldown: int
+            cooldown: int
             donor_affected: bool
             event_reduction_mention: float
             event_reduction_slash: float
         """
-        await _update_cooldown(self.activity, **kwargs)
-        await self.refresh()
+        updated_rows = await _update_cooldown(self.activity, **kwargs)
+        await load_cooldowns()
+        if updated_rows != 1:
+            await self.refresh()
+            return
+        for column, value in kwargs.items():
+            setattr(self, 'base_cooldown' if column == 'cooldown' else column, value)
+        if settings.VERIFY_DATABASE_UPDATES: await errors.verify_local_update(self, 'cooldowns', 'Cooldown.update')
+
+
+class _CooldownSnapshotEntry(NamedTuple):
+    """Object that represents a cooldown in the cooldown snapshot."""
+    cooldown: Cooldown
+    actual_cooldowns_mention: Dict[int, float] # Donor tier: seconds
+    actual_cooldowns_slash: Dict[int, float] # Donor tier: seconds
+
+
+# Cooldown snapshot (activity: entry). Never changed, only replaced, see load_cooldowns().
+_COOLDOWN_SNAPSHOT: Optional[Dict[str, _CooldownSnapshotEntry]] = None
 
 
 # Miscellaneous functions
+def _get_actual_cooldowns(cooldown: Cooldown, actual_cooldown: int) -> Dict[int, float]:
+    """Returns the actual cooldown for every donor tier"""
+    return {
+        donor_tier: actual_cooldown * multiplier if cooldown.donor_affected else actual_cooldown
+        for donor_tier, multiplier in settings.DONOR_TIERS_MULTIPLIERS.items()
+    }
+
+
+async def _get_snapshot() -> Dict[str, _CooldownSnapshotEntry]:
+    """Returns the cooldown snapshot. Loads it if this didn't happen yet."""
+    if _COOLDOWN_SNAPSHOT is None: await load_cooldowns()
+    return _COOLDOWN_SNAPSHOT
+
+
 async def _dict_to_cooldown(record: dict) -> Cooldown:
     """Creates a Cooldown object from a database record
 
@@ -86,84 +125,126 @@ async def _dict_to_cooldown(record: dict) -> Cooldown:
     return cooldown
 
 
-# Read Data
-async def get_cooldown(activity: str) -> Cooldown:
-    """Gets the cooldown settings for an activity.
-
-    Returns
-    -------
-    Cooldown object
+async def _get_snapshot_entry(activity: str, function_name: str) -> _CooldownSnapshotEntry:
+    """Returns the snapshot entry of an activity.
 
     Raises
     ------
-    sqlite3.Error if something happened within the database.
+    sqlite3.Error if something happened within the database while loading the snapshot.
     exceptions.NoDataFoundError if no cooldown was found.
     Also logs all errors to the database.
     """
+    entry = (await _get_snapshot()).get(activity, None)
+    if entry is None:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_NO_DATA_FOUND.format(
+                table='cooldowns', function=function_name, sql=f'Cooldown snapshot (activity = {activity})'
+            )
+        )
+        raise exceptions.NoDataFoundError(f'No cooldown data found in database for activity "{activity}".')
+    return entry
+
+
+# Read Data
+async def load_cooldowns() -> None:
+    """Reads all cooldowns from the database and replaces the cooldown snapshot. Runs on startup and after every
+    change.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. The old snapshot stays in use in that case.
+    LookupError if something goes wrong reading the dict.
+    Also logs all errors to the database.
+    """
+    global _COOLDOWN_SNAPSHOT
     table = 'cooldowns'
-    function_name = 'get_cooldown'
-    sql = f'SELECT * FROM {table} WHERE activity=?'
+    function_name = 'load_cooldowns'
+    sql = f'SELECT * FROM {table} ORDER BY activity ASC'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (activity,))
-        record = cur.fetchone()
+        cur = await gateway.read(sql)
+        records = cur.fetchall()
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
-    if not record:
-        await errors.log_error(
-            strings.INTERNAL_ERROR_NO_DATA_FOUND.format(table=table, function=function_name, sql=f'{sql} (activity = {activity})')
+    snapshot = {}
+    for record in records:
+        cooldown = await _dict_to_cooldown(dict(record))
+        snapshot[cooldown.activity] = _CooldownSnapshotEntry(
+            cooldown = cooldown,
+            actual_cooldowns_mention = _get_actual_cooldowns(cooldown, cooldown.actual_cooldown_mention()),
+            actual_cooldowns_slash = _get_actual_cooldowns(cooldown, cooldown.actual_cooldown_slash()),
         )
-        raise exceptions.NoDataFoundError(f'No cooldown data found in database for activity "{activity}".')
-    cooldown = await _dict_to_cooldown(dict(record))
+    _COOLDOWN_SNAPSHOT = snapshot
 
-    return cooldown
+
+async def get_cooldown(activity: str) -> Cooldown:
+    """Gets the cooldown settings for an activity from the cooldown snapshot.
+
+    Returns
+    -------
+    Cooldown object. Every call returns a new object, so changing it doesn't change the snapshot.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database while loading the snapshot.
+    exceptions.NoDataFoundError if no cooldown was found.
+    Also logs all errors to the database.
+    """
+    entry = await _get_snapshot_entry(activity, 'get_cooldown')
+
+    return copy.copy(entry.cooldown)
+
+
+async def get_actual_cooldown(activity: str, donor_tier: int, slash_command: bool) -> float:
+    """Gets the actual cooldown of an activity for a donor tier from the cooldown snapshot, factoring in the event
+    reduction and the donor multiplier (if the cooldown is affected by it).
+
+    Returns
+    -------
+    Cooldown in seconds: float
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database while loading the snapshot.
+    exceptions.NoDataFoundError if no cooldown was found.
+    Also logs all errors to the database.
+    """
+    entry = await _get_snapshot_entry(activity, 'get_actual_cooldown')
+    actual_cooldowns = entry.actual_cooldowns_slash if slash_command else entry.actual_cooldowns_mention
+
+    return actual_cooldowns[donor_tier]
 
 
 async def get_all_cooldowns() -> Tuple[Cooldown]:
-    """Gets the cooldown settings for all activities.
+    """Gets the cooldown settings for all activities from the cooldown snapshot.
 
     Returns
     -------
-    Tuple[Cooldown]
+    Tuple[Cooldown], sorted by activity. Changing them doesn't change the snapshot.
 
     Raises
     ------
-    sqlite3.Error if something happened within the database.
+    sqlite3.Error if something happened within the database while loading the snapshot.
     exceptions.NoDataFoundError if no cooldown was found.
     LookupError if something goes wrong reading the dict.
     Also logs all errors to the database.
     """
-    table = f'cooldowns'
-    function_name = 'get_all_cooldowns'
-    sql = f'SELECT * FROM {table} ORDER BY activity ASC'
-    try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql)
-        records = cur.fetchall()
-    except sqlite3.Error as error:
-        await errors.log_error(
-            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
-        )
-        raise
-
-    if not records:
+    snapshot = await _get_snapshot()
+    if not snapshot:
         await errors.log_error(
-            strings.INTERNAL_ERROR_NO_DATA_FOUND.format(table=table, function=function_name, sql=sql)
+            strings.INTERNAL_ERROR_NO_DATA_FOUND.format(
+                table='cooldowns', function='get_all_cooldowns', sql='Cooldown snapshot'
+            )
         )
         raise exceptions.NoDataFoundError('No cooldown data found in database.')
-    cooldowns = []
-    for record in records:
-        cooldown = await _dict_to_cooldown(dict(record))
-        cooldowns.append(cooldown)
 
-    return tuple(cooldowns)
+    return tuple(copy.copy(entry.cooldown) for entry in snapshot.values())
 
 
 # Write Data
-async def _update_cooldown(activity: str, **kwargs) -> None:
+async def _update_cooldown(activity: str, **kwargs) -> int:
     """Updates cooldown record. Use Cooldown.update() to trigger this function.
 
     Arguments
@@ -175,6 +256,10 @@ async def _update_cooldown(activity: str, **kwargs) -> None:
         event_reduction_mention: float
         event_reduction_slash: float
 
+    Returns
+    -------
+    Amount of updated records: int
+
     Raises
     ------
     sqlite3.Error if something happened within the database.
@@ -189,16 +274,17 @@ async def _update_cooldown(activity: str, **kwargs) -> None:
         )
         raise exceptions.NoArgumentsError('You need to specify at least one keyword argument.')
     try:
-        cur = settings.DATABASE.cursor()
         sql = f'UPDATE {table} SET'
         for kwarg in kwargs:
             sql = f'{sql} {kwarg} = :{kwarg},'
         sql = sql.strip(",")
         kwargs['activity'] = activity
         sql = f'{sql} WHERE activity = :activity'
-        cur.execute(sql, kwargs)
+        cur = await gateway.execute(sql, kwargs)
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
-        raise
\ No newline at end of file
+        raise
+
+    return cur.rowcount
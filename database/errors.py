@@ -1,6 +1,7 @@
 # cooldowns.py
 """Provides access to the table "errors" in the database"""
 
+import dataclasses
 import sqlite3
 import traceback
 from typing import Optional, Union
@@ -9,7 +10,8 @@ import discord
 from discord import utils
 from discord.ext import commands
 
-from resources import exceptions, logs, settings, strings
+from database import gateway
+from resources import exceptions, logs, strings
 
 
 async def log_error(error: Union[Exception, str], ctx: Optional[Union[commands.Context, discord.Message]] = None) -> None:
@@ -73,8 +75,7 @@ async def log_error(error: Union[Exception, str], ctx: Optional[Union[commands.C
         jump_url = 'N/A'
         user_settings = 'N/A'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (date_time, error_message, user_settings, jump_url))
+        await gateway.execute(sql, (date_time, error_message, user_settings, jump_url))
         logs.logger.error(f'\n{error_message}\n>> Jump URL: {jump_url}')
     except sqlite3.Error as error:
         if ctx is not None:
@@ -86,4 +87,22 @@ async def log_error(error: Union[Exception, str], ctx: Optional[Union[commands.C
             logs.logger.error(
                 strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
             )
-        raise
\ No newline at end of file
+        raise
+
+
+async def verify_local_update(record_object, table: str, function_name: str) -> None:
+    """Refreshes an object that had an update applied locally and logs an error if the database record differs.
+    Only used if VERIFY_DATABASE_UPDATES is on.
+
+    Arguments
+    ---------
+    record_object: Dataclass object with a refresh() method (e.g. users.User)
+    """
+    applied_values = dataclasses.asdict(record_object)
+    await record_object.refresh()
+    record_values = dataclasses.asdict(record_object)
+    if applied_values != record_values:
+        await log_error(
+            strings.INTERNAL_ERROR_UPDATE_MISMATCH.format(table=table, function=function_name, applied=applied_values,
+                                                          record=record_values)
+        )
@@ -0,0 +1,279 @@
+# gateway.py
+"""Runs all database statements on dedicated worker threads.
+
+The database runs in WAL mode, so reading never has to wait for writing and vice versa.
+- All writes run on one writer thread that owns the only writing connection. Writes are run one after the other in
+the order they were sent, so they keep their order and don't need any locking.
+- Reads run on a pool of reader threads, each with its own read-only connection. WAL gives every read a consistent
+snapshot that contains everything written before the read was sent.
+
+The event loop only awaits the results, so slow statements (e.g. reports over a whole year or VACUUM) don't block the
+bot. If no event loop is running (e.g. during startup), the caller blocks until the statement is done instead.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from resources import settings
+
+
+READ_CONNECTIONS = 4
+PRAGMAS = {
+    'synchronous': 'NORMAL', # Safe in WAL mode, a power loss can only lose the last commits, not corrupt the database
+    'cache_size': -32_000, # KiB
+    'mmap_size': 268_435_456, # Bytes
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5_000, # ms
+}
+
+_WRITE_CONNECTION: Optional[sqlite3.Connection] = None # Only used by the writer thread
+_READ_CONNECTIONS = threading.local() # One connection per reader thread
+_STATS = {
+    pool: {'statements': 0, 'errors': 0, 'pending': 0, 'time_total': 0.0, 'time_max': 0.0}
+    for pool in ('read', 'write')
+}
+
+
+# Containers
+class QueryResult():
+    """Object that contains the result of a statement.
+    Has the same attributes and fetch methods as a cursor, so it can be used like one."""
+    __slots__ = ('description', 'lastrowid', 'rowcount', 'rows')
+
+    def __init__(self, cur: sqlite3.Cursor) -> None:
+        self.rows: List[sqlite3.Row] = cur.fetchall()
+        self.description: Optional[tuple] = cur.description
+        self.lastrowid: Optional[int] = cur.lastrowid
+        self.rowcount: int = cur.rowcount
+
+    def fetchall(self) -> List[sqlite3.Row]:
+        """Returns all returned rows."""
+        return self.rows
+
+    def fetchone(self) -> Optional[sqlite3.Row]:
+        """Returns the first returned row or None if the statement didn't return any rows."""
+        return self.rows[0] if self.rows else None
+
+
+class PoolStats(NamedTuple):
+    """Object that represents the statements run by the reader or the writer threads.
+    Times are measured from sending the statement until the result arrived, so they include waiting in the queue."""
+    statements: int
+    errors: int
+    pending: int
+    time_average: float # ms
+    time_max: float # ms
+
+
+class DatabaseStatus(NamedTuple):
+    """Object that represents the current state of the database."""
+    healthy: bool
+    journal_mode: str
+    pragmas: Dict[str, Any] # Values of the writer connection
+    read_connections: int
+    reads: PoolStats
+    writes: PoolStats
+    wal_size: int # Bytes
+
+
+def _open_connection(read_only: bool) -> sqlite3.Connection:
+    """Opens a database connection with the settings in PRAGMAS."""
+    connection = sqlite3.connect(settings.DB_FILE, isolation_level=None, detect_types=sqlite3.PARSE_DECLTYPES)
+    connection.row_factory = sqlite3.Row
+    if not read_only: connection.execute('PRAGMA journal_mode = WAL')
+    for name, value in PRAGMAS.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+    if read_only: connection.execute('PRAGMA query_only = ON')
+    return connection
+
+
+def _open_write_connection() -> None:
+    """Opens the writing connection. Runs in the writer thread when it is started."""
+    global _WRITE_CONNECTION
+    _WRITE_CONNECTION = _open_connection(read_only=False)
+
+
+def _open_read_connection() -> None:
+    """Opens a read-only connection. Runs in every reader thread when it is started."""
+    _READ_CONNECTIONS.connection = _open_connection(read_only=True)
+
+
+def _execute_write(sql: str, parameters: Union[Sequence[Any], dict]) -> QueryResult:
+    """Runs a statement on the writing connection. Runs in the writer thread."""
+    return QueryResult(_WRITE_CONNECTION.execute(sql, parameters))
+
+
+def _execute_many_write(sql: str, parameters: Sequence[Union[Sequence[Any], dict]]) -> QueryResult:
+    """Runs a statement once for every parameter set in one transaction on the writing connection.
+    Runs in the writer thread."""
+    _WRITE_CONNECTION.execute('BEGIN')
+    try:
+        result = QueryResult(_WRITE_CONNECTION.executemany(sql, parameters))
+        _WRITE_CONNECTION.execute('COMMIT')
+    except BaseException:
+        _WRITE_CONNECTION.execute('ROLLBACK')
+        raise
+    return result
+
+
+def _execute_transaction_write(statements: Sequence[Tuple[str, Union[Sequence[Any], dict]]]) -> List[QueryResult]:
+    """Runs statements in one transaction on the writing connection. Runs in the writer thread."""
+    _WRITE_CONNECTION.execute('BEGIN IMMEDIATE')
+    try:
+        results = [QueryResult(_WRITE_CONNECTION.execute(sql, parameters)) for sql, parameters in statements]
+        _WRITE_CONNECTION.execute('COMMIT')
+    except BaseException:
+        _WRITE_CONNECTION.execute('ROLLBACK')
+        raise
+    return results
+
+
+def _execute_read(sql: str, parameters: Union[Sequence[Any], dict]) -> QueryResult:
+    """Runs a statement on the read-only connection of the current reader thread. Runs in a reader thread."""
+    return QueryResult(_READ_CONNECTIONS.connection.execute(sql, parameters))
+
+
+_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix='database-writer', initializer=_open_write_connection)
+_READERS = ThreadPoolExecutor(max_workers=READ_CONNECTIONS, thread_name_prefix='database-reader',
+                              initializer=_open_read_connection)
+
+
+async def _run(pool: str, executor: ThreadPoolExecutor, function, *arguments) -> Any:
+    """Runs a function in an executor and records its stats."""
+    stats = _STATS[pool]
+    stats['pending'] += 1
+    start_time = time.perf_counter()
+    try:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return executor.submit(function, *arguments).result()
+        return await loop.run_in_executor(executor, function, *arguments)
+    except sqlite3.Error:
+        stats['errors'] += 1
+        raise
+    finally:
+        time_passed = time.perf_counter() - start_time
+        stats['pending'] -= 1
+        stats['statements'] += 1
+        stats['time_total'] += time_passed
+        if time_passed > stats['time_max']: stats['time_max'] = time_passed
+
+
+async def execute(sql: str, parameters: Union[Sequence[Any], dict] = ()) -> QueryResult:
+    """Runs a statement that changes the database on the writer thread.
+
+    Arguments
+    ---------
+    sql: The statement.
+    parameters: The parameters of the statement, either as a sequence or as a dict for named parameters.
+
+    Returns
+    -------
+    QueryResult with all returned rows, the row count and the id of the last inserted row.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    """
+    return await _run('write', _WRITER, _execute_write, sql, parameters)
+
+
+async def execute_many(sql: str, parameters: Sequence[Union[Sequence[Any], dict]]) -> QueryResult:
+    """Runs a statement that changes the database once for every parameter set on the writer thread.
+    All statements run in one transaction, so either all or none of them are written.
+
+    Arguments
+    ---------
+    sql: The statement.
+    parameters: The parameter sets, either as sequences or as dicts for named parameters.
+
+    Returns
+    -------
+    QueryResult with the total row count.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. Nothing is written in that case.
+    """
+    return await _run('write', _WRITER, _execute_many_write, sql, parameters)
+
+
+async def execute_transaction(statements: Sequence[Tuple[str, Union[Sequence[Any], dict]]]) -> List[QueryResult]:
+    """Runs statements that change the database in one transaction on the writer thread.
+    No other write can run in between, and either all or none of the statements are written.
+
+    Arguments
+    ---------
+    statements: The statements and their parameters as tuples (sql, parameters).
+
+    Returns
+    -------
+    List with one QueryResult per statement.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. Nothing is written in that case.
+    """
+    return await _run('write', _WRITER, _execute_transaction_write, statements)
+
+
+async def read(sql: str, parameters: Union[Sequence[Any], dict] = ()) -> QueryResult:
+    """Runs a statement that only reads from the database on one of the reader threads.
+    The result contains everything that was written before this was called.
+
+    Arguments
+    ---------
+    sql: The statement.
+    parameters: The parameters of the statement, either as a sequence or as a dict for named parameters.
+
+    Returns
+    -------
+    QueryResult with all returned rows.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. This includes statements that try to write.
+    """
+    return await _run('read', _READERS, _execute_read, sql, parameters)
+
+
+def _get_pool_stats(pool: str) -> PoolStats:
+    stats = _STATS[pool]
+    return PoolStats(
+        statements = stats['statements'],
+        errors = stats['errors'],
+        pending = stats['pending'],
+        time_average = stats['time_total'] / stats['statements'] * 1_000 if stats['statements'] else 0.0,
+        time_max = stats['time_max'] * 1_000,
+    )
+
+
+async def get_status() -> DatabaseStatus:
+    """Returns the journal mode, the pragma values and the statement stats of the database.
+    The database counts as healthy if both the writer and a reader answer and the database runs in WAL mode."""
+    pragmas = {}
+    healthy = True
+    journal_mode = 'unknown'
+    try:
+        journal_mode = (await execute('PRAGMA journal_mode')).fetchone()[0]
+        for name in PRAGMAS:
+            pragmas[name] = (await execute(f'PRAGMA {name}')).fetchone()[0]
+        await read('SELECT 1')
+    except sqlite3.Error:
+        healthy = False
+    wal_file = f'{settings.DB_FILE}-wal'
+    return DatabaseStatus(
+        healthy = healthy and journal_mode == 'wal',
+        journal_mode = journal_mode,
+        pragmas = pragmas,
+        read_connections = READ_CONNECTIONS,
+        reads = _get_pool_stats('read'),
+        writes = _get_pool_stats('write'),
+        wal_size = os.path.getsize(wal_file) if os.path.isfile(wal_file) else 0,
+    )
@@ -3,17 +3,24 @@
 
 
 from dataclasses import dataclass
-import itertools
 import sqlite3
-from typing import List, Tuple, Union
+from typing import Dict, List, Union
 
 import discord
 from discord.ext import commands
 
-from database import errors
+from database import errors, gateway
 from resources import exceptions, settings, strings
 
 
+# Prefix cache (guild_id: prefix)
+# get_all_prefixes runs on every message, so the prefixes are only read once per guild. _update_guild removes changed
+# guilds from the cache and counts up their generation, so a read that was in flight during the update doesn't cache
+# the old prefix again.
+_PREFIX_CACHE: Dict[int, str] = {}
+_PREFIX_CACHE_GENERATIONS: Dict[int, int] = {} # guild_id: updates of the guild
+
+
 # Containers
 @dataclass()
 class Guild():
@@ -69,80 +76,60 @@ async def _dict_to_guild(record: dict) -> Guild:
     return guild
 
 
-async def _get_mixed_case_prefixes(prefix: str) -> List[str]:
-    """Turns a string into a list of all mixed case variations of said string
+async def _get_guild_prefix(guild_id: int, ctx_or_message: Union[commands.Context, discord.Message]) -> str:
+    """Returns the prefix of a guild from the prefix cache or the database. If the guild has no record, the default
+    prefix is returned. The record is not created here, this happens as soon as the guild settings are read with
+    get_guild().
 
-    Returns
-    -------
-    All mixed case variations: List[str]
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. Also logs this error to the database.
     """
-    mixed_prefixes = []
-    all_prefixes = map(''.join, itertools.product(*((char.upper(), char.lower()) for char in prefix)))
-    for prefix in list(all_prefixes):
-        mixed_prefixes.append(prefix)
-    return mixed_prefixes
-
-
-# Read data
-async def get_prefix(ctx_or_message: Union[commands.Context, discord.Message]) -> str:
-    """Check database for stored prefix. If no prefix is found, the default prefix is used"""
+    prefix = _PREFIX_CACHE.get(guild_id, None)
+    if prefix is not None: return prefix
     table = 'guilds'
-    function_name = 'get_prefix'
+    function_name = '_get_guild_prefix'
     sql = f'SELECT prefix FROM {table} WHERE guild_id=?'
-    guild_id = ctx_or_message.guild.id
+    generation = _PREFIX_CACHE_GENERATIONS.get(guild_id, 0)
     try:
-        cur=settings.DATABASE.cursor()
-        cur.execute(sql, (guild_id,))
+        cur = await gateway.read(sql, (guild_id,))
         record = cur.fetchone()
-        prefix = record['prefix'].replace('"','') if record else settings.DEFAULT_PREFIX
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql),
             ctx_or_message
         )
+        raise
+    prefix = record['prefix'].replace('"','') if record else settings.DEFAULT_PREFIX
+    if _PREFIX_CACHE_GENERATIONS.get(guild_id, 0) == generation: _PREFIX_CACHE[guild_id] = prefix
 
     return prefix
 
-async def get_all_prefixes(bot: commands.Bot, ctx: commands.Context) -> Tuple:
-    """Gets all prefixes. If no prefix is found, a record for the guild is created with the
-    default prefix.
+
+# Read data
+async def get_prefix(ctx_or_message: Union[commands.Context, discord.Message]) -> str:
+    """Check database for stored prefix. If no prefix is found, the default prefix is used"""
+    return await _get_guild_prefix(ctx_or_message.guild.id, ctx_or_message)
+
+
+async def get_all_prefixes(bot: commands.Bot, message: discord.Message) -> List[str]:
+    """Gets all prefixes. If no prefix is found, the default prefix is used.
+    The prefix is matched case-insensitively: if the message starts with the prefix in any case, the start of the
+    message is returned as the prefix, so discord.py finds it without checking every mixed case variation.
 
     Returns
     -------
-    A tuple with the current server prefix, all "rpg" prefixes and the pingable bot
+    A list with the pingable bot and the server prefix
 
     Raises
     ------
     sqlite3.Error if something happened within the database.  Also logs this error to the database.
     """
-    table = 'guilds'
-    function_name = 'get_all_prefixes'
-    sql = f'SELECT prefix FROM {table} WHERE guild_id=?'
-    guild_id = ctx.guild.id
-    try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (guild_id,))
-        record = cur.fetchone()
-        prefixes = []
-        if record:
-            prefix_db = record['prefix'].replace('"','')
-            prefix_db_mixed_case = await _get_mixed_case_prefixes(prefix_db)
-            for prefix in prefix_db_mixed_case:
-                prefixes.append(prefix)
-        else:
-            sql = f'INSERT INTO {table} (guild_id, prefix) VALUES (?, ?)'
-            cur.execute(sql, (guild_id, settings.DEFAULT_PREFIX))
-            prefix_default_mixed_case = await _get_mixed_case_prefixes(settings.DEFAULT_PREFIX)
-            for prefix in prefix_default_mixed_case:
-                prefixes.append(prefix)
-    except sqlite3.Error as error:
-        await errors.log_error(
-            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql),
-            ctx
-        )
-        raise
+    prefix = await _get_guild_prefix(message.guild.id, message)
+    message_prefix = message.content[:len(prefix)]
+    if message_prefix.lower() == prefix.lower(): prefix = message_prefix
 
-    return commands.when_mentioned_or(*prefixes)(bot, ctx)
+    return commands.when_mentioned_or(prefix)(bot, message)
 
 
 async def get_guild(guild_id: int) -> Guild:
@@ -163,8 +150,7 @@ async def get_guild(guild_id: int) -> Guild:
     function_name = 'get_guild'
     sql_select = f'SELECT * FROM {table} WHERE guild_id=?'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql_select, (guild_id,))
+        cur = await gateway.read(sql_select, (guild_id,))
         record = cur.fetchone()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -174,9 +160,9 @@ async def get_guild(guild_id: int) -> Guild:
     if not record:
         sql = f'INSERT INTO {table} (guild_id, prefix) VALUES (?, ?)'
         try:
-            cur.execute(sql, (guild_id, settings.DEFAULT_PREFIX))
+            await gateway.execute(sql, (guild_id, settings.DEFAULT_PREFIX))
             sql = sql_select
-            cur.execute(sql, (guild_id,))
+            cur = await gateway.read(sql, (guild_id,))
             record = cur.fetchone()
         except sqlite3.Error as error:
             await errors.log_error(
@@ -211,16 +197,17 @@ async def _update_guild(guild_id: int, **kwargs) -> None:
         )
         raise exceptions.NoArgumentsError('You need to specify at least one keyword argument.')
     try:
-        cur = settings.DATABASE.cursor()
         sql = f'UPDATE {table} SET'
         for kwarg in kwargs:
             sql = f'{sql} {kwarg} = :{kwarg},'
         sql = sql.strip(",")
         kwargs['guild_id'] = guild_id
         sql = f'{sql} WHERE guild_id = :guild_id'
-        cur.execute(sql, kwargs)
+        await gateway.execute(sql, kwargs)
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
-        raise
\ No newline at end of file
+        raise
+    _PREFIX_CACHE_GENERATIONS[guild_id] = _PREFIX_CACHE_GENERATIONS.get(guild_id, 0) + 1
+    _PREFIX_CACHE.pop(guild_id, None)
\ No newline at end of file
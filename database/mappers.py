@@ -0,0 +1,159 @@
+# mappers.py
+"""Creates record objects directly from database rows.
+
+A RowMapper describes once how the attributes of a record class are read from the columns of a table. For every
+column layout (the description of the cursor that returned the rows) the column indexes are looked up once and
+compiled into a row function. Creating an object then only consists of indexing the row tuple and calling the
+class, so mapping is synchronous and can be done for thousands of rows in one go.
+
+Times are stored as integer epoch seconds (UTC). to_timestamp() and from_timestamp() convert them at the boundary
+of the database functions.
+"""
+
+from dataclasses import MISSING, fields
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from resources import strings
+
+
+def to_timestamp(value: datetime) -> int:
+    """Returns a datetime as epoch seconds the way it is stored in the database. Naive datetimes are treated as UTC,
+    microseconds are cut off."""
+    if value.tzinfo is None: value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def from_timestamp(value: int) -> datetime:
+    """Returns epoch seconds from the database as a datetime in UTC."""
+    return datetime.fromtimestamp(value, timezone.utc)
+
+
+# Containers
+class Column(NamedTuple):
+    """Object that describes how an attribute is read from a database row.
+
+    attribute: Name of the attribute of the record class.
+    columns: Names of the columns the value is read from. Defaults to the attribute name.
+    convert: Function that is called with the values of all columns and returns the attribute value. If not set, the
+    value of the (only) column is used as is.
+    optional: If True, the attribute is set to None if the column doesn't exist in the row.
+    """
+    attribute: str
+    columns: Tuple[str, ...] = ()
+    convert: Optional[Callable[..., Any]] = None
+    optional: bool = False
+
+
+class RowMapper():
+    """Object that creates objects of a record class from database rows.
+
+    Arguments
+    ---------
+    record_class: The class of the created objects. All attributes that are not mapped need to have a default value
+    and have to come after all mapped attributes.
+    columns: The Column descriptions of all mapped attributes.
+    """
+    __slots__ = ('record_class', 'columns', '_compiled')
+
+    def __init__(self, record_class: type, columns: Iterable[Column]) -> None:
+        columns = {column.attribute: column for column in columns}
+        ordered_columns = []
+        for field in fields(record_class):
+            if field.name in columns:
+                ordered_columns.append(columns.pop(field.name))
+            elif field.default is MISSING and field.default_factory is MISSING:
+                raise ValueError(f'Attribute "{field.name}" of {record_class.__name__} is not mapped.')
+            elif columns:
+                raise ValueError(
+                    f'Attribute "{field.name}" of {record_class.__name__} is not mapped but followed by mapped '
+                    f'attributes.'
+                )
+        if columns:
+            raise ValueError(f'{record_class.__name__} has no attributes {", ".join(columns)}.')
+        self.record_class = record_class
+        self.columns: Tuple[Column] = tuple(ordered_columns)
+        self._compiled: Dict[Tuple[str, ...], Callable[[Sequence], Any]] = {}
+
+    def _compile(self, column_names: Tuple[str, ...]) -> Callable[[Sequence], Any]:
+        """Returns the row function for a column layout. Creates it on first use.
+        The row function is generated source code (like dataclasses does it for __init__) that reads every value
+        with a constant index and passes it to the record class, e.g.
+        "def map_row(row): return record_class(row[3], convert_1(row[0]), ...)".
+
+        Raises
+        ------
+        LookupError if a column that is not optional doesn't exist in the layout.
+        """
+        map_row = self._compiled.get(column_names, None)
+        if map_row is not None: return map_row
+        indexes = {column_name: index for index, column_name in enumerate(column_names)}
+        namespace = {'record_class': self.record_class}
+        arguments = []
+        for column_index, column in enumerate(self.columns):
+            source_columns = column.columns if column.columns else (column.attribute,)
+            missing_columns = [column_name for column_name in source_columns if column_name not in indexes]
+            if missing_columns and column.optional:
+                arguments.append('None')
+                continue
+            if missing_columns:
+                raise LookupError(
+                    f'Columns {", ".join(missing_columns)} for attribute "{column.attribute}" of '
+                    f'{self.record_class.__name__} not found in row.'
+                )
+            values = ', '.join(f'row[{indexes[column_name]}]' for column_name in source_columns)
+            if column.convert is None:
+                arguments.append(values)
+            else:
+                namespace[f'convert_{column_index}'] = column.convert
+                arguments.append(f'convert_{column_index}({values})')
+        source = f'def map_row(row): return record_class({", ".join(arguments)})'
+        exec(compile(source, f'<RowMapper {self.record_class.__name__}>', 'exec'), namespace)
+        map_row = self._compiled[column_names] = namespace['map_row']
+        return map_row
+
+    def map_row(self, description: Sequence[tuple], row: Sequence) -> Any:
+        """Creates an object from a database row.
+
+        Arguments
+        ---------
+        description: The description of the cursor that returned the row (cursor.description).
+        row: The row, either as a tuple or a sqlite3.Row.
+
+        Raises
+        ------
+        LookupError if something goes wrong reading the row.
+        """
+        return self.map_rows(description, (row,))[0]
+
+    def map_rows(self, description: Sequence[tuple], rows: Iterable[Sequence]) -> Tuple:
+        """Creates objects from database rows that all have the same column layout.
+
+        Arguments
+        ---------
+        description: The description of the cursor that returned the rows (cursor.description).
+        rows: The rows, either as tuples or as sqlite3.Row.
+
+        Returns
+        -------
+        Tuple with the created objects in the same order as the rows.
+
+        Raises
+        ------
+        LookupError if something goes wrong reading a row.
+        """
+        map_row = self._compile(tuple(column[0] for column in description))
+        records: List[Any] = []
+        row = None
+        try:
+            for row in rows:
+                records.append(map_row(row))
+        except Exception as error:
+            raise LookupError(
+                strings.INTERNAL_ERROR_DICT_TO_OBJECT.format(
+                    function=f'RowMapper({self.record_class.__name__})', record=tuple(row) if row is not None else None
+                )
+                + f'Error: {error}'
+            ) from error
+        return tuple(records)
+
@@ -0,0 +1,194 @@
+# migrations.py
+"""Applies changes to the database schema.
+
+Every entry in MIGRATIONS changes the schema to its version. The version of the database is stored in
+PRAGMA user_version, the default database has version BASE_SCHEMA_VERSION. On startup, all migrations above the
+version of the database are applied in order. Every migration runs in one transaction together with setting the new
+version, so a failed migration leaves the database on the last version that was applied completely.
+
+Released migrations are never changed. New schema changes always go into a new migration at the end.
+"""
+
+import sqlite3
+from typing import Dict, List, Tuple
+
+from database import errors, gateway
+from resources import logs, strings
+
+
+BASE_SCHEMA_VERSION = 7 # Schema version of database/default_db.db
+
+# Rollup tables of "tracking_log", see tracking.py
+# table: (bucket column, SQL expression that returns the bucket of a date_time)
+_ROLLUP_TABLES = {
+    'tracking_log_hourly': ('hour', "strftime('%Y-%m-%d %H:00:00', {date_time})"),
+    'tracking_log_daily': ('day', 'date({date_time})'),
+}
+# Same for date_time stored as epoch seconds (schema version 10+)
+_ROLLUP_TABLES_EPOCH = {
+    'tracking_log_hourly': ('hour', '({date_time} - {date_time} % 3600)'),
+    'tracking_log_daily': ('day', '({date_time} - {date_time} % 86400)'),
+}
+
+
+def _get_rollup_statements(rollup_tables: Dict[str, Tuple[str, str]], bucket_type: str) -> List[str]:
+    """Returns the statements that create the rollup tables, fill them with the sums of all existing log entries and
+    create the triggers that keep them up to date. Replaces tables and triggers that already exist.
+    Also creates an index on the time of the log entries of a user, so reading the start of a report timeframe only
+    reads the log entries of that hour."""
+    columns = 'user_id, guild_id, command_or_drop'
+    statements = [
+        'CREATE INDEX IF NOT EXISTS tracking_log_user_id_date_time ON tracking_log (user_id, date_time)',
+        'DROP TRIGGER IF EXISTS tracking_log_rollup_insert',
+        'DROP TRIGGER IF EXISTS tracking_log_rollup_delete',
+        'DROP TRIGGER IF EXISTS tracking_log_rollup_update',
+    ]
+    add_new_row = remove_old_row = ''
+    for table, (bucket, bucket_expression) in rollup_tables.items():
+        statements.append(f'DROP TABLE IF EXISTS {table}')
+        statements.append(
+            f'CREATE TABLE {table} (user_id INTEGER NOT NULL, guild_id INTEGER NOT NULL, '
+            f'command_or_drop TEXT NOT NULL, {bucket} {bucket_type} NOT NULL, amount INTEGER NOT NULL, '
+            f'PRIMARY KEY (user_id, {bucket}, guild_id, command_or_drop)) WITHOUT ROWID'
+        )
+        statements.append(
+            f'INSERT INTO {table} ({columns}, {bucket}, amount) '
+            f'SELECT {columns}, {bucket_expression.format(date_time="date_time")}, SUM(amount) FROM tracking_log '
+            f'GROUP BY {columns}, {bucket_expression.format(date_time="date_time")}'
+        )
+        add_new_row = (
+            f'{add_new_row}'
+            f'INSERT INTO {table} ({columns}, {bucket}, amount) '
+            f'VALUES (NEW.user_id, NEW.guild_id, NEW.command_or_drop, '
+            f'{bucket_expression.format(date_time="NEW.date_time")}, NEW.amount) '
+            f'ON CONFLICT (user_id, {bucket}, guild_id, command_or_drop) DO UPDATE SET amount = amount + excluded.amount;\n'
+        )
+        old_key = (
+            f'user_id = OLD.user_id AND {bucket} = {bucket_expression.format(date_time="OLD.date_time")} '
+            f'AND guild_id = OLD.guild_id AND command_or_drop = OLD.command_or_drop'
+        )
+        remove_old_row = (
+            f'{remove_old_row}'
+            f'UPDATE {table} SET amount = amount - OLD.amount WHERE {old_key};\n'
+            f'DELETE FROM {table} WHERE {old_key} AND amount = 0;\n'
+        )
+    statements.append(
+        f'CREATE TRIGGER tracking_log_rollup_insert AFTER INSERT ON tracking_log BEGIN\n'
+        f'{add_new_row}END'
+    )
+    statements.append(
+        f'CREATE TRIGGER tracking_log_rollup_delete AFTER DELETE ON tracking_log BEGIN\n'
+        f'{remove_old_row}END'
+    )
+    statements.append(
+        f'CREATE TRIGGER tracking_log_rollup_update AFTER UPDATE OF {columns}, amount, date_time ON tracking_log BEGIN\n'
+        f'{remove_old_row}{add_new_row}END'
+    )
+    return statements
+
+
+# Schema version: statements that change the schema from the version before to this version
+MIGRATIONS: Dict[int, Tuple[str, ...]] = {
+    # Hourly and daily rollup tables for tracking reports
+    8: tuple(_get_rollup_statements(_ROLLUP_TABLES, 'TEXT')),
+    # Indexes for hot queries
+    9: (
+        # Old single log entries (get_old_log_entries, consolidate_log_entries)
+        'CREATE INDEX IF NOT EXISTS tracking_log_type_date_time ON tracking_log (type, date_time)',
+        # Bunnies of a user in catch order (get_bunnies_by_user_id)
+        'CREATE INDEX IF NOT EXISTS bunnies_user_id_epicness_fertility ON bunnies (user_id, epicness, fertility)',
+    ),
+    # Times of reminders and log entries as epoch seconds instead of text. The old values are all UTC, the
+    # fractions of a second are cut off (SQLite would round summaries at 23:59:59.999999 into the next day).
+    10: (
+        'CREATE TABLE reminders_new (user_id INTEGER, activity TEXT NOT NULL, channel_id INTEGER NOT NULL, '
+        'end_time INTEGER NOT NULL, message TEXT NOT NULL, triggered INTEGER DEFAULT (False) NOT NULL, '
+        'custom_id INTEGER, PRIMARY KEY (user_id, activity, custom_id))',
+        'INSERT INTO reminders_new (user_id, activity, channel_id, end_time, message, triggered, custom_id) '
+        "SELECT user_id, activity, channel_id, CAST(strftime('%s', substr(end_time, 1, 19)) AS INTEGER), message, triggered, "
+        'custom_id FROM reminders',
+        'DROP TABLE reminders',
+        'ALTER TABLE reminders_new RENAME TO reminders',
+        'CREATE INDEX end_time ON reminders (end_time)',
+        'CREATE INDEX user_id_activity ON reminders (activity, user_id)',
+        'CREATE TABLE tracking_log_new (user_id INTEGER NOT NULL, guild_id INTEGER NOT NULL, '
+        'command_or_drop TEXT NOT NULL, amount INTEGER NOT NULL DEFAULT (1), date_time INTEGER NOT NULL, '
+        "type TEXT NOT NULL DEFAULT 'single')",
+        'INSERT INTO tracking_log_new (user_id, guild_id, command_or_drop, amount, date_time, type) '
+        "SELECT user_id, guild_id, command_or_drop, amount, CAST(strftime('%s', substr(date_time, 1, 19)) AS INTEGER), type "
+        'FROM tracking_log',
+        'DROP TABLE tracking_log', # Also drops the rollup triggers
+        'ALTER TABLE tracking_log_new RENAME TO tracking_log',
+        'CREATE INDEX tracking_log_user_id_command_or_drop_date_time '
+        'ON tracking_log (user_id, command_or_drop, date_time)',
+        'CREATE INDEX tracking_log_user_id_date_time ON tracking_log (user_id, date_time)',
+        'CREATE INDEX tracking_log_type_date_time ON tracking_log (type, date_time)',
+        *_get_rollup_statements(_ROLLUP_TABLES_EPOCH, 'INTEGER'),
+    ),
+}
+SCHEMA_VERSION = max(MIGRATIONS)
+
+
+async def get_schema_version() -> int:
+    """Returns the schema version of the database (PRAGMA user_version).
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    Also logs all errors to the database.
+    """
+    function_name = 'get_schema_version'
+    sql = 'PRAGMA user_version'
+    try:
+        cur = await gateway.read(sql)
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table='-', function=function_name, sql=sql)
+        )
+        raise
+
+    return cur.fetchone()[0]
+
+
+async def run_migrations() -> int:
+    """Applies all migrations the database doesn't have yet. Needs to run on startup before anything else uses the
+    database.
+
+    Returns
+    -------
+    Amount of applied migrations: int
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. The failed migration is not applied at all in that case,
+    all migrations before it stay applied.
+    RuntimeError if the database has a newer schema version than this code knows or is older than the default
+    database.
+    Also logs all errors to the database.
+    """
+    function_name = 'run_migrations'
+    schema_version = await get_schema_version()
+    if schema_version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f'The database has schema version {schema_version}, but this version of the bot only knows version '
+            f'{SCHEMA_VERSION}. Please update the bot.'
+        )
+    if schema_version < BASE_SCHEMA_VERSION:
+        raise RuntimeError(
+            f'The database has schema version {schema_version}, which is too old to be updated automatically. '
+            f'The oldest supported version is {BASE_SCHEMA_VERSION}.'
+        )
+    for version in range(schema_version + 1, SCHEMA_VERSION + 1):
+        statements = MIGRATIONS[version] + (f'PRAGMA user_version = {version}',)
+        try:
+            await gateway.execute_transaction([(statement, ()) for statement in statements])
+        except sqlite3.Error as error:
+            await errors.log_error(
+                strings.INTERNAL_ERROR_SQLITE3.format(
+                    error=error, table='-', function=function_name, sql=';\n'.join(statements)
+                )
+            )
+            raise
+        logs.logger.info(f'Migrated database to schema version {version}.')
+
+    return SCHEMA_VERSION - schema_version
@@ -1,25 +1,38 @@
 # reminders.py
-"""Provides access to the tables "reminders" in the database"""
+"""Provides access to the tables "reminders" in the database
 
+Upcoming reminders are scheduled in memory: a min-heap contains the end times (epoch seconds) of all reminders that
+didn't fire yet. It is loaded on startup and updated directly whenever a reminder is inserted or gets a new end time.
+A single dispatcher (run_reminder_schedule()) sleeps until the earliest end time, claims all reminders that are due
+with one statement (see claim_due_reminders()) and hands them over to be sent.
+The heap only contains times, not reminders. If a reminder is deleted or moved, its old time stays in the heap and
+the dispatcher simply finds nothing to send at that time.
+"""
+
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+import heapq
 import sqlite3
-from typing import Optional, Tuple
+import time
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
 
 from discord import utils
-from discord.ext import tasks
 
-from database import cooldowns, errors
+from database import cooldowns, errors, gateway, mappers
 from resources import exceptions, settings, strings
 
 
-# Reminders scheduled for task creation / deletion
-scheduled_for_tasks = {}
-scheduled_for_deletion = {}
+REMINDER_EXPIRY = 20 # Seconds after the end time until a reminder is deleted. Expired reminders are not sent anymore.
+
+# Reminder schedule, see module docstring
+_SCHEDULE_HEAP: List[int] = []
+_SCHEDULE_TIMES: Set[int] = set() # Same times as in _SCHEDULE_HEAP, to not add them twice
+_SCHEDULE_CHANGED = asyncio.Event() # Set when a reminder is scheduled before all others
 
 
 # Containers
-@dataclass()
+@dataclass(slots=True)
 class Reminder():
     """Object that represents a record from the table "reminders"."""
     activity: str
@@ -35,7 +48,6 @@ class Reminder():
 
     async def delete(self) -> None:
         """Deletes the reminder record from the database. Also calls refresh().
-        Also cancels and deletes an active task for this reminder.
 
         Raises
         ------
@@ -70,7 +82,9 @@ class Reminder():
         self.user_id = new_settings.user_id
 
     async def update(self, **kwargs) -> None:
-        """Updates the clan record in the database. Also calls refresh().
+        """Updates the reminder record in the database.
+        If exactly one record was updated, the changes are applied to this object directly. Otherwise refresh() is
+        called.
 
         Arguments
         ---------
@@ -84,71 +98,129 @@ class Reminder():
             triggered: bool
             user_id: int
         """
-        await _update_reminder(self, **kwargs)
-        await self.refresh()
+        if 'end_time' in kwargs:
+            # Stored in whole seconds, so the object keeps the value the database has
+            kwargs['end_time'] = mappers.from_timestamp(mappers.to_timestamp(kwargs['end_time']))
+            if 'triggered' not in kwargs: kwargs['triggered'] = False
+        updated_rows = await _update_reminder(self, **kwargs)
+        if updated_rows != 1:
+            await self.refresh()
+            return
+        for column, value in kwargs.items():
+            setattr(self, column, value)
+        if any(column in kwargs for column in ('activity', 'custom_id', 'user_id')):
+            self.task_name = _get_task_name(self.user_id, self.activity, self.custom_id)
+        if settings.VERIFY_DATABASE_UPDATES: await errors.verify_local_update(self, 'reminders', 'Reminder.update')
+
+
+# Reminder schedule
+def _schedule_reminder_time(end_time: int) -> None:
+    """Adds an end time (epoch seconds) to the reminder schedule. Wakes up the dispatcher if it is the earliest."""
+    if end_time in _SCHEDULE_TIMES: return
+    if not _SCHEDULE_HEAP or end_time < _SCHEDULE_HEAP[0]: _SCHEDULE_CHANGED.set()
+    heapq.heappush(_SCHEDULE_HEAP, end_time)
+    _SCHEDULE_TIMES.add(end_time)
 
 
-# Tasks
-@tasks.loop(seconds=10.0)
-async def schedule_reminders():
-    """Task that reads all due reminders from the database and schedules them for task creation"""
+async def load_reminder_schedule() -> None:
+    """Adds the end times of all reminders that didn't fire yet to the reminder schedule.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    Also logs all errors to the database.
+    """
+    table = 'reminders'
+    function_name = 'load_reminder_schedule'
+    sql = f'SELECT DISTINCT end_time FROM {table} WHERE end_time >= ? AND triggered = ?'
     try:
-        due_reminders = await get_due_reminders()
-    except exceptions.NoDataFoundError:
-        due_reminders = ()
-    for reminder in due_reminders:
+        cur = await gateway.read(sql, (mappers.to_timestamp(utils.utcnow()) - REMINDER_EXPIRY, False))
+        records = cur.fetchall()
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+    for (end_time,) in records:
+        _schedule_reminder_time(end_time)
+
+
+async def run_reminder_schedule(send_reminders: Callable[[Tuple[Reminder]], Awaitable[None]]) -> None:
+    """Dispatcher of the reminder schedule. Loads the schedule and then runs forever: sleeps until the earliest end
+    time, marks all due reminders as triggered and calls send_reminders with them.
+    Only run this once.
+    """
+    await load_reminder_schedule()
+    while True:
+        _SCHEDULE_CHANGED.clear()
+        if not _SCHEDULE_HEAP:
+            await _SCHEDULE_CHANGED.wait()
+            continue
+        time_left = _SCHEDULE_HEAP[0] - time.time()
+        if time_left > 0:
+            try:
+                await asyncio.wait_for(_SCHEDULE_CHANGED.wait(), time_left)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        current_time = int(time.time())
+        while _SCHEDULE_HEAP and _SCHEDULE_HEAP[0] <= current_time:
+            _SCHEDULE_TIMES.discard(heapq.heappop(_SCHEDULE_HEAP))
         try:
-            scheduled_for_tasks[reminder.task_name] = reminder
-            await reminder.update(triggered=True)
+            due_reminders = await claim_due_reminders()
+        except exceptions.NoDataFoundError:
+            continue
         except Exception as error:
-            await errors.log_error(
-                f'Error scheduling a reminder.\nFunction: schedule_reminders\nReminder: {reminder}\nError: {error}'
-        )
+            await errors.log_error(f'Error claiming due reminders.\nFunction: run_reminder_schedule\nError: {error}')
+            continue
+        try:
+            await send_reminders(due_reminders)
+        except Exception as error:
+            await errors.log_error(f'Error sending due reminders.\nFunction: run_reminder_schedule\nError: {error}')
 
 
 # Miscellaneous functions
-async def _dict_to_reminder(record: dict) -> Reminder:
-    """Creates a Reminder object from a database record
+def _get_task_name(user_id: int, activity: str, custom_id: Optional[int]) -> str:
+    """Returns the unique task name of a reminder."""
+    if custom_id is not None:
+        return f'{user_id}-{activity}-{custom_id}'
+    return f'{user_id}-{activity}'
+
+
+_REMINDER_MAPPER = mappers.RowMapper(Reminder, (
+    mappers.Column('activity'),
+    mappers.Column('channel_id'),
+    mappers.Column('clan_name', optional=True),
+    mappers.Column('custom_id'),
+    mappers.Column('end_time', convert=mappers.from_timestamp),
+    mappers.Column('message'),
+    mappers.Column('task_name', ('user_id', 'activity', 'custom_id'), _get_task_name),
+    mappers.Column('triggered', convert=bool),
+    mappers.Column('user_id'),
+))
+
+
+async def _rows_to_reminders(description: Tuple[tuple], records: List[sqlite3.Row]) -> Tuple[Reminder]:
+    """Creates Reminder objects from database records, see mappers.RowMapper.
 
     Arguments
     ---------
-    record: Database record from table "reminders" as a dict.
+    description: The description of the cursor that returned the records.
+    records: Database records from table "reminders".
 
     Returns
     -------
-    Reminder object.
+    Tuple with Reminder objects in the same order as the records.
 
     Raises
     ------
-    LookupError if something goes wrong reading the dict. Also logs this error to the database.
+    LookupError if something goes wrong reading a record. Also logs this error to the database.
     """
-    function_name = '_dict_to_reminder'
     try:
-        user_id = record.get('user_id', None)
-        custom_id = record.get('custom_id', None)
-        if custom_id is not None:
-            task_name = f"{user_id}-{record['activity']}-{custom_id}"
-        else:
-            task_name = f"{user_id}-{record['activity']}"
-        reminder = Reminder(
-            activity = record['activity'],
-            channel_id = record['channel_id'],
-            clan_name = record.get('clan_name', None),
-            custom_id = record.get('custom_id', None),
-            end_time = datetime.fromisoformat(record['end_time'], ),
-            message = record['message'],
-            task_name = task_name,
-            triggered = bool(record['triggered']),
-            user_id = record.get('user_id', None),
-            record_exists = True,
-        )
-    except Exception as error:
-        await errors.log_error(
-            strings.INTERNAL_ERROR_DICT_TO_OBJECT.format(function=function_name, record=record)
-        )
-        raise LookupError(error)
-
-    return reminder
+        return _REMINDER_MAPPER.map_rows(description, records)
+    except LookupError as error:
+        await errors.log_error(str(error))
+        raise
 
 
 # Read Data
@@ -180,8 +252,8 @@ async def get_reminder(user_id: int, activity: str, custom_id: Optional[int] = N
     sql = f'SELECT * FROM {table} WHERE user_id=? AND activity=?'
     if custom_id is not None: sql = f'{sql} AND custom_id=?'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (user_id, activity)) if custom_id is None else cur.execute(sql, (user_id, activity, custom_id))
+        parameters = (user_id, activity) if custom_id is None else (user_id, activity, custom_id)
+        cur = await gateway.read(sql, parameters)
         record = cur.fetchone()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -192,7 +264,7 @@ async def get_reminder(user_id: int, activity: str, custom_id: Optional[int] = N
         raise exceptions.NoDataFoundError(
             f'No reminder data found in database for user "{user_id}" and activity "{activity}".'
         )
-    reminder = await _dict_to_reminder(dict(record))
+    reminder = (await _rows_to_reminders(cur.description, (record,)))[0]
 
     return reminder
 
@@ -221,22 +293,19 @@ async def get_active_reminders(user_id: Optional[int] = None, activity: Optional
     table = 'reminders'
     function_name = 'get_active_reminders'
     sql = f'SELECT * FROM {table} WHERE end_time>?'
-    if end_time is None:
-        current_time = utils.utcnow().replace(microsecond=0)
-        end_time_str = current_time.isoformat(sep=' ')
-    else:
-        end_time_str = end_time.isoformat(sep=' ')
-    queries = [end_time_str,]
+    if end_time is None: end_time = utils.utcnow()
+    queries = [mappers.to_timestamp(end_time),]
     if user_id is not None:
         sql = f'{sql} AND user_id=?'
         queries.append(user_id)
-    if activity is not None:
-        sql = f"{sql} AND activity LIKE ?"
-        queries.append(f'{activity}%')
+    if activity:
+        # Same as "LIKE 'activity%'" for lowercase activities, but can use the indexes on activity
+        sql = f'{sql} AND activity >= ? AND activity < ?'
+        queries.append(activity)
+        queries.append(f'{activity[:-1]}{chr(ord(activity[-1]) + 1)}')
     sql = f'{sql} ORDER BY end_time'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, queries)
+        cur = await gateway.read(sql, queries)
         records = cur.fetchall()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -248,17 +317,14 @@ async def get_active_reminders(user_id: Optional[int] = None, activity: Optional
         error_message = 'No active reminders found in database.'
         if user_id is not None: error_message = f'{error_message} User: {user_id}'
         raise exceptions.NoDataFoundError(error_message)
-    reminders = []
-    for record in records:
-        reminder = await _dict_to_reminder(dict(record))
-        reminders.append(reminder)
+    reminders = await _rows_to_reminders(cur.description, records)
 
-    return tuple(reminders)
+    return reminders
 
 
 async def get_due_reminders(user_id: Optional[int] = None) -> Tuple[Reminder]:
-    """Gets all reminders for all users or - if the argument user_id is set - for one user that are due within
-    the next 15 seconds.
+    """Gets all reminders for all users or - if the argument user_id is set - for one user that are due and didn't
+    fire yet. Reminders that expired more than REMINDER_EXPIRY seconds ago are ignored.
 
     Returns
     -------
@@ -278,16 +344,12 @@ async def get_due_reminders(user_id: Optional[int] = None) -> Tuple[Reminder]:
     else:
         sql = f'SELECT * FROM {table} WHERE user_id=? AND triggered=? AND end_time BETWEEN ? AND ?'
     try:
-        cur = settings.DATABASE.cursor()
-        current_time = utils.utcnow().replace(microsecond=0)
-        end_time = current_time + timedelta(seconds=15)
-        current_time_str = current_time.isoformat(sep=' ')
-        end_time_str = end_time.isoformat(sep=' ')
+        current_time = mappers.to_timestamp(utils.utcnow())
         triggered = False
         if user_id is None:
-            cur.execute(sql, (triggered, current_time_str, end_time_str))
+            cur = await gateway.read(sql, (triggered, current_time - REMINDER_EXPIRY, current_time))
         else:
-            cur.execute(sql, (user_id, triggered, current_time_str, end_time_str))
+            cur = await gateway.read(sql, (user_id, triggered, current_time - REMINDER_EXPIRY, current_time))
         records = cur.fetchall()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -299,12 +361,9 @@ async def get_due_reminders(user_id: Optional[int] = None) -> Tuple[Reminder]:
         error_message = 'No due reminders found in database.'
         if user_id is not None: error_message = f'{error_message} User: {user_id}'
         raise exceptions.NoDataFoundError(error_message)
-    reminders = []
-    for record in records:
-        reminder = await _dict_to_reminder(dict(record))
-        reminders.append(reminder)
+    reminders = await _rows_to_reminders(cur.description, records)
 
-    return tuple(reminders)
+    return reminders
 
 
 async def get_old_reminders(user_id: Optional[int] = None) -> Tuple[Reminder]:
@@ -329,11 +388,9 @@ async def get_old_reminders(user_id: Optional[int] = None) -> Tuple[Reminder]:
     else:
         sql = f'SELECT * FROM {table} WHERE user_id=? AND end_time < ?'
     try:
-        cur = settings.DATABASE.cursor()
-        current_time = utils.utcnow().replace(microsecond=0)
-        end_time  = current_time - timedelta(seconds=20)
-        end_time_str = end_time.isoformat(sep=' ')
-        cur.execute(sql, (end_time_str,)) if user_id is None else cur.execute(sql, (user_id, end_time_str))
+        end_time = mappers.to_timestamp(utils.utcnow()) - REMINDER_EXPIRY
+        parameters = (end_time,) if user_id is None else (user_id, end_time)
+        cur = await gateway.read(sql, parameters)
         records = cur.fetchall()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -345,18 +402,48 @@ async def get_old_reminders(user_id: Optional[int] = None) -> Tuple[Reminder]:
         error_message = 'No old reminders found in database.'
         if user_id is not None: error_message = f'{error_message} User: {user_id}'
         raise exceptions.NoDataFoundError(error_message)
-    reminders = []
-    for record in records:
-        reminder = await _dict_to_reminder(dict(record))
-        reminders.append(reminder)
+    reminders = await _rows_to_reminders(cur.description, records)
 
-    return tuple(reminders)
+    return reminders
 
 
 # Write Data
+async def claim_due_reminders() -> Tuple[Reminder]:
+    """Marks all reminders that are due and didn't fire yet as triggered and returns them. This happens in one
+    statement, so every reminder is only claimed once. Reminders that expired more than REMINDER_EXPIRY seconds ago
+    are ignored.
+
+    Returns
+    -------
+    Tuple[Reminder] with the claimed reminders
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    exceptions.NoDataFoundError if no reminder is due.
+    Also logs all errors to the database.
+    """
+    table = 'reminders'
+    function_name = 'claim_due_reminders'
+    sql = f'UPDATE {table} SET triggered = ? WHERE triggered = ? AND end_time BETWEEN ? AND ? RETURNING *'
+    current_time = mappers.to_timestamp(utils.utcnow())
+    try:
+        cur = await gateway.execute(sql, (True, False, current_time - REMINDER_EXPIRY, current_time))
+        records = cur.fetchall()
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+    if not records:
+        raise exceptions.NoDataFoundError('No due reminders found in database.')
+    reminders = await _rows_to_reminders(cur.description, records)
+
+    return reminders
+
+
 async def _delete_reminder(reminder: Reminder) -> None:
     """Deletes reminder record. Use Reminder.delete() to trigger this function.
-    Also cancels and deletes an active task for this reminder.
 
     Raises
     ------
@@ -369,19 +456,54 @@ async def _delete_reminder(reminder: Reminder) -> None:
     sql = f'DELETE FROM {table} WHERE user_id=? AND activity=?'
     if reminder.activity == 'custom': sql = f'{sql} AND custom_id=?'
     try:
-        cur = settings.DATABASE.cursor()
         if reminder.activity == 'custom':
-            cur.execute(sql, (reminder.user_id, reminder.activity, reminder.custom_id))
+            await gateway.execute(sql, (reminder.user_id, reminder.activity, reminder.custom_id))
         else:
-            cur.execute(sql, (reminder.user_id, reminder.activity))
+            await gateway.execute(sql, (reminder.user_id, reminder.activity))
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+
+
+async def delete_old_reminders() -> int:
+    """Deletes all reminders that expired more than REMINDER_EXPIRY seconds ago with one statement.
+    If VERIFY_DATABASE_UPDATES is on, every deleted reminder is read again afterwards and an error is logged if it
+    still exists.
+
+    Returns
+    -------
+    Amount of deleted reminders: int
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    Also logs all errors to the database.
+    """
+    table = 'reminders'
+    function_name = 'delete_old_reminders'
+    sql = f'DELETE FROM {table} WHERE end_time < ? RETURNING user_id, activity, custom_id'
+    try:
+        cur = await gateway.execute(sql, (mappers.to_timestamp(utils.utcnow()) - REMINDER_EXPIRY,))
+        records = cur.fetchall()
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    if settings.VERIFY_DATABASE_UPDATES:
+        for user_id, activity, custom_id in records:
+            try:
+                reminder = await get_reminder(user_id, activity, custom_id)
+            except exceptions.NoDataFoundError:
+                continue
+            await errors.log_error(f'Reminder got deleted but record still exists.\n{reminder}')
+
+    return len(records)
 
 
-async def _update_reminder(reminder: Reminder, **kwargs) -> None:
+async def _update_reminder(reminder: Reminder, **kwargs) -> int:
     """Updates reminder record. Use Reminder.update() to trigger this function.
 
     Arguments
@@ -397,6 +519,10 @@ async def _update_reminder(reminder: Reminder, **kwargs) -> None:
         triggered: bool
         user_id: int
 
+    Returns
+    -------
+    Amount of updated records: int
+
     Raises
     ------
     sqlite3.Error if something happened within the database.
@@ -410,13 +536,10 @@ async def _update_reminder(reminder: Reminder, **kwargs) -> None:
             strings.INTERNAL_ERROR_NO_ARGUMENTS.format(table=table, function=function_name)
         )
         raise exceptions.NoArgumentsError('You need to specify at least one keyword argument.')
-    current_time = utils.utcnow().replace(microsecond=0)
-    end_time = kwargs['end_time'] if 'end_time' in kwargs else reminder.end_time
-    time_left = end_time - current_time
-    triggered = False if time_left.total_seconds() > 15 else True
-    if 'triggered' not in kwargs: kwargs['triggered'] = triggered
+    if 'end_time' in kwargs:
+        if 'triggered' not in kwargs: kwargs['triggered'] = False
+        kwargs['end_time'] = mappers.to_timestamp(kwargs['end_time'])
     try:
-        cur = settings.DATABASE.cursor()
         sql = f'UPDATE {table} SET'
         for kwarg in kwargs:
             sql = f'{sql} {kwarg} = :{kwarg},'
@@ -428,13 +551,15 @@ async def _update_reminder(reminder: Reminder, **kwargs) -> None:
         if reminder.activity == 'custom':
             kwargs['custom_id_old'] = reminder.custom_id
             sql = f'{sql} AND custom_id = :custom_id_old'
-        cur.execute(sql, kwargs)
+        cur = await gateway.execute(sql, kwargs)
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
-    if triggered: scheduled_for_tasks[reminder.task_name] = reminder
+    if 'end_time' in kwargs and not kwargs['triggered']: _schedule_reminder_time(kwargs['end_time'])
+
+    return cur.rowcount
 
 
 async def insert_reminder(user_id: int, activity: str, time_left: timedelta,
@@ -442,7 +567,7 @@ async def insert_reminder(user_id: int, activity: str, time_left: timedelta,
     """Inserts a reminder record.
     This function first checks if a reminder exists. If yes, the existing reminder will be updated instead and
     no new record is inserted.
-    If end_time is less than 16 seconds in the future, this also creates a background task.
+    The reminder is added to the reminder schedule.
 
     Arguments
     ---------
@@ -462,12 +587,10 @@ async def insert_reminder(user_id: int, activity: str, time_left: timedelta,
     current_time = utils.utcnow().replace(microsecond=0)
     end_time = current_time + time_left
     custom_id = None
-    triggered = False if time_left.total_seconds() > 15 else True
     try:
-        cur = settings.DATABASE.cursor()
         if activity == 'custom':
             sql = f'SELECT custom_id FROM {table} WHERE user_id = ? AND activity = ? ORDER BY custom_id ASC'
-            cur.execute(sql, (user_id, 'custom',))
+            cur = await gateway.read(sql, (user_id, 'custom',))
             record_custom_reminders = cur.fetchall()
             if not record_custom_reminders:
                 custom_id = 1
@@ -509,26 +632,22 @@ async def insert_reminder(user_id: int, activity: str, time_left: timedelta,
             f'VALUES (?, ?, ?, ?, ?, ?, ?)'
         )
         try:
-            cur.execute(sql, (user_id, activity, end_time, channel_id, message, custom_id, triggered))
+            await gateway.execute(
+                sql, (user_id, activity, mappers.to_timestamp(end_time), channel_id, message, custom_id, False)
+            )
         except sqlite3.Error as error:
             await errors.log_error(
                 strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
             )
             raise
         reminder = await get_reminder(user_id, activity, custom_id)
-
-    # Create background task if necessary
-    if triggered:
-        scheduled_for_tasks[reminder.task_name] = reminder
-    else:
-        scheduled_for_deletion[reminder.task_name] = reminder
+        _schedule_reminder_time(mappers.to_timestamp(reminder.end_time))
 
     return reminder
 
 
 async def reduce_reminder_time(user_settings, time_reduction: timedelta, activities: list[str]) -> None:
     """Reduces the end time of all user reminders affected by sleepy potions of one user by a certain amount.
-    If the new end time is within the next 15 seconds, the reminder is immediately scheduled.
     If the new end time is in the past, the reminder is deleted.
 
     Arguments
@@ -553,19 +672,14 @@ async def reduce_reminder_time(user_settings, time_reduction: timedelta, activit
         new_end_time = reminder.end_time - time_reduction
         time_left = new_end_time - current_time
         if time_left.total_seconds() <= 0:
-            scheduled_for_deletion[reminder.task_name] = reminder
             await reminder.delete()
-        elif 1 <= time_left.total_seconds() <= 15:
-            await reminder.update(end_time=new_end_time, triggered=True, message=reminder_message)
-            scheduled_for_tasks[reminder.task_name] = reminder
         else:
             await reminder.update(end_time=new_end_time, message=reminder_message)
 
 
 async def reduce_reminder_time_percentage(user_settings, percentage: float, activities: list[str]) -> None:
     """Reduces the end time of user reminders by a certain percentage of the cooldown.
-    If the new end time is within the next 15 seconds, the reminder is immediately scheduled.
-    If the new end time is in the past, the reminder is deleted.
+    If the new end time is in the past, the reminder fires right away.
     Note that the percentage is calculated based on the full cooldown.
 
     Arguments
@@ -581,23 +695,11 @@ async def reduce_reminder_time_percentage(user_settings, percentage: float, acti
         return
     for reminder in reminders:
         if reminder.activity not in activities: continue
-        cooldown = await cooldowns.get_cooldown(reminder.activity)
-        if cooldown.donor_affected:
-            cooldown_seconds = (cooldown.actual_cooldown_mention()
-                                * settings.DONOR_TIERS_MULTIPLIERS[user_settings.donor_tier])
-        else:
-            cooldown_seconds = cooldown.actual_cooldown_mention()
+        cooldown_seconds = await cooldowns.get_actual_cooldown(reminder.activity, user_settings.donor_tier,
+                                                               slash_command=False)
         time_left = reminder.end_time - current_time
         time_left_new_seconds = time_left.total_seconds() - (cooldown_seconds * ((percentage) / 100))
         time_left_new = timedelta(seconds=time_left_new_seconds)
         new_end_time = current_time + time_left_new
-        if time_left_new_seconds <= 0:
-            reminder.end_time = current_time + timedelta(seconds=1)
-            scheduled_for_tasks[reminder.task_name] = reminder
-            scheduled_for_deletion[reminder.task_name] = reminder
-            await reminder.delete()
-        elif 1 <= time_left.total_seconds() <= 15:
-            await reminder.update(end_time=new_end_time, triggered=True)
-            scheduled_for_tasks[reminder.task_name] = reminder
-        else:
-            await reminder.update(end_time=new_end_time)
\ No newline at end of file
+        if time_left_new_seconds <= 0: new_end_time = current_time
+        await reminder.update(end_time=new_end_time)
\ No newline at end of file
@@ -1,20 +1,48 @@
 # tracking.py
-"""Provides access to the table "tracking_log" in the database"""
+"""Provides access to the table "tracking_log" in the database
 
+Single log entries are not inserted right away but collected and written in one transaction every
+TRACKING_FLUSH_INTERVAL seconds or as soon as TRACKING_FLUSH_ROWS entries are waiting. All functions that read or
+change log entries write the waiting entries first, so they always see every inserted entry.
 
+The tables "tracking_log_hourly" and "tracking_log_daily" contain the sums of all log entries per user, guild,
+command and hour or day (UTC). They are kept up to date by triggers on "tracking_log" (see migrations.py), so every
+change to the log changes them in the same transaction. Reports add up these sums and only read single log entries for the part of the
+timeframe that doesn't fill a whole hour. Hourly sums older than ROLLUP_HOURLY_DAYS days are deleted, because the log
+entries of these days are consolidated into daily summaries anyway.
+
+All times are stored as epoch seconds (UTC), so hours and days are simple integer ranges (see mappers.to_timestamp()).
+"""
+
+
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import sqlite3
-from typing import NamedTuple, Optional, Tuple
+from typing import Awaitable, Callable, List, NamedTuple, Optional, Sequence, Set, Tuple
 
 from discord import utils
 
-from database import errors
+from database import errors, gateway, mappers
 from resources import exceptions, settings, strings
 
 
+TRACKING_FLUSH_INTERVAL = 0.5 # Seconds
+TRACKING_FLUSH_ROWS = 200
+CONSOLIDATION_CHUNK_USERS = 500
+ROLLUP_HOURLY_DAYS = 28 # Needs to be the same amount of days the log entries are consolidated after
+
+_HOUR = 3_600 # Seconds
+_DAY = 86_400 # Seconds
+
+_PENDING_LOG_ENTRIES: List[tuple] = [] # Parameters of the log entries that are not written yet
+_FLUSH_LOCK = asyncio.Lock()
+_FLUSH_HANDLE: Optional[asyncio.TimerHandle] = None
+_FLUSH_TASKS: Set[asyncio.Task] = set()
+
+
 # Containers
-@dataclass()
+@dataclass(slots=True)
 class LogEntry():
     """Object that represents a record from table "tracking_log"."""
     amount: int
@@ -57,7 +85,9 @@ class LogEntry():
         self.user_id = new_settings.user_id
 
     async def update(self, **kwargs) -> None:
-        """Updates the log entry record in the database. Also calls refresh().
+        """Updates the log entry record in the database.
+        If exactly one record was updated, the changes are applied to this object directly. Otherwise refresh() is
+        called.
 
         Arguments
         ---------
@@ -68,8 +98,16 @@ class LogEntry():
             entry_type: Literal['single', 'summary']
             guild_id: int
         """
-        await _update_log_entry(self, **kwargs)
-        await self.refresh()
+        updated_rows = await _update_log_entry(self, **kwargs)
+        if updated_rows != 1:
+            await self.refresh()
+            return
+        if 'date_time' in kwargs:
+            # Stored in whole seconds, so the object keeps the value the database has
+            kwargs['date_time'] = mappers.from_timestamp(mappers.to_timestamp(kwargs['date_time']))
+        for column, value in kwargs.items():
+            setattr(self, 'entry_type' if column == 'type' else column, value)
+        if settings.VERIFY_DATABASE_UPDATES: await errors.verify_local_update(self, 'tracking_log', 'LogEntry.update')
 
 class LogReport(NamedTuple):
     """Object that represents a report based on a certain amount of log entries."""
@@ -88,39 +126,88 @@ class LogReport(NamedTuple):
     user_id: int
 
 
+class ConsolidationProgress(NamedTuple):
+    """Object that represents the progress of a consolidation."""
+    users_done: int
+    users_total: int
+    log_entries_consolidated: int # Single log entries that were merged into summaries
+    summaries_written: int # Summaries that were created or increased
+
+
 # Miscellaneous functions
-async def _dict_to_log_entry(record: dict) -> LogEntry:
-    """Creates a LogEntry object from a database record
+_LOG_ENTRY_MAPPER = mappers.RowMapper(LogEntry, (
+    mappers.Column('amount'),
+    mappers.Column('command_or_drop'),
+    mappers.Column('date_time', convert=mappers.from_timestamp),
+    mappers.Column('entry_type', ('type',)),
+    mappers.Column('guild_id'),
+    mappers.Column('user_id'),
+))
+
+
+def _get_report_ranges(timeframe: timedelta, current_time: int) -> dict:
+    """Splits a timeframe that ends at current_time (epoch seconds) into the ranges that are read from the log and the
+    rollup tables. All ranges are returned as epoch seconds.
+
+    - log: From the start of the timeframe to the next full hour. If the start is older than ROLLUP_HOURLY_DAYS days,
+    hourly sums don't exist anymore, so the range goes to the next full day instead. Log entries of these days are
+    consolidated, so this range only contains a few summaries.
+    - hourly_head: From the end of the log range to the next full day, if that is before today.
+    - daily: All full days between the start and today.
+    - hourly_tail: From today (or from the end of the log range if the timeframe started today) until now.
+    """
+    today = current_time - current_time % _DAY
+    hourly_start = today - ROLLUP_HOURLY_DAYS * _DAY
+    start = current_time - int(timeframe.total_seconds())
+    next_hour = -(-start // _HOUR) * _HOUR
+    next_day = -(-start // _DAY) * _DAY
+    log_end = next_hour if start >= hourly_start else next_day
+    return {
+        'log_start': start,
+        'log_end': log_end,
+        'hourly_head_start': log_end,
+        'hourly_head_end': min(next_day, today),
+        'daily_start': next_day,
+        'daily_end': today,
+        'hourly_tail_start': max(today, log_end),
+    }
+
+
+def _merge_ranges(ranges: List[tuple]) -> List[tuple]:
+    """Merges overlapping ranges (start, end), so every value is only in one range. End is excluded. An end of None
+    means the range is open. Empty ranges are removed."""
+    merged_ranges = []
+    for start, end in sorted(ranges, key=lambda time_range: time_range[0]):
+        if end is not None and end <= start: continue
+        if merged_ranges and (merged_ranges[-1][1] is None or start <= merged_ranges[-1][1]):
+            last_start, last_end = merged_ranges[-1]
+            merged_ranges[-1] = (last_start, None if last_end is None or end is None else max(last_end, end))
+        else:
+            merged_ranges.append((start, end))
+    return merged_ranges
+
+
+async def _rows_to_log_entries(description: Tuple[tuple], records: List[sqlite3.Row]) -> Tuple[LogEntry]:
+    """Creates LogEntry objects from database records, see mappers.RowMapper.
 
     Arguments
     ---------
-    record: Database record from table "tracking_log" as a dict.
+    description: The description of the cursor that returned the records.
+    records: Database records from table "tracking_log".
 
     Returns
     -------
-    LogEntry object.
+    Tuple with LogEntry objects in the same order as the records.
 
     Raises
     ------
-    LookupError if something goes wrong reading the dict. Also logs this error to the database.
+    LookupError if something goes wrong reading a record. Also logs this error to the database.
     """
-    function_name = '_dict_to_log_entry'
     try:
-        log_entry = LogEntry(
-            amount = record['amount'],
-            command_or_drop = record['command_or_drop'],
-            date_time = datetime.fromisoformat(record['date_time']),
-            entry_type = record['type'],
-            guild_id = record['guild_id'],
-            user_id = record['user_id'],
-        )
-    except Exception as error:
-        await errors.log_error(
-            strings.INTERNAL_ERROR_DICT_TO_OBJECT.format(function=function_name, record=record)
-        )
-        raise LookupError(error)
-
-    return log_entry
+        return _LOG_ENTRY_MAPPER.map_rows(description, records)
+    except LookupError as error:
+        await errors.log_error(str(error))
+        raise
 
 
 # Read Data
@@ -142,10 +229,12 @@ async def get_log_entry(user_id: int, guild_id: int, command_or_drop: str, date_
     """
     table = 'tracking_log'
     function_name = 'get_log_entry'
+    await flush_log_entries()
     sql = f'SELECT * FROM {table} WHERE user_id=? AND guild_id=? AND command_or_drop=? AND date_time=? AND type=?'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (user_id, guild_id, command_or_drop, date_time, entry_type))
+        cur = await gateway.read(
+            sql, (user_id, guild_id, command_or_drop, mappers.to_timestamp(date_time), entry_type)
+        )
         record = cur.fetchone()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -157,7 +246,7 @@ async def get_log_entry(user_id: int, guild_id: int, command_or_drop: str, date_
             f'No log data found in database for user "{user_id}", command_or_drop "{command_or_drop}" '
             f'and time "{str(datetime)}".'
         )
-    log_entry = await _dict_to_log_entry(dict(record))
+    log_entry = (await _rows_to_log_entries(cur.description, (record,)))[0]
 
     return log_entry
 
@@ -187,17 +276,17 @@ async def get_log_entries(user_id: int, command_or_drop: str, timeframe: timedel
     """
     table = 'tracking_log'
     function_name = 'get_log_entries'
+    await flush_log_entries()
     sql = (
         f'SELECT * FROM {table} WHERE user_id=? AND date_time>=? AND command_or_drop=?'
     )
-    date_time = utils.utcnow() - timeframe
+    date_time = mappers.to_timestamp(utils.utcnow() - timeframe)
     if guild_id is not None: sql = f'{sql} AND guild_id=?'
     try:
-        cur = settings.DATABASE.cursor()
         if guild_id is None:
-            cur.execute(sql, (user_id, date_time, command_or_drop))
+            cur = await gateway.read(sql, (user_id, date_time, command_or_drop))
         else:
-            cur.execute(sql, (user_id, date_time, command_or_drop, guild_id))
+            cur = await gateway.read(sql, (user_id, date_time, command_or_drop, guild_id))
         records = cur.fetchall()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -208,12 +297,9 @@ async def get_log_entries(user_id: int, command_or_drop: str, timeframe: timedel
         error_message = f'No log data found in database for timeframe "{str(timeframe)}".'
         if guild_id is not None: error_message = f'{error_message} Guild: {guild_id}'
         raise exceptions.NoDataFoundError(error_message)
-    log_entries = []
-    for record in records:
-        log_entry = await _dict_to_log_entry(dict(record))
-        log_entries.append(log_entry)
+    log_entries = await _rows_to_log_entries(cur.description, records)
 
-    return tuple(log_entries)
+    return log_entries
 
 
 async def get_all_log_entries(user_id: int) -> Tuple[LogEntry]:
@@ -236,12 +322,12 @@ async def get_all_log_entries(user_id: int) -> Tuple[LogEntry]:
     """
     table = 'tracking_log'
     function_name = 'get_all_log_entries'
+    await flush_log_entries()
     sql = (
         f'SELECT * FROM {table} WHERE user_id=?'
     )
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (user_id,))
+        cur = await gateway.read(sql, (user_id,))
         records = cur.fetchall()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -251,12 +337,9 @@ async def get_all_log_entries(user_id: int) -> Tuple[LogEntry]:
     if not records:
         error_message = f'No log data found in database for user {user_id}".'
         raise exceptions.NoDataFoundError(error_message)
-    log_entries = []
-    for record in records:
-        log_entry = await _dict_to_log_entry(dict(record))
-        log_entries.append(log_entry)
+    log_entries = await _rows_to_log_entries(cur.description, records)
 
-    return tuple(log_entries)
+    return log_entries
 
 
 async def get_old_log_entries(days: int) -> Tuple[LogEntry]:
@@ -281,14 +364,14 @@ async def get_old_log_entries(days: int) -> Tuple[LogEntry]:
     """
     table = 'tracking_log'
     function_name = 'get_old_log_entries'
+    await flush_log_entries()
     sql = (
         f'SELECT * FROM {table} WHERE date_time<? AND type=?'
     )
-    date_time = utils.utcnow() - timedelta(days=days)
-    date_time = date_time.replace(hour=0, minute=0, second=0)
+    date_time = mappers.to_timestamp(utils.utcnow() - timedelta(days=days))
+    date_time -= date_time % _DAY
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (date_time, 'single'))
+        cur = await gateway.read(sql, (date_time, 'single'))
         records = cur.fetchall()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -298,23 +381,49 @@ async def get_old_log_entries(days: int) -> Tuple[LogEntry]:
     if not records:
         error_message = f'No log data found in database older than {days} days".'
         raise exceptions.NoDataFoundError(error_message)
-    log_entries = []
-    for record in records:
-        log_entry = await _dict_to_log_entry(dict(record))
-        log_entries.append(log_entry)
+    log_entries = await _rows_to_log_entries(cur.description, records)
 
-    return tuple(log_entries)
+    return log_entries
 
 
 async def get_log_report(user_id: int, timeframe: timedelta,
                          guild_id: Optional[int] = None) -> LogReport:
     """Gets a summary log report for one command for a certain amount of time from a user id.
     If the guild_id is specified, the report is limited to that guild.
+    If you need reports for more than one timeframe, use get_log_report_windows().
 
     Returns
     -------
     LogReport object
 
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    LookupError if something goes wrong reading the dict.
+    Also logs all errors to the database.
+    """
+    log_reports = await get_log_report_windows(user_id, (timeframe,), guild_id)
+
+    return log_reports[0]
+
+
+async def get_log_report_windows(user_id: int, windows: Sequence[timedelta],
+                                 guild_id: Optional[int] = None) -> List[LogReport]:
+    """Gets summary log reports for several timeframes from a user id in one statement.
+    If the guild_id is specified, the reports are limited to that guild.
+    The reports are built from the rollup tables, see _get_report_ranges(), so their cost doesn't grow with the
+    timeframes. Every log entry and sum is read only once and added to all timeframes it belongs to.
+
+    Arguments
+    ---------
+    user_id: int
+    windows: timedelta objects with the amounts of time that should be covered, all ending now
+    guild_id: Optional[int]
+
+    Returns
+    -------
+    List of LogReport objects in the same order as the windows.
+
     Raises
     ------
     sqlite3.Error if something happened within the database.
@@ -322,54 +431,90 @@ async def get_log_report(user_id: int, timeframe: timedelta,
     Also logs all errors to the database.
     """
     table = 'tracking_log'
-    function_name = 'get_log_report'
-    sql = f'SELECT command_or_drop, SUM(amount) FROM {table} WHERE user_id=? AND date_time>=?'
-    date_time = datetime.utcnow() - timeframe
-    if guild_id is not None: sql = f'{sql} AND guild_id=?'
-    sql = f'{sql} GROUP BY command_or_drop'
+    function_name = 'get_log_report_windows'
+    await flush_log_entries()
+    current_time = mappers.to_timestamp(utils.utcnow())
+    parameters = {'user_id': user_id, 'guild_id': guild_id}
+    sql_guild = '' if guild_id is None else ' AND guild_id = :guild_id'
+    source_ranges = {'log': [], 'hourly': [], 'daily': []}
+    sql_windows = []
+    for index, timeframe in enumerate(windows):
+        ranges = _get_report_ranges(timeframe, current_time)
+        for name, value in ranges.items():
+            parameters[f'{name}_{index}'] = value
+        source_ranges['log'].append((ranges['log_start'], ranges['log_end']))
+        source_ranges['hourly'].append((ranges['hourly_head_start'], ranges['hourly_head_end']))
+        source_ranges['hourly'].append((ranges['hourly_tail_start'], None))
+        source_ranges['daily'].append((ranges['daily_start'], ranges['daily_end']))
+        sql_windows.append(
+            f'SUM(CASE WHEN source = 0 AND time_key >= :log_start_{index} AND time_key < :log_end_{index} '
+            f'THEN amount WHEN source = 1 AND time_key >= :hourly_head_start_{index} '
+            f'AND time_key < :hourly_head_end_{index} THEN amount '
+            f'WHEN source = 1 AND time_key >= :hourly_tail_start_{index} THEN amount '
+            f'WHEN source = 2 AND time_key >= :daily_start_{index} AND time_key < :daily_end_{index} THEN amount '
+            f'ELSE 0 END)'
+        )
+    sql_sources = []
+    for source, (source_name, source_table, time_key) in enumerate((('log', table, 'date_time'),
+                                                                    ('hourly', 'tracking_log_hourly', 'hour'),
+                                                                    ('daily', 'tracking_log_daily', 'day'))):
+        conditions = []
+        for index, (start, end) in enumerate(_merge_ranges(source_ranges[source_name])):
+            parameters[f'{source_name}_range_start_{index}'] = start
+            condition = f'user_id = :user_id{sql_guild} AND {time_key} >= :{source_name}_range_start_{index}'
+            if end is not None:
+                parameters[f'{source_name}_range_end_{index}'] = end
+                condition = f'{condition} AND {time_key} < :{source_name}_range_end_{index}'
+            conditions.append(f'({condition})')
+        if not conditions: continue
+        sql_sources.append(
+            f'SELECT {source} AS source, {time_key} AS time_key, command_or_drop, amount FROM {source_table} '
+            f'WHERE {" OR ".join(conditions)}'
+        )
+    sql_sources = ' UNION ALL '.join(sql_sources)
+    sql = f'SELECT command_or_drop, {", ".join(sql_windows)} FROM ({sql_sources}) GROUP BY command_or_drop'
     try:
-        cur = settings.DATABASE.cursor()
-        if guild_id is None:
-            cur.execute(sql, (user_id, date_time))
-        else:
-            cur.execute(sql, (user_id, date_time, guild_id))
+        cur = await gateway.read(sql, parameters)
         records = cur.fetchall()
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
-    records_data = {
-        'bee-bread': 0,
-        'captcha': 0,
-        'clean': 0,
-        'copper-nugget': 0,
-        'diamond-nugget': 0,
-        'golden-nugget': 0,
-        'royal-jelly': 0,
-        'silver-nugget': 0,
-        'wooden-nugget': 0,
-        'prune': 0,
-    }
-    for record in records:
-        record = dict(record)
-        records_data[record['command_or_drop']] = record['SUM(amount)']
-    log_report = LogReport(
-        bee_bread_amount = records_data['bee-bread'],
-        captcha_amount = records_data['captcha'],
-        clean_amount = records_data['clean'],
-        nugget_copper_amount = records_data['copper-nugget'],
-        nugget_diamond_amount = records_data['diamond-nugget'],
-        nugget_golden_amount = records_data['golden-nugget'],
-        nugget_silver_amount = records_data['silver-nugget'],
-        nugget_wooden_amount = records_data['wooden-nugget'],
-        prune_amount = records_data['prune'],
-        royal_jelly_amount = records_data['royal-jelly'],
-        guild_id = guild_id,
-        timeframe = timeframe,
-        user_id = user_id
-    )
-    return log_report
+    log_reports = []
+    for index, timeframe in enumerate(windows):
+        records_data = {
+            'bee-bread': 0,
+            'captcha': 0,
+            'clean': 0,
+            'copper-nugget': 0,
+            'diamond-nugget': 0,
+            'golden-nugget': 0,
+            'royal-jelly': 0,
+            'silver-nugget': 0,
+            'wooden-nugget': 0,
+            'prune': 0,
+        }
+        for record in records:
+            records_data[record['command_or_drop']] = record[index + 1]
+        log_reports.append(
+            LogReport(
+                bee_bread_amount = records_data['bee-bread'],
+                captcha_amount = records_data['captcha'],
+                clean_amount = records_data['clean'],
+                nugget_copper_amount = records_data['copper-nugget'],
+                nugget_diamond_amount = records_data['diamond-nugget'],
+                nugget_golden_amount = records_data['golden-nugget'],
+                nugget_silver_amount = records_data['silver-nugget'],
+                nugget_wooden_amount = records_data['wooden-nugget'],
+                prune_amount = records_data['prune'],
+                royal_jelly_amount = records_data['royal-jelly'],
+                guild_id = guild_id,
+                timeframe = timeframe,
+                user_id = user_id
+            )
+        )
+    return log_reports
 
 
 # Write Data
@@ -384,11 +529,12 @@ async def _delete_log_entry(log_entry: LogEntry) -> None:
     """
     table = 'tracking_log'
     function_name = '_delete_log_entry'
+    await flush_log_entries()
     sql = f'DELETE FROM {table} WHERE user_id=? AND guild_id=? AND command_or_drop=? AND date_time=? AND type=?'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (log_entry.user_id, log_entry.guild_id, log_entry.command_or_drop, log_entry.date_time,
-                          log_entry.entry_type))
+        await gateway.execute(sql, (log_entry.user_id, log_entry.guild_id, log_entry.command_or_drop,
+                              mappers.to_timestamp(log_entry.date_time),
+                              log_entry.entry_type))
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
@@ -396,7 +542,7 @@ async def _delete_log_entry(log_entry: LogEntry) -> None:
         raise
 
 
-async def _update_log_entry(log_entry: LogEntry, **kwargs) -> None:
+async def _update_log_entry(log_entry: LogEntry, **kwargs) -> int:
     """Updates tracking_log record. Use LogEntry.update() to trigger this function.
 
     Arguments
@@ -410,6 +556,10 @@ async def _update_log_entry(log_entry: LogEntry, **kwargs) -> None:
         guild_id: int
         user_id: int
 
+    Returns
+    -------
+    Amount of updated records: int
+
     Raises
     ------
     sqlite3.Error if something happened within the database.
@@ -418,36 +568,40 @@ async def _update_log_entry(log_entry: LogEntry, **kwargs) -> None:
     """
     table = 'tracking_log'
     function_name = '_update_log_entry'
+    await flush_log_entries()
     if not kwargs:
         await errors.log_error(
             strings.INTERNAL_ERROR_NO_ARGUMENTS.format(table=table, function=function_name)
         )
         raise exceptions.NoArgumentsError('You need to specify at least one keyword argument.')
     try:
-        cur = settings.DATABASE.cursor()
         sql = f'UPDATE {table} SET'
         for kwarg in kwargs:
             sql = f'{sql} {kwarg} = :{kwarg},'
         sql = sql.strip(",")
+        if 'date_time' in kwargs: kwargs['date_time'] = mappers.to_timestamp(kwargs['date_time'])
         kwargs['user_id_old'] = log_entry.user_id
         kwargs['command_or_drop_old'] = log_entry.command_or_drop
-        kwargs['date_time_old'] = log_entry.date_time
+        kwargs['date_time_old'] = mappers.to_timestamp(log_entry.date_time)
         kwargs['entry_type_old'] = log_entry.entry_type
         sql = (
             f'{sql} WHERE user_id = :user_id_old AND type = :entry_type_old AND command_or_drop = :command_or_drop_old '
             f'AND date_time = :date_time_old'
         )
-        cur.execute(sql, kwargs)
+        cur = await gateway.execute(sql, kwargs)
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
 
+    return cur.rowcount
+
 
 async def insert_log_entry(user_id: int, guild_id: int,
                            command_or_drop: str, date_time: datetime, amount: Optional[int] = 1) -> LogEntry:
     """Inserts a single record to the table "tracking_log".
+    The record is written with the next flush, see flush_log_entries().
 
     Returns
     -------
@@ -455,25 +609,117 @@ async def insert_log_entry(user_id: int, guild_id: int,
 
     Raises
     ------
-    sqlite3.Error if something happened within the database.
+    sqlite3.Error if something happened within the database while this call triggered a flush.
     Also logs all errors to the database.
     """
-    function_name = 'insert_log_entry'
-    table = 'tracking_log'
-    sql = (
-        f'INSERT INTO {table} (user_id, guild_id, command_or_drop, amount, date_time) VALUES (?, ?, ?, ?, ?)'
+    _PENDING_LOG_ENTRIES.append((user_id, guild_id, command_or_drop, amount, mappers.to_timestamp(date_time)))
+    if len(_PENDING_LOG_ENTRIES) >= TRACKING_FLUSH_ROWS:
+        await flush_log_entries()
+    else:
+        await _schedule_flush()
+
+    return LogEntry(
+        amount = amount,
+        command_or_drop = command_or_drop,
+        date_time = date_time,
+        entry_type = 'single',
+        guild_id = guild_id,
+        user_id = user_id,
     )
+
+
+async def flush_log_entries() -> int:
+    """Writes all log entries that are waiting to be inserted in one transaction.
+    Waits for a flush that is already running, so all entries inserted before this call are written when it returns.
+    On shutdown, use flush_log_entries_on_shutdown() instead.
+
+    Returns
+    -------
+    Amount of written log entries: int
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. The entries of this flush are not written in that case.
+    Also logs all errors to the database.
+    """
+    _cancel_scheduled_flush()
+    async with _FLUSH_LOCK:
+        return await _write_pending_log_entries()
+
+
+def flush_log_entries_on_shutdown() -> int:
+    """Writes all log entries that are waiting to be inserted after the event loop of the bot stopped.
+    A flush that was still running when the loop stopped never releases _FLUSH_LOCK, so this doesn't wait for it and
+    writes the entries in a new event loop instead.
+
+    Returns
+    -------
+    Amount of written log entries: int
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. The entries are not written in that case.
+    Also logs all errors to the database.
+    """
+    _cancel_scheduled_flush()
+    return asyncio.run(_write_pending_log_entries())
+
+
+def _cancel_scheduled_flush() -> None:
+    """Cancels the scheduled flush if there is one."""
+    global _FLUSH_HANDLE
+    if _FLUSH_HANDLE is not None:
+        _FLUSH_HANDLE.cancel()
+        _FLUSH_HANDLE = None
+
+
+async def _write_pending_log_entries() -> int:
+    """Writes all log entries that are waiting to be inserted in one transaction. Use flush_log_entries() to trigger
+    this function."""
+    if not _PENDING_LOG_ENTRIES: return 0
+    function_name = 'flush_log_entries'
+    table = 'tracking_log'
+    sql = f'INSERT INTO {table} (user_id, guild_id, command_or_drop, amount, date_time) VALUES (?, ?, ?, ?, ?)'
+    log_entries = _PENDING_LOG_ENTRIES.copy()
+    _PENDING_LOG_ENTRIES.clear()
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (user_id, guild_id, command_or_drop, amount, date_time))
+        await gateway.execute_many(sql, log_entries)
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
-    log_entry = await get_log_entry(user_id, guild_id, command_or_drop, date_time)
 
-    return log_entry
+    return len(log_entries)
+
+
+async def _schedule_flush() -> None:
+    """Schedules a flush in TRACKING_FLUSH_INTERVAL seconds if none is scheduled yet.
+    Flushes right away if no event loop is running."""
+    global _FLUSH_HANDLE
+    if _FLUSH_HANDLE is not None: return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        await flush_log_entries()
+        return
+    _FLUSH_HANDLE = loop.call_later(TRACKING_FLUSH_INTERVAL, _start_scheduled_flush)
+
+
+def _start_scheduled_flush() -> None:
+    """Starts the scheduled flush. Called by the event loop."""
+    global _FLUSH_HANDLE
+    _FLUSH_HANDLE = None
+    task = asyncio.create_task(_run_scheduled_flush())
+    _FLUSH_TASKS.add(task)
+    task.add_done_callback(_FLUSH_TASKS.discard)
+
+
+async def _run_scheduled_flush() -> None:
+    try:
+        await flush_log_entries()
+    except sqlite3.Error:
+        pass # Already logged, nobody is waiting for this flush
 
 
 async def insert_log_summary(user_id: int, guild_id: int, command_or_drop: str, date_time: datetime,
@@ -503,8 +749,9 @@ async def insert_log_summary(user_id: int, guild_id: int, command_or_drop: str,
             f'INSERT INTO {table} (user_id, guild_id, command_or_drop, amount, date_time, type) VALUES (?, ?, ?, ?, ?, ?)'
         )
         try:
-            cur = settings.DATABASE.cursor()
-            cur.execute(sql, (user_id, guild_id, command_or_drop, amount, date_time, 'summary'))
+            await gateway.execute(
+                sql, (user_id, guild_id, command_or_drop, amount, mappers.to_timestamp(date_time), 'summary')
+            )
         except sqlite3.Error as error:
             await errors.log_error(
                 strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
@@ -527,12 +774,131 @@ async def delete_log_entries(user_id: int, guild_id: int, command_or_drop: str,
     """
     table = 'tracking_log'
     function_name = '_delete_log_entries'
+    await flush_log_entries()
     sql = f'DELETE FROM {table} WHERE user_id=? AND guild_id=? AND command_or_drop=? AND type=? AND date_time BETWEEN ? AND ?'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (user_id, guild_id, command_or_drop, 'single', date_time_min, date_time_max))
+        await gateway.execute(
+            sql, (user_id, guild_id, command_or_drop, 'single', mappers.to_timestamp(date_time_min),
+                  mappers.to_timestamp(date_time_max))
+        )
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+
+
+async def consolidate_log_entries(days: int,
+                                  progress_callback: Optional[Callable[[ConsolidationProgress], Awaitable[None]]] = None
+                                  ) -> ConsolidationProgress:
+    """Consolidates all single log entries older than the amount of days into summaries.
+    Creates one summary per user, guild, command and day (UTC) that contains the sum of the amounts and deletes the
+    single log entries. If a summary for that day already exists, its amount is increased instead.
+    Runs in chunks of CONSOLIDATION_CHUNK_USERS users, every chunk in its own transaction.
+
+    Arguments
+    ---------
+    days: Log entries older than this amount of days (counted from 00:00 UTC today) are consolidated.
+    progress_callback: Coroutine function that is called with the progress after each chunk.
+
+    Returns
+    -------
+    ConsolidationProgress with the final counts.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. Chunks that were done before stay consolidated.
+    Also logs all errors to the database.
+    """
+    table = 'tracking_log'
+    function_name = 'consolidate_log_entries'
+    await flush_log_entries()
+    date_time = mappers.to_timestamp(utils.utcnow() - timedelta(days=days))
+    date_time -= date_time % _DAY
+    sql = f'SELECT DISTINCT user_id FROM {table} WHERE type=? AND date_time<? ORDER BY user_id'
+    try:
+        cur = await gateway.read(sql, ('single', date_time))
+        user_ids = [record['user_id'] for record in cur.fetchall()]
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+    sql_singles = (
+        f'SELECT user_id, guild_id, command_or_drop, SUM(amount) AS amount, '
+        f'date_time - date_time % {_DAY} + {_DAY - 1} AS summary_date_time FROM {table} '
+        f'WHERE type = :single AND date_time < :date_time AND user_id BETWEEN :user_id_min AND :user_id_max '
+        f'GROUP BY user_id, guild_id, command_or_drop, date_time / {_DAY}'
+    )
+    sql_summary_matches = (
+        'summary.type = :summary AND summary.user_id = singles.user_id AND summary.guild_id = singles.guild_id '
+        'AND summary.command_or_drop = singles.command_or_drop AND summary.date_time = singles.summary_date_time'
+    )
+    sql_update = (
+        f'UPDATE {table} AS summary SET amount = summary.amount + singles.amount '
+        f'FROM ({sql_singles}) AS singles WHERE {sql_summary_matches}'
+    )
+    sql_insert = (
+        f'INSERT INTO {table} (user_id, guild_id, command_or_drop, amount, date_time, type) '
+        f'SELECT singles.user_id, singles.guild_id, singles.command_or_drop, singles.amount, '
+        f'singles.summary_date_time, :summary FROM ({sql_singles}) AS singles '
+        f'WHERE NOT EXISTS (SELECT 1 FROM {table} AS summary WHERE {sql_summary_matches})'
+    )
+    sql_delete = (
+        f'DELETE FROM {table} WHERE type = :single AND date_time < :date_time '
+        f'AND user_id BETWEEN :user_id_min AND :user_id_max'
+    )
+    progress = ConsolidationProgress(0, len(user_ids), 0, 0)
+    for index in range(0, len(user_ids), CONSOLIDATION_CHUNK_USERS):
+        chunk_user_ids = user_ids[index:index + CONSOLIDATION_CHUNK_USERS]
+        parameters = {
+            'date_time': date_time, 'single': 'single', 'summary': 'summary',
+            'user_id_min': chunk_user_ids[0], 'user_id_max': chunk_user_ids[-1],
+        }
+        sql = f'{sql_update};\n{sql_insert};\n{sql_delete}'
+        try:
+            update_result, insert_result, delete_result = await gateway.execute_transaction(
+                ((sql_update, parameters), (sql_insert, parameters), (sql_delete, parameters))
+            )
+        except sqlite3.Error as error:
+            await errors.log_error(
+                strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+            )
+            raise
+        progress = ConsolidationProgress(
+            users_done = progress.users_done + len(chunk_user_ids),
+            users_total = progress.users_total,
+            log_entries_consolidated = progress.log_entries_consolidated + delete_result.rowcount,
+            summaries_written = progress.summaries_written + update_result.rowcount + insert_result.rowcount,
+        )
+        if progress_callback is not None: await progress_callback(progress)
+
+    return progress
+
+
+async def delete_old_hourly_rollups() -> int:
+    """Deletes all hourly sums older than ROLLUP_HOURLY_DAYS days (counted from 00:00 UTC today).
+    Reports use the daily sums and the consolidated log entries for these days.
+
+    Returns
+    -------
+    Amount of deleted hourly sums: int
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    Also logs all errors to the database.
+    """
+    table = 'tracking_log_hourly'
+    function_name = 'delete_old_hourly_rollups'
+    date_time = mappers.to_timestamp(utils.utcnow() - timedelta(days=ROLLUP_HOURLY_DAYS))
+    sql = f'DELETE FROM {table} WHERE hour < ?'
+    try:
+        cur = await gateway.execute(sql, (date_time - date_time % _DAY,))
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
-        raise
\ No newline at end of file
+        raise
+
+    return cur.rowcount
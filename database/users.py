@@ -1,23 +1,51 @@
 # users.py
 """Provides access to the table "users" in the database"""
 
-from dataclasses import dataclass
+from collections import OrderedDict
+import copy
+from dataclasses import dataclass, fields
 from datetime import datetime
 import sqlite3
-from typing import NamedTuple, Tuple
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
-from database import errors
+from database import errors, gateway, mappers
 from resources import exceptions, settings, strings
 from resources.enums import ReadyPopupMode
 
 
+USER_CACHE_MAX_ENTRIES = 5_000
+USER_CACHE_TTL = 300 # Seconds
+
+
 # Containers
+class UserCacheStats(NamedTuple):
+    """Object that represents the current state of the user cache."""
+    entries: int
+    hits: int
+    negative_hits: int
+    misses: int
+    evictions: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of get_user calls that were answered from the cache (0-1)."""
+        lookups = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / lookups if lookups else 0.0
+
+
+class SeasonReset(NamedTuple):
+    """Object that represents a finished season reset."""
+    users_reset: int
+    time_passed: float # Seconds
+
+
 class UserReminder(NamedTuple):
     """Object that summarizes all user settings for a specific alert"""
     enabled: bool
     message: str
 
-@dataclass()
+@dataclass(slots=True)
 class User():
     """Object that represents a record from table "user"."""
     alert_captcha_dm: bool
@@ -185,7 +213,9 @@ class User():
         self.xp_target = new_settings.xp_target
 
     async def update(self, **kwargs) -> None:
-        """Updates the user record in the database. Also calls refresh().
+        """Updates the user record in the database.
+        The object is updated with the record the database returned, so no additional read is necessary. If the
+        record wasn't found, refresh() is called instead.
         If user_donor_tier is updated and a partner is set, the partner's partner_donor_tier is updated as well.
 
         Arguments
@@ -285,140 +315,191 @@ class User():
             xp_prune_count: int
             xp_target: int
         """
-        await _update_user(self, **kwargs)
-        await self.refresh()
+        updated_user = await _update_user(self, **kwargs)
+        if updated_user is None:
+            await self.refresh()
+            return
+        for field in fields(self):
+            setattr(self, field.name, getattr(updated_user, field.name))
+        if settings.VERIFY_DATABASE_UPDATES:
+            invalidate_user_cache(self.user_id) # Make sure refresh() reads the record from the database
+            await errors.verify_local_update(self, 'users', 'User.update')
+
+
+# User cache
+# Write-through cache for get_user. Keeps the last used users (user_id: (time cached, User or None)) in LRU order.
+# None is stored for user IDs that have no record, so unknown users don't hit the database on every message either.
+# Reads run in parallel, so a read can return after a write that was sent later. Every change of a cache entry counts
+# up the generation of the user, and get_user only caches what it read if the generation didn't change meanwhile.
+_USER_CACHE: 'OrderedDict[int, Tuple[float, Optional[User]]]' = OrderedDict()
+_USER_CACHE_GENERATIONS: Dict[int, int] = {} # user_id: changes of the cache entry since the last clear
+_USER_CACHE_CLEARS = 0
+_USER_CACHE_STATS = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def _get_cache_generation(user_id: int) -> Tuple[int, int]:
+    """Returns the current generation of the cache entry of a user."""
+    return (_USER_CACHE_CLEARS, _USER_CACHE_GENERATIONS.get(user_id, 0))
+
+
+def _cache_user(user_id: int, user: Optional[User]) -> None:
+    """Adds a user to the user cache or replaces it. Use None to cache that the user doesn't exist."""
+    _USER_CACHE_GENERATIONS[user_id] = _USER_CACHE_GENERATIONS.get(user_id, 0) + 1
+    _USER_CACHE[user_id] = (time.monotonic(), user)
+    _USER_CACHE.move_to_end(user_id)
+    if len(_USER_CACHE) > USER_CACHE_MAX_ENTRIES:
+        _USER_CACHE.popitem(last=False)
+        _USER_CACHE_STATS['evictions'] += 1
+
+
+def invalidate_user_cache(user_id: Optional[int] = None) -> None:
+    """Removes a user from the user cache. Clears the whole cache if user_id is None.
+    Needs to be called if the table "users" is changed outside of this module."""
+    global _USER_CACHE_CLEARS
+    if user_id is None:
+        _USER_CACHE_CLEARS += 1
+        _USER_CACHE_GENERATIONS.clear()
+        _USER_CACHE.clear()
+    else:
+        _USER_CACHE_GENERATIONS[user_id] = _USER_CACHE_GENERATIONS.get(user_id, 0) + 1
+        _USER_CACHE.pop(user_id, None)
+
+
+def get_user_cache_stats() -> UserCacheStats:
+    """Returns the size and the hit, miss and eviction counters of the user cache."""
+    return UserCacheStats(entries=len(_USER_CACHE), **_USER_CACHE_STATS)
 
 
 # Miscellaneous functions
-async def _dict_to_user(record: dict) -> User:
-    """Creates a User object from a database record
+def _to_datetime_or_none(value: Optional[str]) -> Optional[datetime]:
+    """Converts an ISO datetime string from the database. Returns None if the value is None."""
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _to_str(value: Optional[str]) -> str:
+    """Returns an empty string if the value from the database is None."""
+    return '' if value is None else value
+
+
+def _to_user_reminder(enabled: int, message: str) -> UserReminder:
+    """Creates the UserReminder of an alert from its enabled and message columns."""
+    return UserReminder(bool(enabled), message)
+
+
+_USER_MAPPER = mappers.RowMapper(User, (
+    mappers.Column('alert_captcha_dm', convert=bool),
+    mappers.Column('alert_captcha_enabled', convert=bool),
+    mappers.Column('alert_nugget_dm', convert=bool),
+    mappers.Column('alert_nugget_enabled', convert=bool),
+    mappers.Column('alert_nugget_threshold'),
+    mappers.Column('alert_rebirth_dm', convert=bool),
+    mappers.Column('alert_rebirth_enabled', convert=bool),
+    mappers.Column('beta_pass_available'),
+    mappers.Column('bot_enabled', convert=bool),
+    mappers.Column('chests_in_queue'),
+    mappers.Column('chests_slots_empty'),
+    mappers.Column('chests_slots_ready'),
+    mappers.Column('diamond_rings'),
+    mappers.Column('diamond_rings_cap'),
+    mappers.Column('diamond_trophies'),
+    mappers.Column('diamond_trophies_gain_average', convert=float),
+    mappers.Column('diamond_trophies_raid_count'),
+    mappers.Column('dnd_mode_enabled', convert=bool),
+    mappers.Column('donor_tier'),
+    mappers.Column('helper_bunny_enabled', convert=bool),
+    mappers.Column('helper_context_enabled', convert=bool),
+    mappers.Column('helper_prune_enabled', convert=bool),
+    mappers.Column('helper_prune_progress_bar_color'),
+    mappers.Column('helper_rebirth_enabled', convert=bool),
+    mappers.Column('helper_trophies_diamond_progress_bar_color'),
+    mappers.Column('helper_trophies_enabled', convert=bool),
+    mappers.Column('helper_trophies_trophy_progress_bar_color'),
+    mappers.Column('incubator_slots_empty'),
+    mappers.Column('incubator_slots_hungry'),
+    mappers.Column('incubator_slots_ready'),
+    mappers.Column('incubator_slots_total'),
+    mappers.Column('last_bunny_update', convert=_to_datetime_or_none),
+    mappers.Column('last_rebirth', convert=datetime.fromisoformat),
+    mappers.Column('league_beta', convert=bool),
+    mappers.Column('level'),
+    mappers.Column('pruner_level'),
+    mappers.Column('pruner_tier'),
+    mappers.Column('pruner_type', convert=_to_str),
+    mappers.Column('reactions_enabled', convert=bool),
+    mappers.Column('ready_popup_mode', convert=ReadyPopupMode),
+    mappers.Column('ready_show_calendar', convert=bool),
+    mappers.Column('ready_show_chests', convert=bool),
+    mappers.Column('ready_show_clean', convert=bool),
+    mappers.Column('ready_show_daily', convert=bool),
+    mappers.Column('ready_show_fusion', convert=bool),
+    mappers.Column('ready_show_hive_energy', convert=bool),
+    mappers.Column('ready_show_incubator', convert=bool),
+    mappers.Column('ready_show_prune', convert=bool),
+    mappers.Column('ready_show_pruner', convert=bool),
+    mappers.Column('ready_show_quests', convert=bool),
+    mappers.Column('ready_show_rebirth', convert=bool),
+    mappers.Column('ready_show_vote', convert=bool),
+    mappers.Column('ready_show_when_empty', convert=bool),
+    mappers.Column('rebirth'),
+    mappers.Column('reminder_boosts', ('reminder_boosts_enabled', 'reminder_boosts_message'), _to_user_reminder),
+    mappers.Column('reminder_calendar', ('reminder_calendar_enabled', 'reminder_calendar_message'), _to_user_reminder),
+    mappers.Column('reminder_chests', ('reminder_chests_enabled', 'reminder_chests_message'), _to_user_reminder),
+    mappers.Column('reminder_clean', ('reminder_clean_enabled', 'reminder_clean_message'), _to_user_reminder),
+    mappers.Column('reminder_daily', ('reminder_daily_enabled', 'reminder_daily_message'), _to_user_reminder),
+    mappers.Column('reminder_fusion', ('reminder_fusion_enabled', 'reminder_fusion_message'), _to_user_reminder),
+    mappers.Column('reminder_hive_energy', ('reminder_hive_energy_enabled', 'reminder_hive_energy_message'), _to_user_reminder),
+    mappers.Column('reminder_incubator_upgrade', ('reminder_incubator_upgrade_enabled', 'reminder_incubator_upgrade_message'), _to_user_reminder),
+    mappers.Column('reminder_larva', ('reminder_larva_enabled', 'reminder_larva_message'), _to_user_reminder),
+    mappers.Column('reminder_prune', ('reminder_prune_enabled', 'reminder_prune_message'), _to_user_reminder),
+    mappers.Column('reminder_quests', ('reminder_quests_enabled', 'reminder_quests_message'), _to_user_reminder),
+    mappers.Column('reminder_research', ('reminder_research_enabled', 'reminder_research_message'), _to_user_reminder),
+    mappers.Column('reminder_upgrade', ('reminder_upgrade_enabled', 'reminder_upgrade_message'), _to_user_reminder),
+    mappers.Column('reminder_vote', ('reminder_vote_enabled', 'reminder_vote_message'), _to_user_reminder),
+    mappers.Column('reminders_slash_enabled', convert=bool),
+    mappers.Column('research_time'),
+    mappers.Column('streak_vote'),
+    mappers.Column('tracking_enabled', convert=bool),
+    mappers.Column('trophies'),
+    mappers.Column('trophies_gain_average', convert=float),
+    mappers.Column('trophies_raid_count'),
+    mappers.Column('user_id'),
+    mappers.Column('xp'),
+    mappers.Column('xp_gain_average', convert=float),
+    mappers.Column('xp_prune_count'),
+    mappers.Column('xp_target'),
+))
+
+
+async def _rows_to_users(description: Tuple[tuple], records: List[sqlite3.Row]) -> Tuple[User]:
+    """Creates User objects from database records, see mappers.RowMapper.
 
     Arguments
     ---------
-    record: Database record from table "user" as a dict.
+    description: The description of the cursor that returned the records.
+    records: Database records from table "users".
 
     Returns
     -------
-    User object.
+    Tuple with User objects in the same order as the records.
 
     Raises
     ------
-    LookupError if something goes wrong reading the dict. Also logs this error to the database.
+    LookupError if something goes wrong reading a record. Also logs this error to the database.
     """
-    function_name = '_dict_to_user'
     try:
-        user = User(
-            alert_captcha_dm = bool(record['alert_captcha_dm']),
-            alert_captcha_enabled = bool(record['alert_captcha_enabled']),
-            alert_nugget_dm = bool(record['alert_nugget_dm']),
-            alert_nugget_enabled = bool(record['alert_nugget_enabled']),
-            alert_nugget_threshold = record['alert_nugget_threshold'],
-            alert_rebirth_dm = bool(record['alert_rebirth_dm']),
-            alert_rebirth_enabled = bool(record['alert_rebirth_enabled']),
-            beta_pass_available = record['beta_pass_available'],
-            bot_enabled = bool(record['bot_enabled']),
-            chests_in_queue = record['chests_in_queue'],
-            chests_slots_empty = record['chests_slots_empty'],
-            chests_slots_ready = record['chests_slots_ready'],
-            diamond_rings = record['diamond_rings'],
-            diamond_rings_cap = record['diamond_rings_cap'],
-            diamond_trophies = record['diamond_trophies'],
-            diamond_trophies_gain_average = float(record['diamond_trophies_gain_average']),
-            diamond_trophies_raid_count = record['diamond_trophies_raid_count'],
-            dnd_mode_enabled = bool(record['dnd_mode_enabled']),
-            donor_tier = record['donor_tier'],
-            last_bunny_update = datetime.fromisoformat(record['last_bunny_update']) if record['last_bunny_update'] is not None else None,
-            last_rebirth = datetime.fromisoformat(record['last_rebirth']),
-            league_beta = bool(record['league_beta']),
-            helper_bunny_enabled = bool(record['helper_bunny_enabled']),
-            helper_context_enabled = bool(record['helper_context_enabled']),
-            helper_prune_enabled = bool(record['helper_prune_enabled']),
-            helper_prune_progress_bar_color = record['helper_prune_progress_bar_color'],
-            helper_rebirth_enabled = bool(record['helper_rebirth_enabled']),
-            helper_trophies_diamond_progress_bar_color = record['helper_trophies_diamond_progress_bar_color'],
-            helper_trophies_enabled = bool(record['helper_trophies_enabled']),
-            helper_trophies_trophy_progress_bar_color = record['helper_trophies_trophy_progress_bar_color'],
-            incubator_slots_empty = record['incubator_slots_empty'],
-            incubator_slots_hungry = record['incubator_slots_hungry'],
-            incubator_slots_ready = record['incubator_slots_ready'],
-            incubator_slots_total = record['incubator_slots_total'],
-            level = record['level'],
-            pruner_level = record['pruner_level'],
-            pruner_tier= record['pruner_tier'],
-            pruner_type = '' if record['pruner_type'] is None else record['pruner_type'],
-            reactions_enabled = bool(record['reactions_enabled']),
-            ready_popup_mode = ReadyPopupMode(record['ready_popup_mode']),
-            ready_show_calendar = bool(record['ready_show_calendar']),
-            ready_show_chests = bool(record['ready_show_chests']),
-            ready_show_clean = bool(record['ready_show_clean']),
-            ready_show_daily = bool(record['ready_show_daily']),
-            ready_show_fusion = bool(record['ready_show_fusion']),
-            ready_show_hive_energy = bool(record['ready_show_hive_energy']),
-            ready_show_incubator = bool(record['ready_show_incubator']),
-            ready_show_prune = bool(record['ready_show_prune']),
-            ready_show_pruner = bool(record['ready_show_pruner']),
-            ready_show_quests = bool(record['ready_show_quests']),
-            ready_show_rebirth = bool(record['ready_show_rebirth']),
-            ready_show_vote = bool(record['ready_show_vote']),
-            ready_show_when_empty = bool(record['ready_show_when_empty']),
-            rebirth = record['rebirth'],
-            reminder_boosts = UserReminder(enabled=bool(record['reminder_boosts_enabled']),
-                                           message=record['reminder_boosts_message']),
-            reminder_calendar = UserReminder(enabled=bool(record['reminder_calendar_enabled']),
-                                              message=record['reminder_calendar_message']),
-            reminder_chests = UserReminder(enabled=bool(record['reminder_chests_enabled']),
-                                           message=record['reminder_chests_message']),
-            reminder_clean = UserReminder(enabled=bool(record['reminder_clean_enabled']),
-                                          message=record['reminder_clean_message']),
-            reminder_daily = UserReminder(enabled=bool(record['reminder_daily_enabled']),
-                                          message=record['reminder_daily_message']),
-            reminder_fusion = UserReminder(enabled=bool(record['reminder_fusion_enabled']),
-                                           message=record['reminder_fusion_message']),
-            reminder_hive_energy = UserReminder(enabled=bool(record['reminder_hive_energy_enabled']),
-                                                message=record['reminder_hive_energy_message']),
-            reminder_incubator_upgrade = UserReminder(enabled=bool(record['reminder_incubator_upgrade_enabled']),
-                                                      message=record['reminder_incubator_upgrade_message']),
-            reminder_larva = UserReminder(enabled=bool(record['reminder_larva_enabled']),
-                                          message=record['reminder_larva_message']),
-            reminder_prune = UserReminder(enabled=bool(record['reminder_prune_enabled']),
-                                          message=record['reminder_prune_message']),
-            reminder_quests = UserReminder(enabled=bool(record['reminder_quests_enabled']),
-                                           message=record['reminder_quests_message']),
-            reminder_research = UserReminder(enabled=bool(record['reminder_research_enabled']),
-                                             message=record['reminder_research_message']),
-            reminder_upgrade = UserReminder(enabled=bool(record['reminder_upgrade_enabled']),
-                                            message=record['reminder_upgrade_message']),
-            reminder_vote = UserReminder(enabled=bool(record['reminder_vote_enabled']),
-                                         message=record['reminder_vote_message']),
-            reminders_slash_enabled = bool(record['reminders_slash_enabled']),
-            research_time = record['research_time'],
-            streak_vote = record['streak_vote'],
-            tracking_enabled = bool(record['tracking_enabled']),
-            trophies = record['trophies'],
-            trophies_gain_average = float(record['trophies_gain_average']),
-            trophies_raid_count = record['trophies_raid_count'],
-            xp = record['xp'],
-            xp_gain_average = float(record['xp_gain_average']),
-            xp_prune_count = record['xp_prune_count'],
-            xp_target = record['xp_target'],
-            user_id = record['user_id'],
-        )
-    except Exception as error:
-        await errors.log_error(
-            strings.INTERNAL_ERROR_DICT_TO_OBJECT.format(function=function_name, record=record)
-        )
-        raise LookupError(error)
-
-    return user
+        return _USER_MAPPER.map_rows(description, records)
+    except LookupError as error:
+        await errors.log_error(str(error))
+        raise
 
 
 # Get data
 async def get_user(user_id: int) -> User:
-    """Gets all user settings.
+    """Gets all user settings. Users are cached, see USER_CACHE_MAX_ENTRIES and USER_CACHE_TTL.
 
     Returns
     -------
-    User object
+    User object. Every call returns a new object, so changing it doesn't change the cache.
 
     Raises
     ------
@@ -427,23 +508,38 @@ async def get_user(user_id: int) -> User:
     LookupError if something goes wrong reading the dict.
     Also logs all errors to the database.
     """
+    cached_entry = _USER_CACHE.get(user_id, None)
+    if cached_entry is not None:
+        time_cached, cached_user = cached_entry
+        if time.monotonic() - time_cached <= USER_CACHE_TTL:
+            _USER_CACHE.move_to_end(user_id)
+            if cached_user is None:
+                _USER_CACHE_STATS['negative_hits'] += 1
+                raise exceptions.FirstTimeUserError(f'No user data found in database for user "{user_id}".')
+            _USER_CACHE_STATS['hits'] += 1
+            return copy.copy(cached_user)
+        del _USER_CACHE[user_id]
+    _USER_CACHE_STATS['misses'] += 1
     table = 'users'
     function_name = 'get_user'
     sql = f'SELECT * FROM {table} WHERE user_id=?'
+    generation = _get_cache_generation(user_id)
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (user_id,))
+        cur = await gateway.read(sql, (user_id,))
         record = cur.fetchone()
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    cache_result = _get_cache_generation(user_id) == generation # False if the user was written during the read
     if not record:
+        if cache_result: _cache_user(user_id, None)
         raise exceptions.FirstTimeUserError(f'No user data found in database for user "{user_id}".')
-    user = await _dict_to_user(dict(record))
+    user = (await _rows_to_users(cur.description, (record,)))[0]
+    if cache_result: _cache_user(user_id, user)
 
-    return user
+    return copy.copy(user)
 
 
 async def get_all_users() -> Tuple[User]:
@@ -464,8 +560,7 @@ async def get_all_users() -> Tuple[User]:
     function_name = 'get_all_users'
     sql = f'SELECT * FROM {table}'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql)
+        cur = await gateway.read(sql)
         records = cur.fetchall()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -474,12 +569,9 @@ async def get_all_users() -> Tuple[User]:
         raise
     if not records:
         raise exceptions.FirstTimeUserError(f'No user data found in database (how likely is that).')
-    users = []
-    for record in records:
-        user = await _dict_to_user(dict(record))
-        users.append(user)
+    users = await _rows_to_users(cur.description, records)
 
-    return tuple(users)
+    return users
 
 
 async def get_user_count() -> int:
@@ -497,8 +589,7 @@ async def get_user_count() -> int:
     function_name = 'get_user_count'
     sql = f'SELECT COUNT(user_id) FROM {table}'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql)
+        cur = await gateway.read(sql)
         record = cur.fetchone()
     except sqlite3.Error as error:
         await errors.log_error(
@@ -511,8 +602,9 @@ async def get_user_count() -> int:
 
 
 # Write Data
-async def _update_user(user: User, **kwargs) -> None:
+async def _update_user(user: User, **kwargs) -> Optional[User]:
     """Updates user record. Use User.update() to trigger this function.
+    The updated record is written through to the user cache.
     If user_donor_tier is updated and a partner is set, the partner's partner_donor_tier is updated as well.
 
     Arguments
@@ -619,6 +711,10 @@ async def _update_user(user: User, **kwargs) -> None:
         xp_prune_count: int
         xp_target: int
 
+    Returns
+    -------
+    The updated User object or None if no record was updated.
+
     Raises
     ------
     sqlite3.Error if something happened within the database.
@@ -633,14 +729,20 @@ async def _update_user(user: User, **kwargs) -> None:
         )
         raise exceptions.NoArgumentsError('You need to specify at least one keyword argument.')
     try:
-        cur = settings.DATABASE.cursor()
         sql = f'UPDATE {table} SET'
         for kwarg in kwargs:
             sql = f'{sql} {kwarg} = :{kwarg},'
         sql = sql.strip(",")
         kwargs['user_id'] = user.user_id
-        sql = f'{sql} WHERE user_id = :user_id'
-        cur.execute(sql, kwargs)
+        sql = f'{sql} WHERE user_id = :user_id RETURNING *'
+        cur = await gateway.execute(sql, kwargs)
+        records = cur.fetchall()
+        updated_user = None
+        if records:
+            updated_user = (await _rows_to_users(cur.description, records[:1]))[0]
+            _cache_user(user.user_id, updated_user)
+        else:
+            invalidate_user_cache(user.user_id)
         if 'user_donor_tier' in kwargs and user.partner_id is not None:
             partner = await get_user(user.partner_id)
             await partner.update(partner_donor_tier=kwargs['user_donor_tier'])
@@ -650,6 +752,8 @@ async def _update_user(user: User, **kwargs) -> None:
         )
         raise
 
+    return updated_user
+
 
 async def insert_user(user_id: int) -> User:
     """Inserts a record in the table "users".
@@ -675,13 +779,64 @@ async def insert_user(user_id: int) -> User:
         sql = f'{sql}?,'
     sql = f'{sql.strip(",")})'
     try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, values)
+        await gateway.execute(sql, values)
     except sqlite3.Error as error:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    invalidate_user_cache(user_id)
     user = await get_user(user_id)
 
-    return user
\ No newline at end of file
+    return user
+
+
+async def reset_season(season: str) -> Optional[SeasonReset]:
+    """Resets the trophies of all users and converts their diamond trophies to diamond rings (up to their diamond ring
+    cap) in one transaction. Clears the user cache afterwards.
+    The season is stored in the setting "last_season_reset", so every season is only reset once, even if this is
+    called again (e.g. after a restart).
+
+    Arguments
+    ---------
+    season: Unique name of the season that ends, e.g. the date of the reset.
+
+    Returns
+    -------
+    SeasonReset with the amount of reset users and the time it took or None if this season was already reset.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. Nothing is reset in that case.
+    Also logs all errors to the database.
+    """
+    table = 'users'
+    function_name = 'reset_season'
+    parameters = {'name': 'last_season_reset', 'season': season}
+    sql_season_done = 'SELECT 1 FROM settings WHERE name = :name AND value = :season'
+    statements = [
+        (sql_season_done, parameters),
+        (
+            f'UPDATE {table} SET trophies = 0, diamond_trophies = 0, '
+            f'diamond_rings = MIN(diamond_rings + diamond_trophies, diamond_rings_cap), league_beta = 0, '
+            f'trophies_gain_average = 0, trophies_raid_count = 0, diamond_trophies_gain_average = 0, '
+            f'diamond_trophies_raid_count = 0 WHERE NOT EXISTS ({sql_season_done})',
+            parameters
+        ),
+        ('DELETE FROM settings WHERE name = :name', parameters),
+        ('INSERT INTO settings (name, value) VALUES (:name, :season)', parameters),
+    ]
+    start_time = time.perf_counter()
+    try:
+        results = await gateway.execute_transaction(statements)
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(
+                error=error, table=table, function=function_name, sql=';\n'.join(sql for sql, _ in statements)
+            )
+        )
+        raise
+    if results[0].fetchone() is not None: return None
+    invalidate_user_cache()
+
+    return SeasonReset(users_reset=results[1].rowcount, time_passed=time.perf_counter() - start_time)
@@ -2,31 +2,18 @@
 
 from datetime import timedelta
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import errors, reminders, users
+from processing import dispatcher, parsing
 from resources import emojis, exceptions, functions, regex, strings
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all /bonuses related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await create_reminders(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-
-async def create_reminders(message: discord.Message, embed_data: Dict, interaction_user: Optional[discord.User],
+@dispatcher.handler(title=['buffs, bonuses and reductions'])
+async def create_reminders(message: discord.Message, embed_data: parsing.EmbedData, interaction_user: Optional[discord.User],
                                    user_settings: Optional[users.User]) -> bool:
     """Creates boost remindesr from /bonuses
 
@@ -41,9 +28,9 @@ async def create_reminders(message: discord.Message, embed_data: Dict, interacti
     search_strings = [
         'buffs, bonuses and reductions', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
-        if embed_data['embed_user'] is not None and interaction_user is not None:
-            if interaction_user != embed_data['embed_user']:
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
+        if embed_data.embed_user is not None and interaction_user is not None:
+            if interaction_user != embed_data.embed_user:
                 return add_reaction
         embed_users = []
         if interaction_user is None:
@@ -51,15 +38,15 @@ async def create_reminders(message: discord.Message, embed_data: Dict, interacti
                 await messages.find_message(message.channel.id, regex.COMMAND_BONUSES)
             )
             interaction_user = user_command_message.author
-        if embed_data['embed_user'] is None:
-            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data['author']['icon_url'])
+        if embed_data.embed_user is None:
+            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data.author_icon_url)
             if user_id_match:
                 user_id = int(user_id_match.group(1))
                 embed_users.append(message.guild.get_member(user_id))
             else:
-                embed_users = await functions.get_guild_member_by_name(message.guild, embed_data['author']['name'])
+                embed_users = await functions.get_guild_member_by_name(message.guild, embed_data.author_name)
         else:
-            embed_users.append(embed_data['embed_user'])
+            embed_users.append(embed_data.embed_user)
         if interaction_user not in embed_users: return add_reaction
         if user_settings is None:
             try:
@@ -70,7 +57,7 @@ async def create_reminders(message: discord.Message, embed_data: Dict, interacti
         
         activity = ''
         boost_name = ''
-        boost_fields = f"{embed_data['field1']['value']}\n{embed_data['field2']['value']}\n{embed_data['field3']['value']}\n{embed_data['field4']['value']}".strip()
+        boost_fields = f"{embed_data.field(1).value}\n{embed_data.field(2).value}\n{embed_data.field(3).value}\n{embed_data.field(4).value}".strip()
         for line in boost_fields.split('\n'):
             for boost_name in strings.ACTIVITIES_NAME_BOOSTS.keys():
                 if boost_name in line.lower():
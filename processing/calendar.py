@@ -5,33 +5,20 @@ from content import list_ready
 from datetime import timedelta
 import random
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import reminders, users
+from processing import dispatcher, parsing
 from resources import exceptions, functions, regex
 from resources.enums import ReadyPopupMode
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all calendar related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await create_reminder_from_calendar(message, embed_data, text_displays, user, user_settings))
-    return_values.append(await update_data_from_calendar_rewards(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def create_reminder_from_calendar(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
+@dispatcher.handler(text_displays=['today\'s rewards'])
+async def create_reminder_from_calendar(message: discord.Message, embed_data: parsing.EmbedData, text_displays: list, user: Optional[discord.User],
                                         user_settings: Optional[users.User]) -> bool:
     """Create reminder from the calendar.
 
@@ -85,7 +72,8 @@ async def create_reminder_from_calendar(message: discord.Message, embed_data: Di
     return add_reaction
 
 
-async def update_data_from_calendar_rewards(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['you have claimed **day'])
+async def update_data_from_calendar_rewards(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                             user_settings: Optional[users.User]) -> bool:
     """Create reminder, and update rebirth count & cooldowns from the calendar.
 
@@ -98,11 +86,11 @@ async def update_data_from_calendar_rewards(message: discord.Message, embed_data
     search_strings = [
         'you have claimed **day', #English
     ]
-    if (any(search_string in embed_data['description'].lower() for search_string in search_strings)):
+    if (any(search_string in embed_data.lower.description for search_string in search_strings)):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_CALENDAR)
@@ -115,8 +103,8 @@ async def update_data_from_calendar_rewards(message: discord.Message, embed_data
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
 
-        rebirth_amount = await functions.get_inventory_item(embed_data['field0']['value'], 'rebirth')
-        cooldowns_reset_match = re.search(r'cooldowns reset', embed_data['field0']['value'], re.IGNORECASE)
+        rebirth_amount = await functions.get_inventory_item(embed_data.field(0).value, 'rebirth')
+        cooldowns_reset_match = re.search(r'cooldowns reset', embed_data.field(0).value, re.IGNORECASE)
         if rebirth_amount > 0:
             await user_settings.update(rebirth=user_settings.rebirth + rebirth_amount)
             add_reaction = True
@@ -2,31 +2,18 @@
 
 import asyncio
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import reminders, users
+from processing import dispatcher, parsing
 from resources import emojis, exceptions, functions, regex, settings, strings
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all chests related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await call_context_helper_on_chest_open(message, embed_data, user, user_settings))
-    return_values.append(await create_reminder(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def call_context_helper_on_chest_open(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['chest opened!'])
+async def call_context_helper_on_chest_open(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                               user_settings: Optional[users.User]) -> bool:
     """Call the context helper after opening a chest
 
@@ -39,15 +26,15 @@ async def call_context_helper_on_chest_open(message: discord.Message, embed_data
     search_strings_title = [
         'chest opened!', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings_title):
+    if any(search_string in embed_data.lower.title for search_string in search_strings_title):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_CHESTS,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -57,17 +44,17 @@ async def call_context_helper_on_chest_open(message: discord.Message, embed_data
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
         embeds = []
-        rebirth_match = re.search(r'`(.+?)`.+?\*\*rebirth \(no reset\)', embed_data['field0']['value'].lower())
+        rebirth_match = re.search(r'`(.+?)`.+?\*\*rebirth \(no reset\)', embed_data.lower.field(0).value)
         if rebirth_match:
             rebirth_amount = int(re.sub(r'\D', '', rebirth_match.group(1)))
             await user_settings.update(rebirth=user_settings.rebirth + rebirth_amount)
         if user_settings.alert_nugget_enabled:
             dropped_nuggets = {}
-            nugget_wooden_match = re.search(r'`(.+?)`.+?\*\*wooden nugget', embed_data['field0']['value'].lower())
-            nugget_copper_match = re.search(r'`(.+?)`.+?\*\*copper nugget', embed_data['field0']['value'].lower())
-            nugget_silver_match = re.search(r'`(.+?)`.+?\*\*silver nugget', embed_data['field0']['value'].lower())
-            nugget_golden_match = re.search(r'`(.+?)`.+?\*\*golden nugget', embed_data['field0']['value'].lower())
-            nugget_diamond_match = re.search(r'`(.+?)`.+?\*\*diamond nugget', embed_data['field0']['value'].lower())
+            nugget_wooden_match = re.search(r'`(.+?)`.+?\*\*wooden nugget', embed_data.lower.field(0).value)
+            nugget_copper_match = re.search(r'`(.+?)`.+?\*\*copper nugget', embed_data.lower.field(0).value)
+            nugget_silver_match = re.search(r'`(.+?)`.+?\*\*silver nugget', embed_data.lower.field(0).value)
+            nugget_golden_match = re.search(r'`(.+?)`.+?\*\*golden nugget', embed_data.lower.field(0).value)
+            nugget_diamond_match = re.search(r'`(.+?)`.+?\*\*diamond nugget', embed_data.lower.field(0).value)
             if nugget_wooden_match:
                 nugget_wooden_amount = int(re.sub(r'\D', '', nugget_wooden_match.group(1)))
                 dropped_nuggets['Wooden'] = nugget_wooden_amount
@@ -109,7 +96,7 @@ async def call_context_helper_on_chest_open(message: discord.Message, embed_data
                         embed.set_footer(text='Use "/settings alerts" to change this')
                         embeds.insert(0, embed)
                         await message.reply(user.mention, embed=embed)
-        if user_settings.helper_context_enabled and (dropped_nuggets or 'fragments' in embed_data['field0']['value'].lower()):
+        if user_settings.helper_context_enabled and (dropped_nuggets or 'fragments' in embed_data.lower.field(0).value):
             await message.reply(
                 f"➜ {strings.SLASH_COMMANDS['chips upgrade-buff']}\n"
                 f"➜ {strings.SLASH_COMMANDS['chips show']}\n"
@@ -117,7 +104,8 @@ async def call_context_helper_on_chest_open(message: discord.Message, embed_data
     return add_reaction
 
 
-async def create_reminder(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(field_names=['chests inventory'])
+async def create_reminder(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                           user_settings: Optional[users.User]) -> bool:
     """Creates a reminder on /chests
 
@@ -130,15 +118,15 @@ async def create_reminder(message: discord.Message, embed_data: Dict, user: Opti
     search_strings = [
         'chests inventory', #English
     ]
-    if any(search_string in embed_data['field1']['name'].lower() for search_string in search_strings) and message.components:
+    if any(search_string in embed_data.lower.field(1).name for search_string in search_strings) and message.components:
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_CHESTS,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -148,7 +136,7 @@ async def create_reminder(message: discord.Message, embed_data: Dict, user: Opti
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
 
-        chests_in_queue = 10 - embed_data['field0']['value'].count('neutral')
+        chests_in_queue = 10 - embed_data.field(0).value.count('neutral')
         chests_slots_empty = chests_slots_ready = 0
                         
         user_command = await functions.get_game_command(user_settings, 'chests')
@@ -2,7 +2,7 @@
 
 from datetime import timedelta
 import re
-from typing import Dict, Optional
+from typing import Optional
 import unicodedata
 
 import discord
@@ -10,25 +10,12 @@ from datetime import timedelta
 
 from cache import messages
 from database import reminders, users
+from processing import dispatcher, parsing
 from resources import emojis, exceptions, functions, regex
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, interaction_user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all cooldown related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await create_reminder_on_command_cooldown(message, embed_data, interaction_user, user_settings))
-    return_values.append(await update_reminders_in_cooldown_list(message, embed_data, interaction_user, user_settings))
-    return any(return_values)
-
-
-async def create_reminder_on_command_cooldown(message: discord.Message, embed_data: Dict,
+@dispatcher.handler(title=['you can use this command again in'])
+async def create_reminder_on_command_cooldown(message: discord.Message, embed_data: parsing.EmbedData,
                                               user: Optional[discord.User],
                                               user_settings: Optional[users.User]) -> bool:
     """Create reminder for some command when triggering a command cooldown.
@@ -43,13 +30,13 @@ async def create_reminder_on_command_cooldown(message: discord.Message, embed_da
     search_strings = [
         'you can use this command again in', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
         interaction = await functions.get_interaction(message)
         if interaction is not None:
             user_command = interaction.name
         else:
             user_command_message = (
-                await messages.find_message(message.channel.id, user_name=embed_data['author']['name'])
+                await messages.find_message(message.channel.id, user_name=embed_data.author_name)
             )
             if user_command_message is None: return add_reaction
             if user is None: user = user_command_message.author
@@ -60,7 +47,7 @@ async def create_reminder_on_command_cooldown(message: discord.Message, embed_da
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
-        timestring_match = re.search(r'in \*\*`(.+?)`\*\*$', embed_data['title'].lower())
+        timestring_match = re.search(r'in \*\*`(.+?)`\*\*$', embed_data.lower.title)
         if (re.search(regex.COMMAND_CLEAN, user_command.lower() or user_command == 'clean')
             and (user_settings.reminder_clean.enabled or user_settings.ready_show_clean)):
             activity = 'clean'
@@ -104,7 +91,8 @@ async def create_reminder_on_command_cooldown(message: discord.Message, embed_da
     return add_reaction
 
 
-async def update_reminders_in_cooldown_list(message: discord.Message, embed_data: Dict, interaction_user: Optional[discord.User],
+@dispatcher.handler(author_name=['\'s cooldowns'])
+async def update_reminders_in_cooldown_list(message: discord.Message, embed_data: parsing.EmbedData, interaction_user: Optional[discord.User],
                                            user_settings: Optional[users.User]) -> bool:
     """Creates reminders or deletes them for all commands in the cooldown list
 
@@ -117,9 +105,9 @@ async def update_reminders_in_cooldown_list(message: discord.Message, embed_data
     search_strings = [
         '\'s cooldowns', #English
     ]
-    if any(search_string in embed_data['author']['name'].lower() for search_string in search_strings):
-        if embed_data['embed_user'] is not None and interaction_user is not None:
-            if interaction_user != embed_data['embed_user'] != interaction_user:
+    if any(search_string in embed_data.lower.author_name for search_string in search_strings):
+        if embed_data.embed_user is not None and interaction_user is not None:
+            if interaction_user != embed_data.embed_user != interaction_user:
                 return add_reaction
         embed_users = []
         if interaction_user is None:
@@ -127,18 +115,18 @@ async def update_reminders_in_cooldown_list(message: discord.Message, embed_data
                 await messages.find_message(message.channel.id, regex.COMMAND_COOLDOWNS)
             )
             interaction_user = user_command_message.author
-        if embed_data['embed_user'] is None:
-            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data['author']['icon_url'])
+        if embed_data.embed_user is None:
+            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data.author_icon_url)
             if user_id_match:
                 user_id = int(user_id_match.group(1))
                 embed_users.append(message.guild.get_member(user_id))
             else:
-                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
+                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author_name)
                 if user_name_match:
                     user_name = user_name_match.group(1)
                     embed_users = await functions.get_guild_member_by_name(message.guild, user_name)
         else:
-            embed_users.append(embed_data['embed_user'])
+            embed_users.append(embed_data.embed_user)
         if interaction_user not in embed_users: return add_reaction
         if user_settings is None:
             try:
@@ -146,10 +134,10 @@ async def update_reminders_in_cooldown_list(message: discord.Message, embed_data
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
-        embed_field_commands = unicodedata.normalize('NFKD', embed_data['field0']['value'])
-        embed_field_quests = unicodedata.normalize('NFKD', embed_data['field1']['value'])
-        embed_field_raid = unicodedata.normalize('NFKD', embed_data['field2']['value'])
-        embed_field_tool = unicodedata.normalize('NFKD', embed_data['field3']['value'])
+        embed_field_commands = unicodedata.normalize('NFKD', embed_data.field(0).value)
+        embed_field_quests = unicodedata.normalize('NFKD', embed_data.field(1).value)
+        embed_field_raid = unicodedata.normalize('NFKD', embed_data.field(2).value)
+        embed_field_tool = unicodedata.normalize('NFKD', embed_data.field(3).value)
         cooldowns = []
         ready_commands = []
         if user_settings.reminder_clean.enabled or user_settings.ready_show_clean:
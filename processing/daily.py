@@ -1,31 +1,19 @@
 # daily.py
 
 from datetime import timedelta
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import reminders, users
+from processing import dispatcher, parsing
 from resources import exceptions, functions, regex
 from resources.enums import ReadyPopupMode
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all daily related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await create_reminder(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def create_reminder(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['daily rewards'])
+async def create_reminder(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                           user_settings: Optional[users.User]) -> bool:
     """Create a reminder on /daily
 
@@ -38,15 +26,15 @@ async def create_reminder(message: discord.Message, embed_data: Dict, user: Opti
     search_strings = [
         'daily rewards', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_DAILY,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -0,0 +1,216 @@
+# dispatcher.py
+"""Routes Tree messages to the processing functions that can act on them.
+
+Every processing function registers the trigger strings it looks for and the slot of the message they appear in
+with the decorator handler(). DetectionCog then only calls the functions with at least one matching trigger instead
+of running every check on every message.
+"""
+
+from collections import deque
+import inspect
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import discord
+
+from database import users
+from processing import parsing
+
+
+# Message slots a trigger can apply to
+TITLE = 'title'
+DESCRIPTION = 'description'
+AUTHOR_NAME = 'author_name'
+FIELD_NAMES = 'field_names'
+FIELD_VALUES = 'field_values'
+FOOTER_TEXT = 'footer_text'
+CONTENT = 'content'
+TEXT_DISPLAYS = 'text_displays'
+
+SLOTS = (TITLE, DESCRIPTION, AUTHOR_NAME, FIELD_NAMES, FIELD_VALUES, FOOTER_TEXT, CONTENT, TEXT_DISPLAYS)
+
+
+# Containers
+class Handler(NamedTuple):
+    """Object that represents a registered processing function."""
+    function: Callable
+    module: str
+    name: str
+    triggers: Dict[str, Tuple[str]] # slot: trigger strings (lowercase)
+    uses_text_displays: bool
+
+    async def run(self, message: discord.Message, embed_data: parsing.EmbedData, text_displays: list,
+                  user: Optional[discord.User], user_settings: Optional[users.User]) -> bool:
+        """Calls the processing function with the arguments it expects.
+
+        Returns
+        -------
+        - True if a logo reaction should be added to the message
+        - False otherwise
+        """
+        if self.uses_text_displays:
+            return await self.function(message, embed_data, text_displays, user, user_settings)
+        return await self.function(message, embed_data, user, user_settings)
+
+
+class TriggerAutomaton():
+    """Aho-Corasick automaton that finds all trigger strings contained in a text in a single pass.
+    The cost of a search only depends on the length of the text, not on the amount of triggers.
+    """
+    __slots__ = ('_transitions', '_outputs')
+
+    def __init__(self, triggers: Iterable[str]) -> None:
+        # Trie
+        transitions: List[Dict[str, int]] = [{}]
+        outputs: List[Set[str]] = [set()]
+        for trigger in triggers:
+            state = 0
+            for char in trigger:
+                next_state = transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(transitions)
+                    transitions[state][char] = next_state
+                    transitions.append({})
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(trigger)
+        # Failure links in breadth-first order. The failure transitions are merged into the transitions of each state,
+        # so a search never has to follow failure links.
+        failures = [0] * len(transitions)
+        queue = deque(transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            failure_transitions = transitions[failures[state]]
+            for char, next_state in transitions[state].items():
+                queue.append(next_state)
+                if state != 0:
+                    failures[next_state] = failure_transitions.get(char, 0)
+                outputs[next_state].update(outputs[failures[next_state]])
+            if state != 0:
+                transitions[state] = {**failure_transitions, **transitions[state]}
+        self._transitions: Tuple[Dict[str, int]] = tuple(transitions)
+        self._outputs: Tuple[FrozenSet[str]] = tuple(frozenset(output) for output in outputs)
+
+    def search(self, text: str) -> Set[str]:
+        """Returns all triggers contained in the text."""
+        transitions = self._transitions
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for char in text:
+            state = transitions[state].get(char, 0)
+            if outputs[state]: found.update(outputs[state])
+        return found
+
+
+# Registered handlers, keyed by (module, name) so reloading a module replaces its handlers instead of adding them twice
+_HANDLERS: Dict[Tuple[str, str], Handler] = {}
+
+# Trigger matcher per slot: {slot: (automaton, {trigger: [handler keys]})}. Rebuilt when the registered handlers change.
+_MATCHERS: Dict[str, Tuple[TriggerAutomaton, Dict[str, List[Tuple[str, str]]]]] = {}
+
+
+def handler(**triggers: List[str]) -> Callable:
+    """Decorator that registers a processing function with the trigger strings it looks for.
+    A message is routed to the function if ANY trigger is found in its slot (case insensitive). The function still
+    checks the exact conditions itself, the triggers only need to be a necessary part of them.
+    The functions of a module run in the order they are defined in the module.
+
+    Arguments
+    ---------
+    triggers (slot=trigger strings): title, description, author_name, field_names, field_values, footer_text,
+    content, text_displays
+
+    Raises
+    ------
+    ValueError if an unknown slot or no trigger at all is given.
+    """
+    for slot in triggers:
+        if slot not in SLOTS: raise ValueError(f'Unknown message slot "{slot}".')
+    if not any(triggers.values()): raise ValueError('At least one trigger string is required.')
+
+    def decorator(function: Callable) -> Callable:
+        module = function.__module__.split('.')[-1]
+        _HANDLERS[(module, function.__name__)] = Handler(
+            function = function,
+            module = module,
+            name = function.__name__,
+            triggers = {slot: tuple(trigger.lower() for trigger in slot_triggers)
+                        for slot, slot_triggers in triggers.items()},
+            uses_text_displays = 'text_displays' in inspect.signature(function).parameters,
+        )
+        _MATCHERS.clear()
+        return function
+
+    return decorator
+
+
+def build_matchers() -> None:
+    """Compiles the trigger automatons of all slots from the registered handlers.
+    This is called on startup. If handlers are registered afterwards (e.g. by reloading a module), the automatons are
+    rebuilt on the next message.
+    """
+    trigger_index = {slot: {} for slot in SLOTS}
+    for key, registered_handler in _HANDLERS.items():
+        for slot, slot_triggers in registered_handler.triggers.items():
+            for trigger in slot_triggers:
+                trigger_index[slot].setdefault(trigger, []).append(key)
+    for slot, slot_triggers in trigger_index.items():
+        _MATCHERS[slot] = (TriggerAutomaton(slot_triggers), slot_triggers)
+
+
+def get_slot_texts(message: discord.Message, embed_data: parsing.EmbedData, text_displays: list) -> Dict[str, List[str]]:
+    """Returns the lowercased texts of all message slots. Slots can contain more than one text (e.g. field names)."""
+    embed_data_lower = embed_data.lower
+    return {
+        TITLE: [embed_data_lower.title],
+        DESCRIPTION: [embed_data_lower.description],
+        AUTHOR_NAME: [embed_data_lower.author_name],
+        FIELD_NAMES: [field.name for field in embed_data_lower.fields],
+        FIELD_VALUES: [field.value for field in embed_data_lower.fields],
+        FOOTER_TEXT: [embed_data_lower.footer_text],
+        CONTENT: [message.content.lower()],
+        TEXT_DISPLAYS: [text_display.lower() for text_display in text_displays],
+    }
+
+
+def get_matched_triggers(message: discord.Message, embed_data: parsing.EmbedData, text_displays: list) -> Dict[str, Set[str]]:
+    """Scans every slot of the message once and returns the triggers found in it.
+
+    Returns
+    -------
+    Dict with the slots as keys and the found triggers as values. Slots without a found trigger are not included.
+    """
+    if not _MATCHERS: build_matchers()
+    matched_triggers = {}
+    for slot, texts in get_slot_texts(message, embed_data, text_displays).items():
+        automaton, _ = _MATCHERS[slot]
+        for text in texts:
+            if not text: continue
+            found_triggers = automaton.search(text)
+            if found_triggers: matched_triggers.setdefault(slot, set()).update(found_triggers)
+    return matched_triggers
+
+
+def get_handlers(message: discord.Message, embed_data: parsing.EmbedData, text_displays: list) -> Dict[str, List[Handler]]:
+    """Returns all handlers with at least one trigger that matches the message.
+
+    Returns
+    -------
+    Dict with the module names as keys and the matching handlers of that module in registration order as values.
+    Modules without a matching handler are not included.
+    """
+    matched_keys = set()
+    for slot, triggers in get_matched_triggers(message, embed_data, text_displays).items():
+        _, trigger_index = _MATCHERS[slot]
+        for trigger in triggers:
+            matched_keys.update(trigger_index[trigger])
+    handlers = {}
+    for key, registered_handler in _HANDLERS.items():
+        if key in matched_keys:
+            handlers.setdefault(registered_handler.module, []).append(registered_handler)
+    return handlers
+
+
+def get_all_handlers() -> Tuple[Handler]:
+    """Returns all registered handlers in registration order."""
+    return tuple(_HANDLERS.values())
@@ -2,35 +2,19 @@
 
 import re
 import sqlite3
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import bunnies, users
+from processing import dispatcher, parsing
 from resources import emojis, exceptions, functions, regex, settings, strings, logs
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all incubator related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await call_bunny_helper(message, embed_data, user, user_settings))
-    return_values.append(await send_notification_on_catch(message, embed_data, user, user_settings))
-    return_values.append(await update_bunnies_from_hutch(message, embed_data, user, user_settings))
-    return_values.append(await update_bunny_from_fusion(message, embed_data, user, user_settings))
-    return_values.append(await update_rebirth_from_calendar(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def call_bunny_helper(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['bunny is approaching to your tree'])
+async def call_bunny_helper(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                             user_settings: Optional[users.User]) -> bool:
     """Shows the bunny helper when encountering an new bunny.
 
@@ -43,15 +27,15 @@ async def call_bunny_helper(message: discord.Message, embed_data: Dict, user: Op
     search_strings = [
         'bunny is approaching to your tree', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_PRUNE,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -61,8 +45,8 @@ async def call_bunny_helper(message: discord.Message, embed_data: Dict, user: Op
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.helper_bunny_enabled: return add_reaction
 
-        fertility = embed_data['field0']['value'].lower().count(':fertility:')
-        epicness = embed_data['field0']['value'].lower().count(':epicness:')
+        fertility = embed_data.lower.field(0).value.count(':fertility:')
+        epicness = embed_data.lower.field(0).value.count(':epicness:')
 
         try:
             user_bunnies = await bunnies.get_bunnies_by_user_id(user.id)
@@ -173,7 +157,48 @@ async def call_bunny_helper(message: discord.Message, embed_data: Dict, user: Op
     return add_reaction
 
 
-async def update_bunnies_from_hutch(message: discord.Message, embed_data: Dict, interaction_user: Optional[discord.User],
+@dispatcher.handler(title=['approach successful'])
+async def send_notification_on_catch(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                     user_settings: Optional[users.User]) -> bool:
+    """Tells the user to manually update when a bunny gets caught or replaced.
+
+    Returns
+    -------
+    - True if a logo reaction should be added to the message
+    - False otherwise
+    """
+    add_reaction = False
+    search_strings = [
+        'approach successful', #English
+    ]
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
+        if user is None:
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
+            else:
+                user_command_message = (
+                    await messages.find_message(message.channel.id, regex.COMMAND_PRUNE,
+                                                user_name=embed_data.author_name)
+                )
+                user = user_command_message.author
+        if user_settings is None:
+            try: 
+                user_settings: users.User = await users.get_user(user.id)
+            except exceptions.FirstTimeUserError:
+                return add_reaction
+        if not user_settings.bot_enabled or not user_settings.helper_bunny_enabled: return add_reaction
+
+        await user_settings.update(last_bunny_update=None)
+        await message.reply(
+            f"➜ Please use {strings.SLASH_COMMANDS['easter hutch']} to update my bunny data!\n"
+        )
+            
+    return add_reaction
+
+
+@dispatcher.handler(title=['bunny hutch'])
+async def update_bunnies_from_hutch(message: discord.Message, embed_data: parsing.EmbedData, interaction_user: Optional[discord.User],
                                     user_settings: Optional[users.User]) -> bool:
     """Updates bunnies in the database from the hutch.
 
@@ -186,9 +211,9 @@ async def update_bunnies_from_hutch(message: discord.Message, embed_data: Dict,
     search_strings = [
         'bunny hutch', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
-        if embed_data['embed_user'] is not None and interaction_user is not None:
-            if interaction_user != embed_data['embed_user']:
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
+        if embed_data.embed_user is not None and interaction_user is not None:
+            if interaction_user != embed_data.embed_user:
                 return add_reaction
         embed_users = []
         if interaction_user is None:
@@ -196,17 +221,17 @@ async def update_bunnies_from_hutch(message: discord.Message, embed_data: Dict,
                 await messages.find_message(message.channel.id, regex.COMMAND_EASTER_HUTCH)
             )
             interaction_user = user_command_message.author
-        if embed_data['embed_user'] is None:
-            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data['author']['icon_url'])
+        if embed_data.embed_user is None:
+            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data.author_icon_url)
             if user_id_match:
                 user_id = int(user_id_match.group(1))
                 embed_users.append(message.guild.get_member(user_id))
             else:
-                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
+                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author_name)
                 user_name = user_name_match.group(1)
                 embed_users = await functions.get_guild_member_by_name(message.guild, user_name)
         else:
-            embed_users.append(embed_data['embed_user'])
+            embed_users.append(embed_data.embed_user)
         if interaction_user not in embed_users: return add_reaction
         if user_settings is None:
             try: 
@@ -243,7 +268,8 @@ async def update_bunnies_from_hutch(message: discord.Message, embed_data: Dict,
     return add_reaction
 
 
-async def update_bunny_from_fusion(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['you fused'], field_names=['crack crock'])
+async def update_bunny_from_fusion(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                    user_settings: Optional[users.User]) -> bool:
     """Updates a bunny in the database from the fusion result embed.
 
@@ -256,16 +282,16 @@ async def update_bunny_from_fusion(message: discord.Message, embed_data: Dict, u
     search_strings = [
         'you fused', #English
     ]
-    if (any(search_string in embed_data['description'].lower() for search_string in search_strings)
-        and (':fertility:' in embed_data['field0']['value'].lower()) or 'crack crock' in embed_data['field0']['name'].lower()):
+    if (any(search_string in embed_data.lower.description for search_string in search_strings)
+        and (':fertility:' in embed_data.lower.field(0).value) or 'crack crock' in embed_data.lower.field(0).name):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_PRUNE,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -275,7 +301,7 @@ async def update_bunny_from_fusion(message: discord.Message, embed_data: Dict, u
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.helper_bunny_enabled: return add_reaction
 
-        bunny_names_match = re.search(r'\*\*(.+?)\*\* with \*\*(.+?)\*\*', embed_data['description'])
+        bunny_names_match = re.search(r'\*\*(.+?)\*\* with \*\*(.+?)\*\*', embed_data.description)
         new_bunny_name, old_bunny_name = bunny_names_match.groups()
         
         try:
@@ -284,9 +310,9 @@ async def update_bunny_from_fusion(message: discord.Message, embed_data: Dict, u
             await user_settings.update(last_bunny_update=None)
             return add_reaction
 
-        if ':fertility:' in embed_data['field0']['value'].lower():
-            fertility = embed_data['field0']['value'].lower().count(':fertility:')
-            epicness = embed_data['field0']['value'].lower().count(':epicness:')
+        if ':fertility:' in embed_data.lower.field(0).value:
+            fertility = embed_data.lower.field(0).value.count(':fertility:')
+            epicness = embed_data.lower.field(0).value.count(':epicness:')
             try:
                 await bunny.update(name=new_bunny_name, fertility=fertility, epicness=epicness)
             except sqlite3.Error:
@@ -307,46 +333,8 @@ async def update_bunny_from_fusion(message: discord.Message, embed_data: Dict, u
     return add_reaction
 
 
-async def send_notification_on_catch(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                     user_settings: Optional[users.User]) -> bool:
-    """Tells the user to manually update when a bunny gets caught or replaced.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    add_reaction = False
-    search_strings = [
-        'approach successful', #English
-    ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
-        if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
-            else:
-                user_command_message = (
-                    await messages.find_message(message.channel.id, regex.COMMAND_PRUNE,
-                                                user_name=embed_data['author']['name'])
-                )
-                user = user_command_message.author
-        if user_settings is None:
-            try: 
-                user_settings: users.User = await users.get_user(user.id)
-            except exceptions.FirstTimeUserError:
-                return add_reaction
-        if not user_settings.bot_enabled or not user_settings.helper_bunny_enabled: return add_reaction
-
-        await user_settings.update(last_bunny_update=None)
-        await message.reply(
-            f"➜ Please use {strings.SLASH_COMMANDS['easter hutch']} to update my bunny data!\n"
-        )
-            
-    return add_reaction
-
-
-async def update_rebirth_from_calendar(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['you have claimed day'])
+async def update_rebirth_from_calendar(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                        user_settings: Optional[users.User]) -> bool:
     """Update rebirth count from the easter calendar.
 
@@ -359,12 +347,12 @@ async def update_rebirth_from_calendar(message: discord.Message, embed_data: Dic
     search_strings = [
         'you have claimed day', #English
     ]
-    if (any(search_string in embed_data['description'].lower() for search_string in search_strings)
-        and 'easter calendar' in embed_data['description'].lower()):
+    if (any(search_string in embed_data.lower.description for search_string in search_strings)
+        and 'easter calendar' in embed_data.lower.description):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_EASTER_CALENDAR)
@@ -377,7 +365,7 @@ async def update_rebirth_from_calendar(message: discord.Message, embed_data: Dic
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
 
-        rebirth_amount = await functions.get_inventory_item(embed_data['field0']['value'], 'rebirth')
+        rebirth_amount = await functions.get_inventory_item(embed_data.field(0).value, 'rebirth')
         if rebirth_amount > 0:
             await user_settings.update(rebirth=user_settings.rebirth + rebirth_amount)
             add_reaction = True
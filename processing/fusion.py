@@ -2,30 +2,18 @@
 
 from datetime import timedelta
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import reminders, users
+from processing import dispatcher, parsing
 from resources import exceptions, functions, regex
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all fusion related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await create_reminder(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def create_reminder(message: discord.Message, embed_data: Dict, interaction_user: Optional[discord.User],
+@dispatcher.handler(description=['there was a fusion'])
+async def create_reminder(message: discord.Message, embed_data: parsing.EmbedData, interaction_user: Optional[discord.User],
                           user_settings: Optional[users.User]) -> bool:
     """Creates a reminder on /fusion
 
@@ -38,21 +26,21 @@ async def create_reminder(message: discord.Message, embed_data: Dict, interactio
     search_strings = [
         'there was a fusion', #English
     ]
-    if any(search_string in embed_data['description'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.description for search_string in search_strings):
         user1 = interaction_user
         user1_settings = user_settings
         user2 = user2_settings = None
         if user1 is None:
             user_command_message = (
                 await messages.find_message(message.channel.id, regex.COMMAND_FUSION,
-                                            user_name=embed_data['field0']['name'])
+                                            user_name=embed_data.field(0).name)
             )
             user1 = user_command_message.author
             if user_command_message.mentions:
                 user2 = user_command_message.mentions[0]
         if user2 is None:
             guild_members = await functions.get_guild_member_by_name(message.guild,
-                                                                     embed_data['field1']['name'])
+                                                                     embed_data.field(1).name)
             if len(guild_members) == 1:
                 user2 = guild_members[0]
         if user1_settings is None:
@@ -1,33 +1,20 @@
 # hive.py
 
 from datetime import timedelta
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import message
 
 from cache import messages
 from database import reminders, users
+from processing import dispatcher, parsing
 from resources import exceptions, functions, regex, strings
 from resources.enums import ReadyPopupMode
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all hive related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await create_reminder(message, embed_data, user, user_settings))
-    return_values.append(await call_context_helper_on_claim_honey(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def create_reminder(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(content=['you have claimed'])
+async def create_reminder(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                           user_settings: Optional[users.User]) -> bool:
     """Creates a reminder on /hive claim-energy
 
@@ -77,7 +64,8 @@ async def create_reminder(message: discord.Message, embed_data: Dict, user: Opti
     return add_reaction
 
 
-async def call_context_helper_on_claim_honey(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['you have claimed'])
+async def call_context_helper_on_claim_honey(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                              user_settings: Optional[users.User]) -> bool:
     """Call the context helper when claiming honey
 
@@ -91,13 +79,13 @@ async def call_context_helper_on_claim_honey(message: discord.Message, embed_dat
         'you have claimed',
         'honey'
     ]
-    if all(search_string in embed_data['description'].lower() for search_string in search_strings):
+    if all(search_string in embed_data.lower.description for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
-                user_name = embed_data['author']['name']
+                user_name = embed_data.author_name
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_HIVE, user_name=user_name)
                 )
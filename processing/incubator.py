@@ -3,33 +3,18 @@
 import asyncio
 from datetime import timedelta
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import reminders, users
+from processing import dispatcher, parsing
 from resources import exceptions, functions, regex, settings, strings
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all incubator related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await create_larva_reminders_from_feeding(message, embed_data, user, user_settings))
-    return_values.append(await create_larva_reminders_from_overview(message, embed_data, user, user_settings))
-    return_values.append(await create_nugget_alert(message, embed_data, user, user_settings))
-    return_values.append(await create_upgrade_reminder(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def create_larva_reminders_from_feeding(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['you have fed', 'is now growing'])
+async def create_larva_reminders_from_feeding(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                               user_settings: Optional[users.User]) -> bool:
     """Creates reminders when feeding all larvae in the incubator
 
@@ -43,16 +28,16 @@ async def create_larva_reminders_from_feeding(message: discord.Message, embed_da
         'you have fed', #English
         'is now growing', #English
     ]
-    if (any(search_string in embed_data['description'].lower() for search_string in search_strings)
-        and 'larva' in embed_data['description'].lower()):
+    if (any(search_string in embed_data.lower.description for search_string in search_strings)
+        and 'larva' in embed_data.lower.description):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_INCUBATOR,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -64,19 +49,19 @@ async def create_larva_reminders_from_feeding(message: discord.Message, embed_da
 
         if user_settings.reminder_larva.enabled or user_settings.ready_show_incubator:
             single_feed = False
-            slot_description_match = re.search(r"slot\s(\d+?)`", embed_data['description'].lower())
+            slot_description_match = re.search(r"slot\s(\d+?)`", embed_data.lower.description)
             if slot_description_match:
                 slot = slot_description_match.group(1)
                 single_feed = True
-            if 'queen' in embed_data['description'].lower():
+            if 'queen' in embed_data.lower.description:
                 larva_type = 'queen'
-            elif 'soldier' in embed_data['description'].lower():
+            elif 'soldier' in embed_data.lower.description:
                 larva_type = 'soldier'  
-            elif 'worker' in embed_data['description'].lower():
+            elif 'worker' in embed_data.lower.description:
                 larva_type = 'worker' 
             else:
                 larva_type = 'unknown'
-            larvae_fed = embed_data['field0']['value'].split('\n')
+            larvae_fed = embed_data.field(0).value.split('\n')
             for line in larvae_fed:
                 if not single_feed:
                     slot_match = re.search(r"slot\s(\d+?)\)", line.lower())
@@ -108,7 +93,8 @@ async def create_larva_reminders_from_feeding(message: discord.Message, embed_da
     return add_reaction
 
 
-async def create_larva_reminders_from_overview(message: discord.Message, embed_data: Dict, interaction_user: Optional[discord.User],
+@dispatcher.handler(title=['incubator'])
+async def create_larva_reminders_from_overview(message: discord.Message, embed_data: parsing.EmbedData, interaction_user: Optional[discord.User],
                                                user_settings: Optional[users.User]) -> bool:
     """Creates reminders when opening the incubator overview
 
@@ -124,10 +110,10 @@ async def create_larva_reminders_from_overview(message: discord.Message, embed_d
     search_strings_description = [
         'level:', #English
     ]
-    if (any(search_string in embed_data['title'].lower() for search_string in search_strings_title)
-        and any(search_string in embed_data['description'].lower() for search_string in search_strings_description)):
-        if embed_data['embed_user'] is not None and interaction_user is not None:
-            if interaction_user != embed_data['embed_user']:
+    if (any(search_string in embed_data.lower.title for search_string in search_strings_title)
+        and any(search_string in embed_data.lower.description for search_string in search_strings_description)):
+        if embed_data.embed_user is not None and interaction_user is not None:
+            if interaction_user != embed_data.embed_user:
                 return add_reaction
         embed_users = []
         if interaction_user is None:
@@ -135,17 +121,17 @@ async def create_larva_reminders_from_overview(message: discord.Message, embed_d
                 await messages.find_message(message.channel.id, regex.COMMAND_INCUBATOR)
             )
             interaction_user = user_command_message.author
-        if embed_data['embed_user'] is None:
-            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data['author']['icon_url'])
+        if embed_data.embed_user is None:
+            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data.author_icon_url)
             if user_id_match:
                 user_id = int(user_id_match.group(1))
                 embed_users.append(message.guild.get_member(user_id))
             else:
-                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
+                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author_name)
                 user_name = user_name_match.group(1)
                 embed_users = await functions.get_guild_member_by_name(message.guild, user_name)
         else:
-            embed_users.append(embed_data['embed_user'])
+            embed_users.append(embed_data.embed_user)
         if interaction_user not in embed_users: return add_reaction
         if user_settings is None:
             try: 
@@ -200,7 +186,7 @@ async def create_larva_reminders_from_overview(message: discord.Message, embed_d
                     
 
         if user_settings.reminder_incubator_upgrade.enabled:
-            incubator_upgrade_match = re.search(r"cooldown:.+`(.+?)`", embed_data['description'].lower())
+            incubator_upgrade_match = re.search(r"cooldown:.+`(.+?)`", embed_data.lower.description)
             if incubator_upgrade_match:
                 user_command = await functions.get_game_command(user_settings, 'incubator upgrade')
                 time_left = await functions.calculate_time_left_from_timestring(message, incubator_upgrade_match.group(1))
@@ -215,7 +201,8 @@ async def create_larva_reminders_from_overview(message: discord.Message, embed_d
     return add_reaction
 
 
-async def create_nugget_alert(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['larva(e)!'])
+async def create_nugget_alert(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                               user_settings: Optional[users.User]) -> bool:
     """Sends a nugget alert when claiming larvae if nuggets are found
 
@@ -233,16 +220,16 @@ async def create_nugget_alert(message: discord.Message, embed_data: Dict, user:
     if message.embeds:
         for field in message.embeds[0].fields:
             fields = f'{fields}\n{field.name}\n{field.value}'
-    if (all(search_string in embed_data['description'].lower() for search_string in search_strings_description)
+    if (all(search_string in embed_data.lower.description for search_string in search_strings_description)
         and 'drops' in fields.lower()):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_INCUBATOR,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -303,7 +290,8 @@ async def create_nugget_alert(message: discord.Message, embed_data: Dict, user:
     return add_reaction
 
 
-async def create_upgrade_reminder(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['you have upgraded your incubator'])
+async def create_upgrade_reminder(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                   user_settings: Optional[users.User]) -> bool:
     """Creates reminder when starting an incubator upgrade
 
@@ -316,15 +304,15 @@ async def create_upgrade_reminder(message: discord.Message, embed_data: Dict, us
     search_strings = [
         'you have upgraded your incubator', #English
     ]
-    if any(search_string in embed_data['description'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.description for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_INCUBATOR,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -2,31 +2,19 @@
 
 import asyncio
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from content import rebirth
 from database import users
+from processing import dispatcher, parsing
 from resources import exceptions, functions, regex
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                           user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all clean related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await call_rebirth_guide(message, embed_data, text_displays, user, user_settings))
-    return any(return_values)
-
-
-async def call_rebirth_guide(message: discord.Message, embed_data: Dict, text_displays: list, interaction_user: Optional[discord.User],
+@dispatcher.handler(author_name=['\'s inventory'], text_displays=['\'s inventory'])
+async def call_rebirth_guide(message: discord.Message, embed_data: parsing.EmbedData, text_displays: list, interaction_user: Optional[discord.User],
                              user_settings: Optional[users.User]) -> bool:
     """Calls the rebirth guide if necessary
 
@@ -39,10 +27,10 @@ async def call_rebirth_guide(message: discord.Message, embed_data: Dict, text_di
     search_strings = [
         '\'s inventory', #English
     ]
-    if (any(search_string in embed_data['author']['name'].lower() for search_string in search_strings)
+    if (any(search_string in embed_data.lower.author_name for search_string in search_strings)
         or any(search_string in text_display.lower() for text_display in text_displays for search_string in search_strings)):
-        if embed_data['embed_user'] is not None and interaction_user is not None:
-            if interaction_user != embed_data['embed_user']:
+        if embed_data.embed_user is not None and interaction_user is not None:
+            if interaction_user != embed_data.embed_user:
                 return add_reaction
         embed_users = []
         user_command_message = (
@@ -50,14 +38,14 @@ async def call_rebirth_guide(message: discord.Message, embed_data: Dict, text_di
         )
         if interaction_user is None:
             interaction_user = user_command_message.author
-        if embed_data['embed_user']:
-            embed_users.append(embed_data['embed_user'])
+        if embed_data.embed_user:
+            embed_users.append(embed_data.embed_user)
         else:
             if text_displays:
                 user_name_match = re.search(regex.USERNAME_FROM_TEXT_DISPLAY, text_displays[0])
             else:
-                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
-            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data['author']['icon_url'])
+                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author_name)
+            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data.author_icon_url)
             if user_id_match:
                 user_id = int(user_id_match.group(1))
                 embed_users.append(message.guild.get_member(user_id))
@@ -79,11 +67,9 @@ async def call_rebirth_guide(message: discord.Message, embed_data: Dict, text_di
         if not user_settings.bot_enabled: return add_reaction
 
         field_items = ''
-        for embed_element, element_data in embed_data.items():
-            if not embed_element.startswith('field'):
-                continue
-            if element_data['name'] == 'Items':
-                field_items = element_data['value']
+        for field in embed_data.fields:
+            if field.name == 'Items':
+                field_items = field.value
                 break
         for text_display in text_displays:
             if '### items' in text_display.lower():
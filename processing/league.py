@@ -1,30 +1,18 @@
 # league.py
 
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import users
+from processing import dispatcher, parsing
 from resources import exceptions, functions, regex, strings
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                           user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all league related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await update_progress_and_call_helper(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def update_progress_and_call_helper(message: discord.Message, embed_data: Dict, interaction_user: Optional[discord.User],
+@dispatcher.handler(field_values=['next cap increase requirement'])
+async def update_progress_and_call_helper(message: discord.Message, embed_data: parsing.EmbedData, interaction_user: Optional[discord.User],
                                           user_settings: Optional[users.User]) -> bool:
     """Updates progress and calls the trophy summary
 
@@ -37,9 +25,9 @@ async def update_progress_and_call_helper(message: discord.Message, embed_data:
     search_strings = [
         'next cap increase requirement', #English
     ]
-    if any(search_string in embed_data['field1']['value'].lower() for search_string in search_strings):
-        if embed_data['embed_user'] is not None and interaction_user is not None:
-            if interaction_user != embed_data['embed_user']:
+    if any(search_string in embed_data.lower.field(1).value for search_string in search_strings):
+        if embed_data.embed_user is not None and interaction_user is not None:
+            if interaction_user != embed_data.embed_user:
                 return add_reaction
         embed_users = []
         user_command_message = (
@@ -47,15 +35,15 @@ async def update_progress_and_call_helper(message: discord.Message, embed_data:
         )
         if interaction_user is None:
             interaction_user = user_command_message.author
-        if embed_data['embed_user'] is None:
-            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data['author']['icon_url'])
+        if embed_data.embed_user is None:
+            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data.author_icon_url)
             if user_id_match:
                 user_id = int(user_id_match.group(1))
                 embed_users.append(message.guild.get_member(user_id))
             else:
-                embed_users = await functions.get_guild_member_by_name(message.guild, embed_data['author']['name'])
+                embed_users = await functions.get_guild_member_by_name(message.guild, embed_data.author_name)
         else:
-            embed_users.append(embed_data['embed_user'])
+            embed_users.append(embed_data.embed_user)
         if interaction_user not in embed_users: return add_reaction
         if user_settings is None:
             try:
@@ -64,24 +52,24 @@ async def update_progress_and_call_helper(message: discord.Message, embed_data:
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
 
-        league_beta = True if 'beta' in embed_data['title'].lower() else False
+        league_beta = True if 'beta' in embed_data.lower.title else False
 
-        trophies_match = re.search(r':trophy:\d+> ([\d,]+)\b', embed_data['title'])
+        trophies_match = re.search(r':trophy:\d+> ([\d,]+)\b', embed_data.title)
         trophies = int(re.sub(r'\D', '', trophies_match.group(1)))
-        diamond_trophies_match = re.search(r':diamondtrophy:\d+> ([\d,]+)\b', embed_data['title'])
+        diamond_trophies_match = re.search(r':diamondtrophy:\d+> ([\d,]+)\b', embed_data.title)
         diamond_trophies = 0
         if diamond_trophies_match:
             diamond_trophies = int(re.sub(r'\D', '', diamond_trophies_match.group(1)))
             
 
-        diamond_rings_match = re.search(r'\*\*(.+?)\*\*\/(.+?)$', embed_data['field1']['value'].split('\n')[0])
+        diamond_rings_match = re.search(r'\*\*(.+?)\*\*\/(.+?)$', embed_data.field(1).value.split('\n')[0])
         diamond_rings = int(re.sub(r'\D', '', diamond_rings_match.group(1)))
         diamond_rings_cap = int(re.sub(r'\D', '', diamond_rings_match.group(2)))
 
-        rebirth_match = re.search(r'rebirths: \*\*(.+?)\*\*', embed_data['field1']['value'], re.IGNORECASE)
+        rebirth_match = re.search(r'rebirths: \*\*(.+?)\*\*', embed_data.field(1).value, re.IGNORECASE)
         rebirth = int(re.sub(r'\D', '', rebirth_match.group(1)))
 
-        beta_pass_match = re.search(r'beta passes available: \*\*(.+?)\*\*\/', embed_data['field1']['value'], re.IGNORECASE)
+        beta_pass_match = re.search(r'beta passes available: \*\*(.+?)\*\*\/', embed_data.field(1).value, re.IGNORECASE)
         beta_pass_available = int(re.sub(r'\D', '', beta_pass_match.group(1)))
 
         kwargs = {}
@@ -0,0 +1,129 @@
+# parsing.py
+"""Parses Tree messages into normalized objects that all processing functions share.
+
+The parsed data is immutable. The lowercased variant is only created when it is needed for the first time and then
+reused by every processing function that looks at the same message.
+"""
+
+from typing import NamedTuple, Tuple
+
+import discord
+
+
+# Containers
+class EmbedField(NamedTuple):
+    """Object that represents a field of an embed."""
+    name: str
+    value: str
+
+
+EMPTY_FIELD = EmbedField('', '')
+
+
+class EmbedData():
+    """Object that represents the data of the first embed of a message.
+    All text attributes are guaranteed to exist and are an empty string if not set in the embed.
+
+    The embed data itself can't be changed. The only exceptions are embed_user and embed_user_settings which are
+    set by DetectionCog after parsing.
+
+    Variants
+    --------
+    lower: The same embed data with all texts lowercased (urls are not changed)
+    """
+    __slots__ = (
+        'author_icon_url', 'author_name', 'description', 'fields', 'footer_icon_url', 'footer_text', 'title',
+        'embed_user', 'embed_user_settings', '_hash', '_lower',
+    )
+
+    def __init__(self, author_icon_url: str = '', author_name: str = '', description: str = '',
+                 fields: Tuple[EmbedField] = (), footer_icon_url: str = '', footer_text: str = '',
+                 title: str = '') -> None:
+        set_attribute = object.__setattr__
+        set_attribute(self, 'author_icon_url', author_icon_url)
+        set_attribute(self, 'author_name', author_name)
+        set_attribute(self, 'description', description)
+        set_attribute(self, 'fields', tuple(fields))
+        set_attribute(self, 'footer_icon_url', footer_icon_url)
+        set_attribute(self, 'footer_text', footer_text)
+        set_attribute(self, 'title', title)
+        set_attribute(self, 'embed_user', None)
+        set_attribute(self, 'embed_user_settings', None)
+        set_attribute(self, '_hash', None)
+        set_attribute(self, '_lower', None)
+
+    def __setattr__(self, name: str, value) -> None:
+        if name not in ('embed_user', 'embed_user_settings'):
+            raise AttributeError(f'EmbedData is immutable, can\'t set "{name}".')
+        object.__setattr__(self, name, value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EmbedData): return NotImplemented
+        return hash(self) == hash(other) and self._get_values() == other._get_values()
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash(self._get_values()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return (
+            f'EmbedData(author_icon_url={self.author_icon_url!r}, author_name={self.author_name!r}, '
+            f'description={self.description!r}, fields={self.fields!r}, footer_icon_url={self.footer_icon_url!r}, '
+            f'footer_text={self.footer_text!r}, title={self.title!r})'
+        )
+
+    @classmethod
+    def from_message(cls, message: discord.Message) -> 'EmbedData':
+        """Parses the first embed of a message. Returns empty embed data if the message has no embed."""
+        if not message.embeds: return cls()
+        embed = message.embeds[0]
+        author_icon_url = author_name = footer_icon_url = footer_text = ''
+        if embed.author:
+            if embed.author.icon_url is not None: author_icon_url = embed.author.icon_url
+            if embed.author.name is not None: author_name = embed.author.name
+        if embed.footer is not None:
+            if embed.footer.icon_url is not None: footer_icon_url = embed.footer.icon_url
+            if embed.footer.text is not None: footer_text = embed.footer.text
+        return cls(
+            author_icon_url = author_icon_url,
+            author_name = author_name,
+            description = embed.description if embed.description is not None else '',
+            fields = tuple(EmbedField(field.name or '', field.value or '') for field in embed.fields),
+            footer_icon_url = footer_icon_url,
+            footer_text = footer_text,
+            title = embed.title if embed.title is not None else '',
+        )
+
+    @property
+    def lower(self) -> 'EmbedData':
+        """Returns the embed data with all texts lowercased. Created once on first use."""
+        if self._lower is None:
+            lower = self._create_variant(str.lower)
+            object.__setattr__(lower, '_lower', lower)
+            object.__setattr__(self, '_lower', lower)
+        return self._lower
+
+    def field(self, index: int) -> EmbedField:
+        """Returns the field at the index. Returns an empty field if the embed doesn't have that many fields."""
+        try:
+            return self.fields[index]
+        except IndexError:
+            return EMPTY_FIELD
+
+    def _create_variant(self, convert) -> 'EmbedData':
+        """Returns a copy of the embed data with all texts converted by the function convert."""
+        return EmbedData(
+            author_icon_url = self.author_icon_url,
+            author_name = convert(self.author_name),
+            description = convert(self.description),
+            fields = tuple(EmbedField(convert(field.name), convert(field.value)) for field in self.fields),
+            footer_icon_url = self.footer_icon_url,
+            footer_text = convert(self.footer_text),
+            title = convert(self.title),
+        )
+
+    def _get_values(self) -> tuple:
+        """Returns all embed values (without embed_user and embed_user_settings)."""
+        return (self.author_icon_url, self.author_name, self.description, self.fields, self.footer_icon_url,
+                self.footer_text, self.title)
@@ -2,32 +2,19 @@
 
 from datetime import datetime, timedelta, timezone
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import errors, reminders, users
+from processing import dispatcher, parsing
 from resources import emojis, exceptions, functions, regex, strings
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all profile or stats related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await create_reminders_from_stats(message, embed_data, text_displays, user, user_settings))
-    return any(return_values)
-
-
-
-async def create_reminders_from_stats(message: discord.Message, embed_data: Dict, text_displays: list, interaction_user: Optional[discord.User],
+@dispatcher.handler(author_name=['\'s tree', '\'s profile'], text_displays=['\'s tree', '\'s profile'])
+async def create_reminders_from_stats(message: discord.Message, embed_data: parsing.EmbedData, text_displays: list, interaction_user: Optional[discord.User],
                                    user_settings: Optional[users.User]) -> bool:
     """Creates research and upgrade reminders from "tree stats" and "tree profile"
 
@@ -43,10 +30,10 @@ async def create_reminders_from_stats(message: discord.Message, embed_data: Dict
         '\'s tree', #English
         '\'s profile', #English
     ]
-    if (any(search_string in embed_data['author']['name'].lower() for search_string in search_strings)
+    if (any(search_string in embed_data.lower.author_name for search_string in search_strings)
         or any(search_string in text_display.lower() for text_display in text_displays for search_string in search_strings)):
-        if embed_data['embed_user'] is not None and interaction_user is not None:
-            if interaction_user != embed_data['embed_user']:
+        if embed_data.embed_user is not None and interaction_user is not None:
+            if interaction_user != embed_data.embed_user:
                 return add_reaction
         embed_users = []
         if interaction_user is None:
@@ -54,17 +41,17 @@ async def create_reminders_from_stats(message: discord.Message, embed_data: Dict
                 await messages.find_message(message.channel.id, regex.COMMAND_PROFILE_STATS)
             )
             interaction_user = user_command_message.author
-        if embed_data['embed_user'] is None:
-            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data['author']['icon_url'])
+        if embed_data.embed_user is None:
+            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data.author_icon_url)
             if user_id_match:
                 user_id = int(user_id_match.group(1))
                 embed_users.append(message.guild.get_member(user_id))
             else:
-                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
+                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author_name)
                 user_name = user_name_match.group(1)
                 embed_users = await functions.get_guild_member_by_name(message.guild, user_name)
         else:
-            embed_users.append(embed_data['embed_user'])
+            embed_users.append(embed_data.embed_user)
         if interaction_user not in embed_users: return add_reaction
         if user_settings is None:
             try:
@@ -77,11 +64,10 @@ async def create_reminders_from_stats(message: discord.Message, embed_data: Dict
         # Store level, xp and rebirth
         level = rebirth = xp = xp_target = -1
         field_statistics = ''
-        for key, value in embed_data.items():
-            if 'field' in key.lower():
-                if 'statistics' in value['name'].lower():
-                    field_statistics = value['value']
-                    break
+        for field in embed_data.fields:
+            if 'statistics' in field.name.lower():
+                field_statistics = field.value
+                break
         for line in field_statistics.split('\n'):
             if 'insecticide' in line.lower():
                 boost_end_match = re.search(r'<t:(\d+?):r>', line.lower())
@@ -134,8 +120,8 @@ async def create_reminders_from_stats(message: discord.Message, embed_data: Dict
         await user_settings.update(level=level, rebirth=rebirth, xp=xp, xp_target=xp_target)
 
         # Sweet apple boost
-        if 'boost active' in embed_data['description'].lower():
-            boost_end_match = re.search(r'<t:(\d+?):r>', embed_data['description'].lower())
+        if 'boost active' in embed_data.lower.description:
+            boost_end_match = re.search(r'<t:(\d+?):r>', embed_data.lower.description)
             activity = 'sweet-apple'
             if boost_end_match:
                 end_time = datetime.fromtimestamp(int(boost_end_match.group(1)), timezone.utc).replace(microsecond=0)
@@ -152,15 +138,14 @@ async def create_reminders_from_stats(message: discord.Message, embed_data: Dict
 
         # Research & Upgrade cooldowns
         field_tool_status = ''
-        for key, value in embed_data.items():
-            if 'field' in key.lower():
-                if 'tool status' in value['name'].lower():
-                    field_tool_status = value['value']
-                    break
+        for field in embed_data.fields:
+            if 'tool status' in field.name.lower():
+                field_tool_status = field.value
+                break
         
         if field_tool_status:
             if user_settings.reminder_research.enabled or user_settings.ready_show_pruner:
-                timestring_match = re.search(r"researching: `(.+?)` remaining", embed_data['field3']['value'].lower())
+                timestring_match = re.search(r"researching: `(.+?)` remaining", embed_data.lower.field(3).value)
                 if timestring_match:
                     user_command = await functions.get_game_command(user_settings, 'laboratory')
                     reminder_message = user_settings.reminder_research.message.replace('{command}', user_command)
@@ -170,7 +155,7 @@ async def create_reminders_from_stats(message: discord.Message, embed_data: Dict
                 else:
                     ready_commands.append('pruner-research')
             if user_settings.reminder_upgrade.enabled or user_settings.ready_show_pruner:
-                timestring_match = re.search(r"upgrading: `(.+?)` remaining", embed_data['field3']['value'].lower())
+                timestring_match = re.search(r"upgrading: `(.+?)` remaining", embed_data.lower.field(3).value)
                 if timestring_match:
                     user_command = await functions.get_game_command(user_settings, 'tool')
                     reminder_message = user_settings.reminder_upgrade.message.replace('{command}', user_command)
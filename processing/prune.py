@@ -4,7 +4,7 @@ import asyncio
 from datetime import timedelta
 from math import ceil, floor
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
@@ -12,25 +12,13 @@ from discord import utils
 from cache import messages
 from content import list_ready
 from database import reminders, tracking, users
+from processing import dispatcher, parsing
 from resources import emojis, exceptions, functions, regex, settings, strings
 from resources.enums import ReadyPopupMode
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all prune related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await create_reminder(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def create_reminder(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(content=['you have pruned your tree'])
+async def create_reminder(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                           user_settings: Optional[users.User]) -> bool:
     """Creates a reminder when using /prune. Also adds an entry to the tracking log and updates the pruner type.
 
@@ -56,9 +44,9 @@ async def create_reminder(message: discord.Message, embed_data: Dict, user: Opti
     ]
     if any(search_string in message.content.lower() for search_string in search_strings) and not message.embeds:
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_name_match = re.search(regex.NAME_FROM_MESSAGE_START, message.content)
                 user_name = user_name_match.group(1)
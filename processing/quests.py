@@ -2,34 +2,20 @@
 
 from datetime import datetime, timedelta, timezone
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import errors, reminders, users
+from processing import dispatcher, parsing
 from resources import exceptions, functions, regex
 from resources.enums import ReadyPopupMode
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all quest related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await create_reminder_on_overview(message, embed_data, user, user_settings))
-    return_values.append(await create_reminder_on_start(message, embed_data, user, user_settings))
-    return_values.append(await create_reminder_when_active(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def create_reminder_on_overview(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['tree quests'])
+async def create_reminder_on_overview(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                       user_settings: Optional[users.User]) -> bool:
     """Creates a reminder when using /quests with no quest active.
 
@@ -42,15 +28,15 @@ async def create_reminder_on_overview(message: discord.Message, embed_data: Dict
     search_strings = [
         'tree quests', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_QUESTS,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -82,7 +68,8 @@ async def create_reminder_on_overview(message: discord.Message, embed_data: Dict
     return add_reaction
 
 
-async def create_reminder_on_start(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['quest started!'])
+async def create_reminder_on_start(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                    user_settings: Optional[users.User]) -> bool:
     """Creates a reminder when starting a quest
 
@@ -95,13 +82,13 @@ async def create_reminder_on_start(message: discord.Message, embed_data: Dict, u
     search_strings = [
         'quest started!', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
-                user_name_match = re.search(r"^\*\*(.+?)\*\*, ", embed_data['description'])
+                user_name_match = re.search(r"^\*\*(.+?)\*\*, ", embed_data.description)
                 user_name = user_name_match.group(1)
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_QUESTS,
@@ -116,7 +103,7 @@ async def create_reminder_on_start(message: discord.Message, embed_data: Dict, u
         if not user_settings.bot_enabled: return add_reaction
         if user_settings.reminder_quests.enabled or user_settings.ready_show_quests:
             user_command = await functions.get_game_command(user_settings, 'quests')
-            quest_type_match = re.search(r'the (.+?) quest', embed_data['description'].lower())
+            quest_type_match = re.search(r'the (.+?) quest', embed_data.lower.description)
             quest_type = quest_type_match.group(1).lower()
             activity = f'quest-{quest_type}'
             time_left = await functions.calculate_time_left_from_cooldown(message, user_settings, activity)
@@ -134,7 +121,8 @@ async def create_reminder_on_start(message: discord.Message, embed_data: Dict, u
     return add_reaction
 
 
-async def create_reminder_when_active(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(author_name=['\'s quest'])
+async def create_reminder_when_active(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                       user_settings: Optional[users.User]) -> bool:
     """Creates a reminder when using /quests with an active quest.
 
@@ -147,13 +135,13 @@ async def create_reminder_when_active(message: discord.Message, embed_data: Dict
     search_strings = [
         '\'s quest', #English
     ]
-    if any(search_string in embed_data['author']['name'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.author_name for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
-                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
+                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author_name)
                 user_name = user_name_match.group(1)
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_QUESTS,
@@ -168,16 +156,12 @@ async def create_reminder_when_active(message: discord.Message, embed_data: Dict
         if not user_settings.bot_enabled: return add_reaction
         if user_settings.reminder_quests.enabled or user_settings.ready_show_quests:
             user_command = await functions.get_game_command(user_settings, 'quests')
-            quest_type_match = re.search(r'> (.+?) quest', embed_data['description'].lower())
+            quest_type_match = re.search(r'> (.+?) quest', embed_data.lower.description)
             quest_start_field = ''
-            for value in embed_data.values():
-                if isinstance(value, dict):
-                    try:
-                        if '<t:' in value['value']:
-                            quest_start_field = value['value']
-                            break
-                    except KeyError:
-                        continue
+            for field in embed_data.fields:
+                if '<t:' in field.value:
+                    quest_start_field = field.value
+                    break
             quest_start_match = re.search(r'<t:(\d+?):d>', quest_start_field.lower())
             quest_type = quest_type_match.group(1).lower()
             activity = f'quest-{quest_type}'
@@ -1,33 +1,18 @@
 # raid.py
 
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import users
+from processing import dispatcher, parsing
 from resources import exceptions, functions, logs, regex, strings
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all raid related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await call_helpers_on_failed_raid(message, embed_data, user, user_settings))
-    return_values.append(await call_helpers_on_successful_raid(message, embed_data, user, user_settings))
-    return_values.append(await call_context_helper_on_empty_energy(message, embed_data, user, user_settings))
-    return_values.append(await update_trophies_on_raid_start(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def call_helpers_on_failed_raid(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['raid failed!'])
+async def call_helpers_on_failed_raid(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                       user_settings: Optional[users.User]) -> bool:
     """Call the context helper and trophy summary on a failed raid
 
@@ -40,13 +25,13 @@ async def call_helpers_on_failed_raid(message: discord.Message, embed_data: Dict
     search_strings_title = [
         'raid failed!', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings_title) and not message.edited_at:
+    if any(search_string in embed_data.lower.title for search_string in search_strings_title) and not message.edited_at:
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
-                user_name = embed_data['author']['name']
+                user_name = embed_data.author_name
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_RAID, user_name=user_name)
                 )
@@ -60,10 +45,10 @@ async def call_helpers_on_failed_raid(message: discord.Message, embed_data: Dict
         if not user_settings.bot_enabled: return add_reaction
 
         diamond_trophies_lost = 0
-        trophies_lost_match = re.search(r'\[trophies:\].+\*\*([\d-]+)\*\*\n', embed_data['field0']['value'],
+        trophies_lost_match = re.search(r'\[trophies:\].+\*\*([\d-]+)\*\*\n', embed_data.field(0).value,
                                         re.IGNORECASE)
         trophies_lost = int(trophies_lost_match.group(1).replace(',',''))
-        diamond_trophies_lost_match = re.search(r'\[diamond trophies:\].+\*\*([\d-]+)\*\*\n', embed_data['field0']['value'],
+        diamond_trophies_lost_match = re.search(r'\[diamond trophies:\].+\*\*([\d-]+)\*\*\n', embed_data.field(0).value,
                                                re.IGNORECASE)
         if diamond_trophies_lost_match:
             diamond_trophies_lost = int(diamond_trophies_lost_match.group(1).replace(',',''))
@@ -81,7 +66,7 @@ async def call_helpers_on_failed_raid(message: discord.Message, embed_data: Dict
             embed = await functions.design_trophy_summary(user_settings)
         if user_settings.helper_context_enabled:
             message_content = f"➜ {strings.SLASH_COMMANDS['raid']}"
-            if 'chest' in embed_data['field0']['value'].lower():
+            if 'chest' in embed_data.lower.field(0).value:
                 message_content = f"➜ {strings.SLASH_COMMANDS['chests']}\n{message_content}"
         if message_content or embed:
             await message.reply(content=message_content, embed=embed)
@@ -89,7 +74,8 @@ async def call_helpers_on_failed_raid(message: discord.Message, embed_data: Dict
     return add_reaction
 
 
-async def call_helpers_on_successful_raid(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['raid successful!'])
+async def call_helpers_on_successful_raid(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                           user_settings: Optional[users.User]) -> bool:
     """Call the context helper and tropy summary on a successful raid
 
@@ -105,13 +91,13 @@ async def call_helpers_on_successful_raid(message: discord.Message, embed_data:
     search_strings_field1 = [
         'damaged chips', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings_title) and not message.edited_at:
+    if any(search_string in embed_data.lower.title for search_string in search_strings_title) and not message.edited_at:
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
-                user_name = embed_data['author']['name']
+                user_name = embed_data.author_name
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_RAID, user_name=user_name)
                 )
@@ -126,7 +112,7 @@ async def call_helpers_on_successful_raid(message: discord.Message, embed_data:
 
         kwargs = {}
         diamond_trophies_gained = diamond_trophies_gain_average = 0
-        trophies_gained_match = re.search(r'\[trophies:\].+\*\*([\d-]+)\*\*\n', embed_data['field0']['value'],
+        trophies_gained_match = re.search(r'\[trophies:\].+\*\*([\d-]+)\*\*\n', embed_data.field(0).value,
                                         re.IGNORECASE)
         trophies_gained = int(trophies_gained_match.group(1).replace(',',''))
 
@@ -159,7 +145,7 @@ async def call_helpers_on_successful_raid(message: discord.Message, embed_data:
         kwargs['trophies_raid_count'] = user_settings.trophies_raid_count + 1
         kwargs['trophies_gain_average'] = round(trophies_gain_average, 5)
         
-        diamond_trophies_gained_match = re.search(r'\[diamond trophies:\].+\*\*([\d-]+)\*\*\n', embed_data['field0']['value'],
+        diamond_trophies_gained_match = re.search(r'\[diamond trophies:\].+\*\*([\d-]+)\*\*\n', embed_data.field(0).value,
                                                re.IGNORECASE)
         if diamond_trophies_gained_match:
             diamond_trophies_gained = int(diamond_trophies_gained_match.group(1).replace(',',''))
@@ -184,7 +170,7 @@ async def call_helpers_on_successful_raid(message: discord.Message, embed_data:
             kwargs['beta_pass_available'] = user_settings.beta_pass_available - 1
             kwargs['diamond_rings_cap'] = user_settings.diamond_rings_cap + 1_350
 
-        if 'chest' in embed_data['field0']['value'].lower():
+        if 'chest' in embed_data.lower.field(0).value:
             kwargs['chests_in_queue'] = user_settings.chests_in_queue + 1
 
         await user_settings.update(**kwargs)
@@ -195,14 +181,15 @@ async def call_helpers_on_successful_raid(message: discord.Message, embed_data:
             embed = await functions.design_trophy_summary(user_settings)
         if user_settings.helper_context_enabled:
             message_content = f"➜ {strings.SLASH_COMMANDS['raid']}"
-            if 'chest' in embed_data['field0']['value'].lower():
+            if 'chest' in embed_data.lower.field(0).value:
                 message_content = f"➜ {strings.SLASH_COMMANDS['chests']}\n{message_content}"
         if message_content or embed:
             await message.reply(content=message_content, embed=embed)
     return add_reaction
 
 
-async def call_context_helper_on_empty_energy(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['something went wrong...'])
+async def call_context_helper_on_empty_energy(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                               user_settings: Optional[users.User]) -> bool:
     """Call the context helper when trying to raid with no energy
 
@@ -212,14 +199,14 @@ async def call_context_helper_on_empty_energy(message: discord.Message, embed_da
     - False otherwise
     """
     add_reaction = False
-    if ('something went wrong...' in embed_data['title'].lower()
-        and 'energy to start a raid' in embed_data['description'].lower()):
+    if ('something went wrong...' in embed_data.lower.title
+        and 'energy to start a raid' in embed_data.lower.description):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
-                user_name = re.search(r'> \*\*(.+?)\*\*, ', embed_data['description']).group(1)
+                user_name = re.search(r'> \*\*(.+?)\*\*, ', embed_data.description).group(1)
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_RAID, user_name=user_name)
                 )
@@ -239,7 +226,8 @@ async def call_context_helper_on_empty_energy(message: discord.Message, embed_da
     return add_reaction
 
 
-async def update_trophies_on_raid_start(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(footer_text=['you have 5 minutes to start the raid'])
+async def update_trophies_on_raid_start(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                         user_settings: Optional[users.User]) -> bool:
     """Update trophy count when starting a raid
 
@@ -252,9 +240,9 @@ async def update_trophies_on_raid_start(message: discord.Message, embed_data: Di
     search_strings = [
         'you have 5 minutes to start the raid', #English
     ]
-    if any(search_string in embed_data['footer']['text'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.footer_text for search_string in search_strings):
         if user is None:
-            user_name_match = re.search(r'^(.+?),', embed_data['footer']['text'])
+            user_name_match = re.search(r'^(.+?),', embed_data.footer_text)
             user_name = user_name_match.group(1)
             user_command_message = (
                 await messages.find_message(message.channel.id, regex.COMMAND_RAID, user_name=user_name)
@@ -269,7 +257,7 @@ async def update_trophies_on_raid_start(message: discord.Message, embed_data: Di
         if not user_settings.bot_enabled: return add_reaction
 
         kwargs = {}
-        trophies_match = re.search(r'trophy:.+?\s(.+?)$', embed_data['title'], re.IGNORECASE)
+        trophies_match = re.search(r'trophy:.+?\s(.+?)$', embed_data.title, re.IGNORECASE)
         trophies = int(re.sub(r'\D', '', trophies_match.group(1)))
         kwargs['trophies'] = trophies
         
@@ -1,31 +1,19 @@
 # rebirth.py
 
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 from humanfriendly import format_timespan
 
 from database import tracking, users
+from processing import dispatcher, parsing
 from resources import emojis, exceptions, settings
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all rebirth related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await track_rebirth_and_show_summary(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def track_rebirth_and_show_summary(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['** used rebirth!'])
+async def track_rebirth_and_show_summary(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                          user_settings: Optional[users.User]) -> bool:
     """Tracks rebirth and shows a summary if enabled
 
@@ -38,8 +26,8 @@ async def track_rebirth_and_show_summary(message: discord.Message, embed_data: D
     search_strings = [
         '** used rebirth!', #English
     ]
-    if any(search_string in embed_data['description'].lower() for search_string in search_strings):
-        rebirth_string, user_id_string = embed_data['footer']['text'].split('\n')
+    if any(search_string in embed_data.lower.description for search_string in search_strings):
+        rebirth_string, user_id_string = embed_data.footer_text.split('\n')
         if user is None:
             user_id_match = re.search(r'^user id: (.+?)$', user_id_string.lower())
             user = message.guild.get_member(int(user_id_match.group(1)))
@@ -2,33 +2,19 @@
 
 from datetime import datetime, timedelta, timezone
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import reminders, users
+from processing import dispatcher, parsing
 from resources import emojis, exceptions, functions, regex, strings
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all /shop related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await create_reminder_on_buying_boost(message, embed_data, user, user_settings))
-    return_values.append(await reduce_diamond_rings_on_seasonal_purchase(message, embed_data, user, user_settings))
-    return_values.append(await update_status_on_buying_beta_pass(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def create_reminder_on_buying_boost(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['boost activated!'])
+async def create_reminder_on_buying_boost(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                           user_settings: Optional[users.User]) -> bool:
     """Create a reminder when a boost is bought.
 
@@ -41,20 +27,20 @@ async def create_reminder_on_buying_boost(message: discord.Message, embed_data:
     search_strings = [
         'boost activated!', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_SHOP,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 if user_command_message is not None:
                     user = user_command_message.author
                 else:
-                    embed_users = await functions.get_guild_member_by_name(message.guild, embed_data['author']['name'])
+                    embed_users = await functions.get_guild_member_by_name(message.guild, embed_data.author_name)
                     if len(embed_users) == 1:
                         user = embed_users[0]
                     else:
@@ -65,10 +51,10 @@ async def create_reminder_on_buying_boost(message: discord.Message, embed_data:
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.reminder_boosts.enabled: return add_reaction
-        boost_name_match = re.search(r'bought a \*\*(.+?)\*\*!', embed_data['description'].lower()) 
+        boost_name_match = re.search(r'bought a \*\*(.+?)\*\*!', embed_data.lower.description) 
         boost_name = boost_name_match.group(1)
         activity = strings.ACTIVITIES_NAME_BOOSTS[boost_name]
-        boost_end_match = re.search(r'<t:(\d+?):r>', embed_data['description'].lower())
+        boost_end_match = re.search(r'<t:(\d+?):r>', embed_data.lower.description)
         end_time = datetime.fromtimestamp(int(boost_end_match.group(1)), timezone.utc).replace(microsecond=0)
         current_time = utils.utcnow().replace(microsecond=0)
         time_left = end_time - current_time
@@ -93,7 +79,8 @@ async def create_reminder_on_buying_boost(message: discord.Message, embed_data:
     return add_reaction
 
 
-async def reduce_diamond_rings_on_seasonal_purchase(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['purchase completed!'])
+async def reduce_diamond_rings_on_seasonal_purchase(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                                     user_settings: Optional[users.User]) -> bool:
     """Reduces diamond rings when buying seasonal items
 
@@ -106,21 +93,21 @@ async def reduce_diamond_rings_on_seasonal_purchase(message: discord.Message, em
     search_strings = [
         'purchase completed!', #English
     ]
-    if (any(search_string in embed_data['title'].lower() for search_string in search_strings)
-        and 'diamondring' in embed_data['description'].lower()):
+    if (any(search_string in embed_data.lower.title for search_string in search_strings)
+        and 'diamondring' in embed_data.lower.description):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_SHOP,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 if user_command_message is not None:
                     user = user_command_message.author
                 else:
-                    embed_users = await functions.get_guild_member_by_name(message.guild, embed_data['author']['name'])
+                    embed_users = await functions.get_guild_member_by_name(message.guild, embed_data.author_name)
                     if len(embed_users) == 1:
                         user = embed_users[0]
                     else:
@@ -132,7 +119,7 @@ async def reduce_diamond_rings_on_seasonal_purchase(message: discord.Message, em
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
         
-        diamond_rings_spent_match = re.search(r'for \*\*\[(.+?)\]', embed_data['description'].lower()) 
+        diamond_rings_spent_match = re.search(r'for \*\*\[(.+?)\]', embed_data.lower.description) 
         diamond_rings_spent = int(re.sub(r'\D', '', diamond_rings_spent_match.group(1)))
         diamond_rings = user_settings.diamond_rings - diamond_rings_spent
         if diamond_rings < 0: diamond_rings = 0
@@ -156,7 +143,8 @@ async def reduce_diamond_rings_on_seasonal_purchase(message: discord.Message, em
     return add_reaction
 
 
-async def update_status_on_buying_beta_pass(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['promoted to **league beta**!'])
+async def update_status_on_buying_beta_pass(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                               user_settings: Optional[users.User]) -> bool:
     """Update beta status when a beta pass is bought.
 
@@ -169,20 +157,20 @@ async def update_status_on_buying_beta_pass(message: discord.Message, embed_data
     search_strings = [
         'promoted to **league beta**!', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_SHOP,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 if user_command_message is not None:
                     user = user_command_message.author
                 else:
-                    embed_users = await functions.get_guild_member_by_name(message.guild, embed_data['author']['name'])
+                    embed_users = await functions.get_guild_member_by_name(message.guild, embed_data.author_name)
                     if len(embed_users) == 1:
                         user = embed_users[0]
                     else:
@@ -2,34 +2,19 @@
 
 from datetime import datetime, timedelta, timezone
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import reminders, users
+from processing import dispatcher, parsing
 from resources import exceptions, functions, regex, strings
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all tool related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await call_context_helper_on_upgrade_claim(message, embed_data, user, user_settings))
-    return_values.append(await create_reminder_when_active(message, embed_data, user, user_settings))
-    return_values.append(await delete_reminder_on_cancel(message, embed_data, user, user_settings))
-    return_values.append(await delete_reminder_on_skip(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def call_context_helper_on_upgrade_claim(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['upgrade ended!'])
+async def call_context_helper_on_upgrade_claim(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                               user_settings: Optional[users.User]) -> bool:
     """Call the context helper after claiming n upgrade
 
@@ -42,15 +27,15 @@ async def call_context_helper_on_upgrade_claim(message: discord.Message, embed_d
     search_strings = [
         'upgrade ended!', #English
     ]
-    if any(search_string in embed_data['description'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.description for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_TOOL,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -59,7 +44,7 @@ async def call_context_helper_on_upgrade_claim(message: discord.Message, embed_d
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.helper_context_enabled: return add_reaction
-        level_match = re.search(r'level (\d+?) tier', embed_data['title'].lower())
+        level_match = re.search(r'level (\d+?) tier', embed_data.lower.title)
         level = int(level_match.group(1))
         if level == 10:
             command = strings.SLASH_COMMANDS['laboratory']
@@ -69,7 +54,8 @@ async def call_context_helper_on_upgrade_claim(message: discord.Message, embed_d
     return add_reaction
 
 
-async def create_reminder_when_active(message: discord.Message, embed_data: Dict, interaction_user: Optional[discord.User],
+@dispatcher.handler(description=['upgrading to level', 'drop nuggets from pruning'])
+async def create_reminder_when_active(message: discord.Message, embed_data: parsing.EmbedData, interaction_user: Optional[discord.User],
                                    user_settings: Optional[users.User]) -> bool:
     """Creates a reminder when having an upgrade active. This also includes starting an upgrade.
 
@@ -83,9 +69,9 @@ async def create_reminder_when_active(message: discord.Message, embed_data: Dict
         'upgrading to level', #English
         'drop nuggets from pruning', #English
     ]
-    if any(search_string in embed_data['description'].lower() for search_string in search_strings):
-        if embed_data['embed_user'] is not None and interaction_user is not None:
-            if interaction_user != embed_data['embed_user'] != interaction_user:
+    if any(search_string in embed_data.lower.description for search_string in search_strings):
+        if embed_data.embed_user is not None and interaction_user is not None:
+            if interaction_user != embed_data.embed_user != interaction_user:
                 return add_reaction
         embed_users = []
         if interaction_user is None:
@@ -93,15 +79,15 @@ async def create_reminder_when_active(message: discord.Message, embed_data: Dict
                 await messages.find_message(message.channel.id, regex.COMMAND_TOOL)
             )
             interaction_user = user_command_message.author
-        if embed_data['embed_user'] is None:
-            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data['author']['icon_url'])
+        if embed_data.embed_user is None:
+            user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data.author_icon_url)
             if user_id_match:
                 user_id = int(user_id_match.group(1))
                 embed_users.append(message.guild.get_member(user_id))
             else:
-                embed_users = await functions.get_guild_member_by_name(message.guild, embed_data['author']['name'])
+                embed_users = await functions.get_guild_member_by_name(message.guild, embed_data.author_name)
         else:
-            embed_users.append(embed_data['embed_user'])
+            embed_users.append(embed_data.embed_user)
         if interaction_user not in embed_users: return add_reaction
         if user_settings is None:
             try:
@@ -110,8 +96,8 @@ async def create_reminder_when_active(message: discord.Message, embed_data: Dict
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
 
-        level_tier_match = re.search(r'level (\d+?) tier (.+?) ', embed_data['title'].lower())
-        type_match = re.search(r':(.+?)pruner:', embed_data['title'].lower())
+        level_tier_match = re.search(r'level (\d+?) tier (.+?) ', embed_data.lower.title)
+        type_match = re.search(r':(.+?)pruner:', embed_data.lower.title)
         pruner_level = int(level_tier_match.group(1))
         pruner_tier = int(strings.NUMBERS_ROMAN_ARABIC[level_tier_match.group(2)])
         pruner_type = type_match.group(1)
@@ -120,7 +106,7 @@ async def create_reminder_when_active(message: discord.Message, embed_data: Dict
 
         if user_settings.reminder_upgrade.enabled or user_settings.ready_show_pruner:
             user_command = await functions.get_game_command(user_settings, 'tool')
-            upgrade_end_match = re.search(r'<t:(\d+?):f>', embed_data['field0']['value'].lower())
+            upgrade_end_match = re.search(r'<t:(\d+?):f>', embed_data.lower.field(0).value)
             if not upgrade_end_match: return add_reaction
             end_time = datetime.fromtimestamp(int(upgrade_end_match.group(1)), timezone.utc).replace(microsecond=0)
             current_time = utils.utcnow().replace(microsecond=0)
@@ -135,7 +121,8 @@ async def create_reminder_when_active(message: discord.Message, embed_data: Dict
     return add_reaction
 
 
-async def delete_reminder_on_cancel(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['you have been refund'])
+async def delete_reminder_on_cancel(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                     user_settings: Optional[users.User]) -> bool:
     """Deletes a reminder when canceling an upgrade.
 
@@ -148,8 +135,8 @@ async def delete_reminder_on_cancel(message: discord.Message, embed_data: Dict,
     search_strings = [
         'you have been refund', #English
     ]
-    if (any(search_string in embed_data['description'].lower() for search_string in search_strings)
-        and 'coin' in embed_data['description'].lower()):
+    if (any(search_string in embed_data.lower.description for search_string in search_strings)
+        and 'coin' in embed_data.lower.description):
         if user is None: user = message.mentions[0]
         if user_settings is None:
             try:
@@ -166,7 +153,8 @@ async def delete_reminder_on_cancel(message: discord.Message, embed_data: Dict,
     return add_reaction
 
 
-async def delete_reminder_on_skip(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['you have skipped the upgrade'])
+async def delete_reminder_on_skip(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                   user_settings: Optional[users.User]) -> bool:
     """Deletes a reminder when skipping an upgrade.
 
@@ -179,13 +167,13 @@ async def delete_reminder_on_skip(message: discord.Message, embed_data: Dict, us
     search_strings = [
         'you have skipped the upgrade', #English
     ]
-    if any(search_string in embed_data['description'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.description for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
-                user_name_match = re.search(r"^\*\*(.+?)\*\*, ", embed_data['description'])
+                user_name_match = re.search(r"^\*\*(.+?)\*\*, ", embed_data.description)
                 user_name = user_name_match.group(1)
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_TOOL,
@@ -2,36 +2,19 @@
 
 from datetime import datetime, timedelta, timezone
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import reminders, users
+from processing import dispatcher, parsing
 from resources import emojis, exceptions, functions, regex, strings
 
 
-async def process_message(message: discord.Message, embed_data: Dict, text_displays: list, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
-    """Processes the message for all /use related actions.
-
-    Returns
-    -------
-    - True if a logo reaction should be added to the message
-    - False otherwise
-    """
-    return_values = []
-    return_values.append(await call_context_helper_on_energy_drink(message, embed_data, user, user_settings))
-    return_values.append(await create_reminder_on_easter_candy(message, embed_data, user, user_settings))
-    return_values.append(await create_reminder_on_insecticide(message, embed_data, user, user_settings))
-    return_values.append(await create_reminder_on_sweet_apple(message, embed_data, user, user_settings))
-    return_values.append(await update_rebirth_on_easter_eggs(message, embed_data, user, user_settings))
-    return_values.append(await update_xp_on_water_bottle(message, embed_data, user, user_settings))
-    return any(return_values)
-
-
-async def call_context_helper_on_energy_drink(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['you drank'])
+async def call_context_helper_on_energy_drink(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                               user_settings: Optional[users.User]) -> bool:
     """Call the context helper when using an energy drink
 
@@ -47,14 +30,14 @@ async def call_context_helper_on_energy_drink(message: discord.Message, embed_da
     search_strings_2 = [
         'energy drink', #English
     ]
-    if (any(search_string in embed_data['title'].lower() for search_string in search_strings_1)
-        and any(search_string in embed_data['title'].lower() for search_string in search_strings_2)):
+    if (any(search_string in embed_data.lower.title for search_string in search_strings_1)
+        and any(search_string in embed_data.lower.title for search_string in search_strings_2)):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
-                user_name = embed_data['author']['name']
+                user_name = embed_data.author_name
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_USE_ENERGY_DRINK, user_name=user_name)
                 )
@@ -69,7 +52,8 @@ async def call_context_helper_on_energy_drink(message: discord.Message, embed_da
     return add_reaction
 
 
-async def create_reminder_on_easter_candy(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['will attract the bunnies twice', 'you already are chewing a candy'])
+async def create_reminder_on_easter_candy(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                          user_settings: Optional[users.User]) -> bool:
     """Create a reminder when an easter candy is used.
 
@@ -83,15 +67,15 @@ async def create_reminder_on_easter_candy(message: discord.Message, embed_data:
         'will attract the bunnies twice', #English 1
         'you already are chewing a candy', #English 2
     ]
-    if any(search_string in embed_data['description'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.description for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_USE_CANDY,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -100,7 +84,7 @@ async def create_reminder_on_easter_candy(message: discord.Message, embed_data:
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.reminder_boosts.enabled: return add_reaction
-        boost_end_match = re.search(r'<t:(\d+?):r>', embed_data['field0']['value'].lower())
+        boost_end_match = re.search(r'<t:(\d+?):r>', embed_data.lower.field(0).value)
         end_time = datetime.fromtimestamp(int(boost_end_match.group(1)), timezone.utc).replace(microsecond=0)
         current_time = utils.utcnow().replace(microsecond=0)
         time_left = end_time - current_time
@@ -118,7 +102,8 @@ async def create_reminder_on_easter_candy(message: discord.Message, embed_data:
     return add_reaction
 
 
-async def create_reminder_on_insecticide(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['insecticide active!'])
+async def create_reminder_on_insecticide(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                          user_settings: Optional[users.User]) -> bool:
     """Create a reminder when an insecticide is used.
 
@@ -131,15 +116,15 @@ async def create_reminder_on_insecticide(message: discord.Message, embed_data: D
     search_strings = [
         'insecticide active!', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_USE_INSECTICIDE,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -148,7 +133,7 @@ async def create_reminder_on_insecticide(message: discord.Message, embed_data: D
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.reminder_boosts.enabled: return add_reaction
-        boost_end_match = re.search(r'<t:(\d+?):r>', embed_data['description'].lower())
+        boost_end_match = re.search(r'<t:(\d+?):r>', embed_data.lower.description)
         end_time = datetime.fromtimestamp(int(boost_end_match.group(1)), timezone.utc).replace(microsecond=0)
         current_time = utils.utcnow().replace(microsecond=0)
         time_left = end_time - current_time
@@ -166,7 +151,8 @@ async def create_reminder_on_insecticide(message: discord.Message, embed_data: D
     return add_reaction
 
 
-async def create_reminder_on_sweet_apple(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['you have thrown a sweet apple to your tree!'])
+async def create_reminder_on_sweet_apple(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                          user_settings: Optional[users.User]) -> bool:
     """Create a reminder when a sweet apple is used.
 
@@ -179,15 +165,15 @@ async def create_reminder_on_sweet_apple(message: discord.Message, embed_data: D
     search_strings = [
         'you have thrown a sweet apple to your tree!', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_USE_SWEET_APPLE,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -196,7 +182,7 @@ async def create_reminder_on_sweet_apple(message: discord.Message, embed_data: D
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.reminder_boosts.enabled: return add_reaction
-        boost_end_match = re.search(r'<t:(\d+?):r>', embed_data['description'].lower())
+        boost_end_match = re.search(r'<t:(\d+?):r>', embed_data.lower.description)
         end_time = datetime.fromtimestamp(int(boost_end_match.group(1)), timezone.utc).replace(microsecond=0)
         current_time = utils.utcnow().replace(microsecond=0)
         time_left = end_time - current_time
@@ -220,7 +206,8 @@ async def create_reminder_on_sweet_apple(message: discord.Message, embed_data: D
     return add_reaction
 
 
-async def update_rebirth_on_easter_eggs(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(description=['you have opened'])
+async def update_rebirth_on_easter_eggs(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                           user_settings: Optional[users.User]) -> bool:
     """Update rebirth count when using easter eggs.
 
@@ -233,16 +220,16 @@ async def update_rebirth_on_easter_eggs(message: discord.Message, embed_data: Di
     search_strings = [
         'you have opened', #English
     ]
-    if (any(search_string in embed_data['description'].lower() for search_string in search_strings)
-        and 'easter eggs' in embed_data['description'].lower()):
+    if (any(search_string in embed_data.lower.description for search_string in search_strings)
+        and 'easter eggs' in embed_data.lower.description):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_USE_EASTER_EGG,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -253,11 +240,9 @@ async def update_rebirth_on_easter_eggs(message: discord.Message, embed_data: Di
         if not user_settings.bot_enabled: return add_reaction
 
         special_rewards = ''
-        for embed_element, element_data in embed_data.items():
-            if not embed_element.startswith('field'):
-                continue
-            if element_data['name'].lower() == 'special rewards':
-                special_rewards = element_data['value']
+        for field in embed_data.fields:
+            if field.name.lower() == 'special rewards':
+                special_rewards = field.value
                 break
         if not special_rewards:
             return add_reaction
@@ -269,7 +254,8 @@ async def update_rebirth_on_easter_eggs(message: discord.Message, embed_data: Di
     return add_reaction
 
 
-async def update_xp_on_water_bottle(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+@dispatcher.handler(title=['your tree has been hydrated!'])
+async def update_xp_on_water_bottle(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                     user_settings: Optional[users.User]) -> bool:
     """Update XP when a water bottle is used.
 
@@ -282,15 +268,15 @@ async def update_xp_on_water_bottle(message: discord.Message, embed_data: Dict,
     search_strings = [
         'your tree has been hydrated!', #English
     ]
-    if any(search_string in embed_data['title'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.lower.title for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if embed_data.embed_user is not None:
+                user = embed_data.embed_user
+                user_settings = embed_data.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_USE_SWEET_APPLE,
-                                                user_name=embed_data['author']['name'])
+                                                user_name=embed_data.author_name)
                 )
                 user = user_command_message.author
         if user_settings is None:
@@ -299,7 +285,7 @@ async def update_xp_on_water_bottle(message: discord.Message, embed_data: Dict,
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.helper_prune_enabled: return add_reaction
-        xp_gain_end_match = re.search(r'gained \*\*(.+?)\*\* exp', embed_data['description'].lower())
+        xp_gain_end_match = re.search(r'gained \*\*(.+?)\*\* exp', embed_data.lower.description)
         xp_gain = int(re.sub(r'\D', '', xp_gain_end_match.group(1)))
         if user_settings.xp_target == 0 or user_settings.level == 0: return add_reaction
         new_xp = user_settings.xp + xp_gain
@@ -0,0 +1,233 @@
+# delivery.py
+"""Contains the queue that sends reminder messages.
+
+Reminders are not sent right away. The first message queued for a channel waits DELIVERY_COALESCE_WINDOW seconds,
+and everything queued for the same channel until then is sent together in as few messages as possible (up to
+MESSAGE_MAX_LENGTH characters each). This turns bursts like the calendar reminders after midnight or a guild full of
+prune reminders into a few messages per channel instead of one message per reminder.
+
+All messages are sent by one worker that keeps within two token buckets: one per channel and one for the whole bot.
+If a bucket is empty, the worker waits until it refilled instead of running into the rate limits of Discord. Channels
+that have to wait don't hold up the others.
+
+Callers await their message like a normal send, so errors like missing permissions still reach them. If several
+messages were merged, they all get the result of the merged message.
+"""
+
+import asyncio
+from collections import OrderedDict
+import heapq
+import time
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import discord
+
+from resources import logs
+
+
+DELIVERY_COALESCE_WINDOW = 1.0 # Seconds the first message of a channel waits for more messages
+DELIVERY_CHANNEL_RATE = 1.0 # Messages per second per channel
+DELIVERY_CHANNEL_BURST = 5 # Messages a channel can send at once
+DELIVERY_GLOBAL_RATE = 40.0 # Messages per second for all channels
+DELIVERY_GLOBAL_BURST = 40 # Messages all channels can send at once
+DELIVERY_MAX_CHANNEL_BUCKETS = 10_000 # A channel that lost its bucket starts with a full one again
+MESSAGE_MAX_LENGTH = 2_000
+
+_STATS = {'queued': 0, 'sent': 0, 'messages': 0, 'errors': 0, 'lag_total': 0.0, 'lag_max': 0.0}
+
+
+# Containers
+class TokenBucket():
+    """Object that allows `rate` messages per second on average and up to `capacity` messages at once."""
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate: float = rate
+        self.capacity: int = capacity
+        self.tokens: float = capacity
+        self.updated: float = time.monotonic()
+
+    def _refill(self, current_time: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (current_time - self.updated) * self.rate)
+        self.updated = current_time
+
+    def get_wait_time(self, current_time: float) -> float:
+        """Returns the seconds until a message can be sent (0 if it can be sent right away)."""
+        self._refill(current_time)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, current_time: float) -> None:
+        """Uses up a token. Only call this if get_wait_time returned 0."""
+        self._refill(current_time)
+        self.tokens -= 1
+
+
+class _Delivery(NamedTuple):
+    """Object that represents a message waiting to be sent."""
+    channel: discord.abc.Messageable
+    content: str
+    users: Tuple[discord.abc.Snowflake, ...] # Users that are allowed to be mentioned
+    queued_time: float # monotonic
+    future: asyncio.Future
+
+
+class DeliveryStats(NamedTuple):
+    """Object that represents the current state of the delivery queue.
+    Lag is measured from queueing a message until it was sent."""
+    pending: int # Messages waiting to be sent
+    channels: int # Channels with messages waiting to be sent
+    queued: int
+    sent: int
+    messages: int # Messages sent to Discord after merging
+    errors: int
+    lag_average: float # ms
+    lag_max: float # ms
+
+
+_PENDING: Dict[int, List[_Delivery]] = {} # channel id: messages waiting to be sent, oldest first
+_READY_HEAP: List[Tuple[float, int]] = [] # (time the channel can send (monotonic), channel id), one per channel
+_CHANNEL_BUCKETS: 'OrderedDict[int, TokenBucket]' = OrderedDict() # channel id: bucket, least recently used first
+_GLOBAL_BUCKET = TokenBucket(DELIVERY_GLOBAL_RATE, DELIVERY_GLOBAL_BURST)
+_QUEUE_CHANGED = asyncio.Event()
+_SENDING: Set[asyncio.Task] = set()
+_WORKER: Optional[asyncio.Task] = None
+
+
+def _get_channel_bucket(channel_id: int) -> TokenBucket:
+    bucket = _CHANNEL_BUCKETS.get(channel_id)
+    if bucket is None:
+        bucket = _CHANNEL_BUCKETS[channel_id] = TokenBucket(DELIVERY_CHANNEL_RATE, DELIVERY_CHANNEL_BURST)
+        if len(_CHANNEL_BUCKETS) > DELIVERY_MAX_CHANNEL_BUCKETS:
+            _CHANNEL_BUCKETS.popitem(last=False)
+    else:
+        _CHANNEL_BUCKETS.move_to_end(channel_id)
+    return bucket
+
+
+def _queue_channel(channel_id: int, ready_time: float) -> None:
+    """Adds a channel to the channels that send once ready_time is reached. Wakes up the worker if the channel is
+    ready before all others."""
+    heapq.heappush(_READY_HEAP, (ready_time, channel_id))
+    if _READY_HEAP[0][1] == channel_id: _QUEUE_CHANGED.set()
+
+
+def _merge(deliveries: List[_Delivery]) -> Tuple[List[_Delivery], List[_Delivery]]:
+    """Splits the messages of a channel into the ones that fit into the next message and the rest.
+    The first message is always taken, even if it is too long on its own, so Discord can refuse it."""
+    length = len(deliveries[0].content)
+    for index, delivery in enumerate(deliveries[1:], start=1):
+        length += len(delivery.content) + 1
+        if length > MESSAGE_MAX_LENGTH: return deliveries[:index], deliveries[index:]
+    return deliveries, []
+
+
+async def _send(deliveries: List[_Delivery]) -> None:
+    """Sends merged messages and hands the result to everyone waiting for them."""
+    users = {}
+    for delivery in deliveries:
+        for user in delivery.users:
+            users[user.id] = user
+    content = '\n'.join(delivery.content for delivery in deliveries)
+    error = None
+    try:
+        await deliveries[0].channel.send(content, allowed_mentions=discord.AllowedMentions(users=list(users.values())))
+    except Exception as send_error:
+        error = send_error
+        _STATS['errors'] += 1
+    sent_time = time.monotonic()
+    _STATS['messages'] += 1
+    for delivery in deliveries:
+        lag = sent_time - delivery.queued_time
+        _STATS['sent'] += 1
+        _STATS['lag_total'] += lag
+        if lag > _STATS['lag_max']: _STATS['lag_max'] = lag
+        if delivery.future.done(): continue
+        if error is None:
+            delivery.future.set_result(None)
+        else:
+            delivery.future.set_exception(error)
+
+
+async def _run_worker() -> None:
+    """Sends the messages of all channels that are ready, as fast as the token buckets allow."""
+    while True:
+        _QUEUE_CHANGED.clear()
+        if not _READY_HEAP:
+            await _QUEUE_CHANGED.wait()
+            continue
+        ready_time, channel_id = _READY_HEAP[0]
+        current_time = time.monotonic()
+        wait_time = max(ready_time - current_time, _GLOBAL_BUCKET.get_wait_time(current_time))
+        if wait_time > 0:
+            try:
+                await asyncio.wait_for(_QUEUE_CHANGED.wait(), wait_time)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        heapq.heappop(_READY_HEAP)
+        # Messages of cancelled reminders are dropped
+        deliveries = [delivery for delivery in _PENDING.pop(channel_id, []) if not delivery.future.done()]
+        if not deliveries: continue
+        channel_bucket = _get_channel_bucket(channel_id)
+        channel_wait_time = channel_bucket.get_wait_time(current_time)
+        if channel_wait_time > 0:
+            _PENDING[channel_id] = deliveries
+            _queue_channel(channel_id, current_time + channel_wait_time)
+            continue
+        _GLOBAL_BUCKET.take(current_time)
+        channel_bucket.take(current_time)
+        deliveries, rest = _merge(deliveries)
+        if rest:
+            _PENDING[channel_id] = rest
+            _queue_channel(channel_id, current_time)
+        task = asyncio.create_task(_send(deliveries))
+        _SENDING.add(task)
+        task.add_done_callback(_SENDING.discard)
+
+
+def _log_worker_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logs.logger.error(f'Delivery queue stopped: {task.exception()!r}')
+
+
+async def send(channel: discord.abc.Messageable, content: str, users: Tuple[discord.abc.Snowflake, ...] = ()) -> None:
+    """Queues a message and waits until it was sent. Messages for the same channel are sent together if they are
+    queued within DELIVERY_COALESCE_WINDOW seconds. Cancelling the caller before the message was sent drops it.
+
+    Arguments
+    ---------
+    channel: The channel the message is sent to.
+    content: The message. Must not be longer than MESSAGE_MAX_LENGTH.
+    users: The users that are allowed to be mentioned by the message.
+
+    Raises
+    ------
+    discord.HTTPException (e.g. discord.Forbidden) if the message could not be sent.
+    """
+    global _WORKER
+    if _WORKER is None or _WORKER.done():
+        _WORKER = asyncio.create_task(_run_worker())
+        _WORKER.add_done_callback(_log_worker_error)
+    current_time = time.monotonic()
+    future = asyncio.get_running_loop().create_future()
+    pending = _PENDING.get(channel.id)
+    if pending is None:
+        pending = _PENDING[channel.id] = []
+        _queue_channel(channel.id, current_time + DELIVERY_COALESCE_WINDOW)
+    pending.append(_Delivery(channel, content, tuple(users), current_time, future))
+    _STATS['queued'] += 1
+    await future
+
+
+def get_stats() -> DeliveryStats:
+    """Returns the size of the queue and the counters and delivery lag of all sent messages."""
+    return DeliveryStats(
+        pending = sum(len(deliveries) for deliveries in _PENDING.values()),
+        channels = len(_PENDING),
+        queued = _STATS['queued'],
+        sent = _STATS['sent'],
+        messages = _STATS['messages'],
+        errors = _STATS['errors'],
+        lag_average = _STATS['lag_total'] / _STATS['sent'] * 1_000 if _STATS['sent'] else 0.0,
+        lag_max = _STATS['lag_max'] * 1_000,
+    )
@@ -116,18 +116,12 @@ async def get_guild_member_by_name(guild: discord.Guild, user_name: str) -> List
 async def calculate_time_left_from_cooldown(message: discord.Message, user_settings: users.User, activity: str) -> timedelta:
     """Returns the time left for a reminder based on a cooldown."""
     slash_command = True if message.interaction is not None else False
-    cooldown: cooldowns.Cooldown = await cooldowns.get_cooldown(activity)
+    actual_cooldown = await cooldowns.get_actual_cooldown(activity, user_settings.donor_tier, slash_command)
     message_time = message.edited_at if message.edited_at else message.created_at
     bot_answer_time = message_time.replace(microsecond=0)
     current_time = utils.utcnow().replace(microsecond=0)
     time_elapsed = current_time - bot_answer_time
-    actual_cooldown = cooldown.actual_cooldown_slash() if slash_command else cooldown.actual_cooldown_mention()
-    if cooldown.donor_affected:
-        time_left_seconds = (actual_cooldown
-                             * settings.DONOR_TIERS_MULTIPLIERS[user_settings.donor_tier]
-                             - time_elapsed.total_seconds())
-    else:
-        time_left_seconds = actual_cooldown - time_elapsed.total_seconds()
+    time_left_seconds = actual_cooldown - time_elapsed.total_seconds()
     return timedelta(seconds=time_left_seconds)
 
 
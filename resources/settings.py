@@ -2,7 +2,6 @@
 """Contains global settings"""
 
 import os
-import sqlite3
 import sys
 
 from dotenv import load_dotenv
@@ -17,12 +16,9 @@ ENV_VARIABLE_MISSING = (
 # Files and directories
 BOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_FILE = os.path.join(BOT_DIR, 'database/maya_db.db')
-if os.path.isfile(DB_FILE):
-    DATABASE = sqlite3.connect(DB_FILE, isolation_level=None, detect_types=sqlite3.PARSE_DECLTYPES)
-else:
+if not os.path.isfile(DB_FILE):
     print(f'Database {DB_FILE} does not exist. Please follow the setup instructions in the README first.')
     sys.exit()
-DATABASE.row_factory = sqlite3.Row
 LOG_FILE = os.path.join(BOT_DIR, 'logs/discord.log')
 IMG_LOGO = os.path.join(BOT_DIR, 'images/maya.png')
 VERSION_FILE = os.path.join(BOT_DIR, 'VERSION')
@@ -49,6 +45,7 @@ except:
     sys.exit()
 
 DEBUG_MODE = True if os.getenv('DEBUG_MODE') == 'ON' else False
+VERIFY_DATABASE_UPDATES = True if os.getenv('VERIFY_DATABASE_UPDATES') == 'ON' else False
 
 DEV_IDS = os.getenv('DEV_IDS')
 if not DEV_IDS:
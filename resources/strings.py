@@ -84,6 +84,10 @@ INTERNAL_ERROR_SQLITE3 = 'Error executing SQL.\nError: {error}\nTable: {table}\n
 INTERNAL_ERROR_LOOKUP = 'Error assigning values.\nError: {error}\nTable: {table}\nFunction: {function}\nRecords: {record}'
 INTERNAL_ERROR_NO_ARGUMENTS = 'You need to specify at least one keyword argument.\nTable: {table}\nFunction: {function}'
 INTERNAL_ERROR_DICT_TO_OBJECT = 'Error converting record into object\nFunction: {function}\nRecord: {record}\n'
+INTERNAL_ERROR_UPDATE_MISMATCH = (
+    'Locally applied update differs from the database record.\nTable: {table}\nFunction: {function}\n'
+    'Applied: {applied}\nDatabase: {record}'
+)
 
 
 # Links